@@ -1,26 +1,44 @@
-import cv2
-import mediapipe as mp
 import time
+_IMPORT_STARTED = time.perf_counter()
+
+import argparse
 import threading
 import tkinter as tk
 from tkinter import ttk
-import yfinance as yf
 import winsound
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
-from PIL import Image, ImageTk
-import pandas as pd
-import numpy as np
 from contextlib import suppress
 import math
 import os
 import sys
 from io import BytesIO
-try:
-    import requests
-except ImportError:
-    requests = None
+import perf
+
+# 창과 캐시 차트에 필요한 모듈만 바로 import (OpenCV/MediaPipe/yfinance는 백그라운드에서)
+with perf.import_timer("numpy"):
+    import numpy as np
+with perf.import_timer("pandas"):
+    import pandas as pd
+with perf.import_timer("matplotlib"):
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    from matplotlib.collections import PolyCollection
+    from matplotlib.colors import to_rgba
+    import matplotlib.dates as mdates
+with perf.import_timer("PIL"):
+    from PIL import Image, ImageTk
+from market_data import BarStore, fetch_quotes
+from bar_cache import BarDiskCache
+from refresh_scheduler import RefreshScheduler
+from portfolio import Portfolio
+from journal import TradeJournal, TradeRecord, apply_trade, SIDE_BUY, SIDE_SELL
+from orderbook import OrderBook, TIF_GTC
+from gestures import (
+    GestureStateMachine, landmarks_to_array, NO_HANDS, EVENT_PRICE_UP, EVENT_PRICE_DOWN,
+    EVENT_RESET_TO_MARKET, EVENT_HOLD_PROGRESS, EVENT_BUY, EVENT_SELL
+)
+from chart_data import (DecimationCache, aggregate_ohlc, minmax_indices,
+                        CANDLE_MIN_PX, LINE_POINTS_PER_PX)
+perf.import_times["app (total)"] = time.perf_counter() - _IMPORT_STARTED
 
 def resource_path(relative_path):
     """ 실행 파일 내부의 임시 폴더 경로를 반환합니다. """
@@ -44,12 +62,14 @@ COLOR_BUTTON_INACTIVE = "#2C353F"
 
 # 카메라 설정
 CAM_W, CAM_H = 360, 220
+CAPTURE_W, CAPTURE_H = 640, 360  # 카메라 요청 해상도 (추론에 충분하고 미리보기 축소 부담이 적은 크기)
 
 # 거래 설정
 INITIAL_BALANCE = 50000000
 KRW_USD_RATE = 1350
 FIST_HOLD_DURATION = 1.5
 PRICE_STEP = 5
+OPEN_HAND_COOLDOWN = 0.5  # 펼친 손 제스처 중복 방지 (초)
 
 # 화폐 설정
 CURRENCY_KRW = "KRW"
@@ -65,13 +85,31 @@ Y_MARGIN_RATIO = 0.1
 # 제스처 인식 설정
 FINGER_FOLD_THRESHOLD = 0.05
 MIN_DETECTION_CONFIDENCE = 0.7
+MIN_TRACKING_CONFIDENCE = 0.5
 MAX_NUM_HANDS = 2
+MODEL_COMPLEXITY = 1           # 1: 전체 랜드마크 모델 (--lite-model로 0: 경량 모델, 추론은 빠르지만 정확도 낮음)
+
+# 추론 스케줄러 (손이 없을 때 검출 간격, 추적 중 간격, 프레임 차이 게이팅)
+INFERENCE_IDLE_STRIDE = 3
+INFERENCE_TRACK_STRIDE = 1
+FRAME_DIFF_THRESHOLD = 2.0
 
 # UI 업데이트 간격
 CAMERA_UPDATE_INTERVAL = 30
 TOAST_DURATION = 2000
 PRICE_UPDATE_INTERVAL = 10000  # 10초마다 가격 업데이트
 
+# 주문 설정 (지정가 주문은 시세가 지정가에 닿으면 체결, 그 전까지 대기)
+ORDER_TIME_IN_FORCE = TIF_GTC
+
+# 성능 계측 설정 (F12로 오버레이 토글, 켜져 있는 동안만 기록)
+PERF_OVERLAY_INTERVAL = 500     # 오버레이 갱신 간격 (ms)
+PERF_DUMP_INTERVAL = 10000      # 통계 파일 저장 간격 (ms)
+PERF_DUMP_DIR = os.path.join(os.path.expanduser("~"), ".sflick-hts", "perf")
+
+# 원/달러 환율 심볼
+FX_SYMBOL = "KRW=X"
+
 # 미증시 시가총액 상위 종목
 TOP_STOCKS = [
     ("S&P 500", "^GSPC", "📈"),  # 지수
@@ -263,9 +301,244 @@ class ModernSlider(tk.Canvas):
         self.draw()
 
 
+class TradeButton(tk.Canvas):
+    """매수/매도 버튼 (제스처 진행도 테두리 포함)
+
+    캔버스 아이템은 한 번만 만들고, 진행도가 바뀌면 테두리 선/호 아이템의
+    좌표(호는 extent)만 고칩니다. 반올림한 진행도가 같으면 아무것도 하지 않습니다.
+    """
+    WIDTH, HEIGHT = 175, 55
+    RADIUS = 14
+    BORDER_WIDTH = 4
+    PROGRESS_RESOLUTION = 100   # 진행도 반올림 단위 (1/100)
+
+    def __init__(self, parent, text, color, command=None, **kwargs):
+        super().__init__(parent, width=self.WIDTH, height=self.HEIGHT, bg=COLOR_CARD,
+                         highlightthickness=0, **kwargs)
+        self.command = command
+        self.progress = 0
+        self._color = None
+
+        w, h, radius = self.WIDTH, self.HEIGHT, self.RADIUS
+        
+        # 버튼 배경
+        self.create_oval(0, 0, radius*2, radius*2, fill=color, outline=color)
+        self.create_oval(w-radius*2, 0, w, radius*2, fill=color, outline=color)
+        self.create_oval(0, h-radius*2, radius*2, h, fill=color, outline=color)
+        self.create_oval(w-radius*2, h-radius*2, w, h, fill=color, outline=color)
+        self.create_rectangle(radius, 0, w-radius, h, fill=color, outline=color)
+        self.create_rectangle(0, radius, w, h-radius, fill=color, outline=color)
+        
+        self._segments = self._create_border()
+        
+        # 버튼 텍스트
+        self.create_text(w/2, h/2, text=text, fill="white", 
+                        font=("Malgun Gothic", 14, "bold"))
+        
+        self.bind("<Button-1>", self.on_click)
+        self.config(cursor="hand2")
+
+    def _create_border(self):
+        """진행도 테두리 아이템 생성 (숨김 상태) -> [(아이템, 길이, 갱신 함수)]
+
+        위쪽 선부터 시계 방향으로 선과 모서리 호가 번갈아 이어집니다.
+        """
+        w, h, radius = self.WIDTH, self.HEIGHT, self.RADIUS
+        o = self.BORDER_WIDTH // 2
+        straight_w = w - 2 * radius
+        straight_h = h - 2 * radius
+        corner = math.pi * radius / 2
+
+        def line(x0, y0, dx, dy, length):
+            item = self.create_line(x0, y0, x0, y0, width=self.BORDER_WIDTH,
+                                    capstyle=tk.ROUND, state='hidden')
+            return item, length, lambda f: self.coords(item, x0, y0, x0 + dx * length * f, y0 + dy * length * f)
+
+        def arc(box, start):
+            item = self.create_arc(*box, start=start, extent=0, width=self.BORDER_WIDTH,
+                                   style='arc', state='hidden')
+            return item, corner, lambda f: self.itemconfigure(item, extent=-90 * f)
+
+        return [
+            line(radius + o, o, 1, 0, straight_w),                                    # 위쪽 (왼쪽 → 오른쪽)
+            arc((w - radius*2 - o, o, w - o, radius*2 + o), 90),                       # 오른쪽 위 모서리
+            line(w - o, radius + o, 0, 1, straight_h),                                 # 오른쪽 (위 → 아래)
+            arc((w - radius*2 - o, h - radius*2 - o, w - o, h - o), 0),                # 오른쪽 아래 모서리
+            line(w - radius - o, h - o, -1, 0, straight_w),                            # 아래쪽 (오른쪽 → 왼쪽)
+            arc((o, h - radius*2 - o, radius*2 + o, h - o), 270),                      # 왼쪽 아래 모서리
+            line(o, h - radius - o, 0, -1, straight_h),                                # 왼쪽 (아래 → 위)
+            arc((o, o, radius*2 + o, radius*2 + o), 180),                              # 왼쪽 위 모서리
+        ]
+
+    def set_progress(self, progress):
+        """진행도(0~1) 표시 - 반올림 값이 같으면 캔버스를 건드리지 않음"""
+        steps = int(round(max(0.0, min(1.0, progress)) * self.PROGRESS_RESOLUTION))
+        if steps == self.progress:
+            return
+        self.progress = steps
+
+        # 완료 시 금색
+        color = "white" if steps < self.PROGRESS_RESOLUTION else "#FFD700"
+        recolor = color != self._color
+        self._color = color
+
+        total = sum(length for _, length, _ in self._segments)
+        remaining = total * steps / self.PROGRESS_RESOLUTION
+        for item, length, update in self._segments:
+            fraction = min(1.0, remaining / length) if remaining > 0 else 0.0
+            remaining -= length
+            if fraction <= 0:
+                self.itemconfigure(item, state='hidden')
+                continue
+            update(fraction)
+            if recolor:
+                option = 'fill' if self.type(item) == 'line' else 'outline'
+                self.itemconfigure(item, **{option: color})
+            self.itemconfigure(item, state='normal')
+
+    def on_click(self, event):
+        if self.command:
+            self.command()
+
+
+class VirtualList(tk.Frame):
+    """고정된 행 위젯 풀로 보이는 행만 표시하는 가상화 리스트
+
+    refresh(count, rows)에 전체 행 수와 rows(first, n) 콜백(보이는 구간의 텍스트 목록)만
+    넘기면, 보이는 행의 텍스트만 만들고 이전과 같은 행은 위젯을 건드리지 않습니다.
+    행 위젯과 스크롤바 아이템은 한 번만 만들기 때문에 항목 수와 무관하게 갱신 비용이 일정합니다.
+    """
+    ROW_HEIGHT = 20
+    SCROLLBAR_WIDTH = 12
+
+    def __init__(self, parent, width, height, empty_text="", **kwargs):
+        super().__init__(parent, bg=COLOR_CARD, width=width, height=height, **kwargs)
+        self.height = height
+        self.visible_rows = max(1, height // self.ROW_HEIGHT)
+        self.count = 0
+        self.first = 0
+        self.dragging = False
+        self._rows_fn = None
+        self._texts = [None] * self.visible_rows
+        self._row_width = width - self.SCROLLBAR_WIDTH - 4
+        
+        self._rows = [
+            tk.Label(self, font=("Malgun Gothic", 8), bg=COLOR_DIVIDER, fg=COLOR_TEXT_MAIN,
+                     anchor='w', justify='left', padx=4, pady=0)
+            for _ in range(self.visible_rows)
+        ]
+        self._empty = tk.Label(self, text=empty_text, font=("Malgun Gothic", 9),
+                               bg=COLOR_CARD, fg=COLOR_TEXT_SUB)
+        self._empty_shown = False
+        
+        # 커스텀 스크롤바 (트랙/Thumb 아이템은 한 번만 생성)
+        self.scrollbar = tk.Canvas(self, bg=COLOR_CARD, highlightthickness=0,
+                                   width=self.SCROLLBAR_WIDTH, height=height)
+        self.scrollbar.place(x=width - self.SCROLLBAR_WIDTH, y=0, height=height)
+        self._track = self.scrollbar.create_rectangle(2, 2, 10, height - 2, fill='#2A2A2E',
+                                                      outline='', state='hidden')
+        self._thumb = self.scrollbar.create_rectangle(2, 2, 10, 12, fill='#999999',
+                                                      outline='', state='hidden')
+        self._scrollbar_shown = False
+        self._thumb_pos = None
+        
+        for widget in [self, self._empty] + self._rows:
+            widget.bind("<MouseWheel>", self.on_mousewheel)
+        self.scrollbar.bind("<Button-1>", self.on_scrollbar_click)
+        self.scrollbar.bind("<B1-Motion>", self.on_scrollbar_drag)
+        self.scrollbar.bind("<ButtonRelease-1>", self.on_scrollbar_release)
+
+    @property
+    def max_first(self):
+        return max(0, self.count - self.visible_rows)
+
+    def refresh(self, count, rows_fn):
+        """행 수와 보이는 구간 텍스트 콜백 갱신 후 다시 그림"""
+        self.count = count
+        self._rows_fn = rows_fn
+        self.first = min(self.first, self.max_first)
+        self._render()
+
+    def _render(self):
+        n = min(self.visible_rows, self.count - self.first)
+        texts = list(self._rows_fn(self.first, n)) if n > 0 else []
+        texts += [None] * (self.visible_rows - len(texts))
+        
+        for i, (lbl, text) in enumerate(zip(self._rows, texts)):
+            old = self._texts[i]
+            if text == old:
+                continue
+            if text is None:
+                lbl.place_forget()
+            else:
+                lbl.config(text=text)
+                if old is None:
+                    lbl.place(x=2, y=i * self.ROW_HEIGHT + 1,
+                              width=self._row_width, height=self.ROW_HEIGHT - 2)
+            self._texts[i] = text
+        
+        empty = self.count == 0
+        if empty != self._empty_shown:
+            if empty:
+                self._empty.place(x=0, y=0, width=self._row_width + 4, height=self.ROW_HEIGHT)
+            else:
+                self._empty.place_forget()
+            self._empty_shown = empty
+        
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        """스크롤이 필요할 때만 표시, Thumb은 좌표만 이동"""
+        show = self.count > self.visible_rows
+        if show != self._scrollbar_shown:
+            state = 'normal' if show else 'hidden'
+            self.scrollbar.itemconfigure(self._track, state=state)
+            self.scrollbar.itemconfigure(self._thumb, state=state)
+            self._scrollbar_shown = show
+        if not show:
+            return
+        
+        track = self.height - 4
+        thumb_height = max(10, track * self.visible_rows / self.count)
+        thumb_y = (track - thumb_height) * self.first / self.max_first
+        pos = (round(thumb_y), round(thumb_height))
+        if pos != self._thumb_pos:
+            self._thumb_pos = pos
+            self.scrollbar.coords(self._thumb, 2, pos[0] + 2, 10, pos[0] + 2 + pos[1])
+
+    def scroll_to(self, first):
+        first = max(0, min(int(first), self.max_first))
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def on_mousewheel(self, event):
+        self.scroll_to(self.first + (-1 if event.delta > 0 else 1))
+
+    def on_scrollbar_click(self, event):
+        self.dragging = True
+        self._scroll_to_pointer(event)
+
+    def on_scrollbar_drag(self, event):
+        if self.dragging:
+            self._scroll_to_pointer(event)
+
+    def on_scrollbar_release(self, event):
+        self.dragging = False
+
+    def _scroll_to_pointer(self, event):
+        if self.count <= self.visible_rows:
+            return
+        ratio = max(0.0, min(1.0, (event.y - 2) / (self.height - 4)))
+        self.scroll_to(round(ratio * self.max_first))
+
+
 class TossGestureHTS:
-    def __init__(self, root):
+    def __init__(self, root, replay=None, perf_enabled=False, model_complexity=MODEL_COMPLEXITY):
         self.root = root
+        self.replay = replay  # 카메라 대신 재생할 동영상/녹화 세션(.npz) 경로
+        self.model_complexity = model_complexity  # MediaPipe 손 랜드마크 모델 (0: 경량, 1: 전체)
+        perf.recorder.enabled = perf_enabled
         icon_file = resource_path('toss.ico')
         if os.path.isfile(icon_file):
             self.root.iconbitmap(icon_file)
@@ -289,7 +562,9 @@ class TossGestureHTS:
 
         # 데이터 및 상태 초기화
         self.balance = INITIAL_BALANCE
-        self.holdings = {}  # 보유 주식: symbol -> quantity
+        self.portfolio = Portfolio()  # 보유 주식 장부 (수량, 평균 매입가, 시세)
+        self.journal = self._open_journal()  # 거래 장부 (이전 세션 잔액/보유 종목 복구)
+        self.order_books = {}  # 종목별 미체결 지정가 주문: symbol -> OrderBook
         self.symbol = "^GSPC" 
         self.symbol_display = "S&P 500"
         
@@ -306,47 +581,150 @@ class TossGestureHTS:
         self.chart_type = "line"
         
         self.df = pd.DataFrame()
+        self.bar_store = BarStore(disk=self._open_bar_cache())  # (심볼, 주기)별 OHLCV 증분 캐시
         self.current_price = 0.0
         self.prev_close = 0.0
         self.order_amount = 0
         
         self.view_offset = 0  
         self.view_window = DEFAULT_VIEW_WINDOW
+        self.view_key = None             # 현재 보기 범위가 적용된 (심볼, 주기)
         
-        # 제스처 상태
-        self.right_fist_start = None
-        self.left_fist_start = None
-        self.last_open_hand_time = 0  # 펼친 손 제스처 중복 방지용
-        self.OPEN_HAND_COOLDOWN = 0.5  # 0.5초 쿨다운
+        # 제스처 상태 기계 (디바운스된 이벤트만 UI에 반영)
+        self.gestures = GestureStateMachine(
+            FINGER_FOLD_THRESHOLD, FIST_HOLD_DURATION, OPEN_HAND_COOLDOWN
+        )
         
         # 데이터 fetch 중복 방지
         self.is_fetching = False
         self.fetch_lock = threading.Lock()
         
-        # Vision 엔진 초기화
-        self._init_vision_engine()
+        # 백그라운드 갱신 스케줄러 (고정 워커 풀, 리소스별 요청 병합)
+        self.refresher = RefreshScheduler()
+        
+        # 단계별 시작: 창과 캐시 차트를 먼저 보여주고 비전 엔진은 백그라운드에서 준비
+        self.vision = None
+        self._closing = False
+        self._pending_vision = None      # 로더가 시작했지만 아직 Tk 스레드에 넘기지 않은 파이프라인
+        self._vision_lock = threading.Lock()
         
         # UI 구성
         self.init_ui()
         
-        # 초기 데이터 로드
+        # 초기 데이터 로드 (디스크 캐시가 있으면 즉시 표시, 네트워크 갱신은 워커에서)
         self.change_unit("1d", "일봉")
         
         # 실시간 가격 업데이트 시작
         self.start_price_update()
         
-        # 메인 루프 시작
-        self.main_loop()
+        # Vision 엔진 초기화 (준비되면 메인 루프 시작)
+        self._init_vision_engine()
+        self.root.after(0, self._report_startup, "window")
+        
+        # 성능 통계 주기적 저장
+        self.root.bind("<F12>", self.toggle_perf_overlay)
+        self.root.bind("<Escape>", self.cancel_open_orders)
+        self.root.after(PERF_DUMP_INTERVAL, self._dump_perf_stats)
+
+    def _open_journal(self):
+        """거래 장부를 열고 스냅샷 + 이후 체결로 잔액과 보유 종목 복구 (실패 시 메모리에서만 거래)"""
+        journal = None
+        try:
+            journal = TradeJournal()
+            started = time.perf_counter()
+            state, records = journal.recover()
+            
+            if state is not None:
+                self.balance = state['balance']
+                self.portfolio = Portfolio.from_state(state['portfolio'])
+            for record in records:
+                self.balance = apply_trade(record, self.balance, self.portfolio)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 깨진 스냅샷/기록이면 장부는 그대로 두고 초기 상태로 메모리에서만 거래
+            print(f"Trade journal disabled: {e}")
+            self.balance = INITIAL_BALANCE
+            self.portfolio = Portfolio()
+            if journal is not None:
+                with suppress(OSError, ValueError):
+                    journal.close()
+            return None
+        
+        elapsed = time.perf_counter() - started
+        perf.record("ledger.recover", elapsed)
+        print(f"Trade journal: {len(records)} trades replayed after snapshot in {elapsed * 1000:.0f}ms")
+        return journal
+
+    def _ledger_state(self):
+        """스냅샷으로 저장할 잔액과 장부 상태"""
+        return {'balance': self.balance, 'portfolio': self.portfolio.state()}
+
+    def _open_bar_cache(self):
+        """디스크 봉 캐시 열기 (실패 시 메모리 캐시만 사용)"""
+        try:
+            return BarDiskCache()
+        except OSError as e:
+            print(f"Bar cache disabled: {e}")
+            return None
+
+    def _report_startup(self, stage):
+        """시작 단계별 경과 시간과 모듈 import 시간 출력"""
+        elapsed = (time.perf_counter() - _IMPORT_STARTED) * 1000
+        print(f"Startup: {stage} ready in {elapsed:.0f}ms (imports: {perf.import_report()})")
 
     def _init_vision_engine(self):
-        """비전 엔진 초기화"""
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
+        """비전 엔진 초기화 (OpenCV/MediaPipe import와 카메라/모델 준비는 백그라운드)"""
+        self.lbl_cam.config(text="손 인식 준비 중...")
+        threading.Thread(target=self._load_vision_engine, daemon=True, name="vision-loader").start()
+
+    def _load_vision_engine(self):
+        try:
+            vision = self._create_vision_pipeline()
+            vision.start()
+        except Exception as e:
+            print(f"Vision init error: {e}")
+            if not self._closing:
+                self.root.after(0, lambda: self.lbl_cam.config(text="카메라를 사용할 수 없습니다"))
+            return
+        
+        # 종료와 엇갈려도 파이프라인은 cleanup 또는 여기서 반드시 한 번 정지
+        with self._vision_lock:
+            closing = self._closing
+            if not closing:
+                self._pending_vision = vision
+        if closing:
+            vision.stop()
+            return
+        self.root.after(0, self._on_vision_ready, vision)
+
+    def _on_vision_ready(self, vision):
+        """비전 엔진 준비 완료 - 제스처 입력 활성화"""
+        with self._vision_lock:
+            if self._closing or self._pending_vision is not vision:
+                return      # 그 사이 종료됨 (cleanup이 정지시킴)
+            self._pending_vision = None
+            self.vision = vision
+        self.lbl_cam.config(text="")
+        self._report_startup("vision")
+        self.main_loop()
+
+    def _create_vision_pipeline(self):
+        """비전 파이프라인 생성 (캡처/추론은 전용 스레드에서 실행)"""
+        with perf.import_timer("vision"):
+            from vision import VisionPipeline, InferenceScheduler
+        return VisionPipeline(
+            preview_size=(CAM_W, CAM_H),
             max_num_hands=MAX_NUM_HANDS,
-            min_detection_confidence=MIN_DETECTION_CONFIDENCE
+            min_detection_confidence=MIN_DETECTION_CONFIDENCE,
+            capture_size=(CAPTURE_W, CAPTURE_H),
+            min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
+            model_complexity=self.model_complexity,
+            scheduler=InferenceScheduler(
+                idle_stride=INFERENCE_IDLE_STRIDE,
+                track_stride=INFERENCE_TRACK_STRIDE,
+                diff_threshold=FRAME_DIFF_THRESHOLD
+            ),
+            source=self.replay
         )
-        self.cap = cv2.VideoCapture(0)
 
     def init_ui(self):
         """UI 초기화"""
@@ -700,90 +1078,85 @@ class TossGestureHTS:
         if hasattr(self, 'lbl_balance'):
             self.lbl_balance.config(text=f"{currency_symbol}{display_balance:,.0f}")
     
-    def _fetch_exchange_rate(self):
-        """실시간 원/달러 환율 가져오기"""
-        try:
-            krw_data = yf.Ticker("KRW=X").history(period="1d")
-            if not krw_data.empty:
-                self.krw_usd_rate = krw_data['Close'].iloc[-1]
-                self._update_balance_display()
-        except Exception as e:
-            # 환율 가져오기 실패 시 기본값 유지
-            pass
+    def _fetch_quotes(self):
+        """현재 종목, 보유 종목, 환율을 한 번의 일괄 요청으로 갱신"""
+        symbol = self.symbol
+        # 미체결 주문이 있는 종목도 시세가 있어야 체결되므로 함께 조회
+        others = set(self.portfolio.symbols)
+        others.update(s for s, book in list(self.order_books.items()) if len(book))
+        others.discard(symbol)
+        symbols = [symbol, FX_SYMBOL] + sorted(others)
+        
+        quotes = fetch_quotes(symbols)
+        if not quotes:
+            # 실패로 처리해 스케줄러 백오프 적용
+            raise RuntimeError("No quotes received")
+        
+        # 상태 반영은 Tk 스레드에서 (워커는 네트워크 조회만)
+        self.root.after(0, self._apply_quotes, symbol, quotes)
     
-    def _fetch_holdings_prices(self):
-        """보유 종목 주가 가져오기"""
-        if not self.holdings:
-            return
+    def _apply_quotes(self, symbol, quotes):
+        """일괄 조회 결과를 상태와 UI에 한 번에 반영 (미체결 주문은 새 시세로 체결 확인)"""
+        fx_rate = quotes.pop(FX_SYMBOL, None)
         
-        try:
-            for symbol in self.holdings.keys():
-                if symbol == self.symbol:  # 현재 보고 있는 종목은 이미 업데이트됨
-                    continue
-                
-                try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d", interval="1m")
-                    if not data.empty:
-                        price = float(data['Close'].iloc[-1])
-                        self.stock_prices[symbol] = price
-                except Exception:
-                    pass
-            
-            # UI 업데이트
-            self.root.after(0, self._update_holdings_display)
-        except Exception as e:
-            pass
+        self.stock_prices.update(quotes)
+        self.portfolio.set_prices(quotes)
+        
+        if fx_rate:
+            self.krw_usd_rate = fx_rate
+        
+        # 현재 종목 가격 (조회 중 종목이 바뀌었거나 전체 데이터 로드 중이면 건너뜀)
+        update_price = False
+        if symbol == self.symbol and symbol in quotes and not self.is_fetching and not self.df.empty:
+            self.current_price = quotes[symbol]
+            # 기존 데이터가 있으면 마지막 종가를 prev_close로
+            self.prev_close = float(self.df['Close'].iloc[-1])
+            update_price = True
+        
+        self._match_orders(quotes)
+        self._update_balance_display()
+        if update_price:
+            self._update_price_display()
+        if len(self.portfolio):
+            self._update_holdings_display()
     
+    @perf.timed("ui.holdings")
     def _update_holdings_display(self):
-        """보유 종목 표시 업데이트"""
-        if not hasattr(self, 'holdings_frame'):
+        """보유 종목 표시 업데이트 (장부 전체를 한 번에 재평가, 보이는 행만 다시 계산)"""
+        if not hasattr(self, 'holdings_list'):
             return
-        
-        # 기존 위젯 제거
-        for widget in self.holdings_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.holdings:
-            lbl = tk.Label(
-                self.holdings_frame, text="보유 종목 없음", 
-                font=("Malgun Gothic", 9), 
-                bg=COLOR_CARD, fg=COLOR_TEXT_SUB
-            )
-            lbl.pack(fill='x', padx=5, pady=3)
+        self._valuation = self.portfolio.revalue()
+        self._update_pnl_display(self._valuation)
+        self.holdings_list.refresh(len(self.portfolio), self._holding_rows)
+
+    def _update_pnl_display(self, valuation):
+        """평가손익 표시 업데이트"""
+        pnl = valuation.unrealized_pnl
+        if self.current_currency == CURRENCY_KRW:
+            pnl_display = f"₩{abs(pnl) * self.krw_usd_rate:,.0f}"
         else:
-            # 6개 초과일 때 스크롤바 표시
-            if len(self.holdings) > 6:
-                self.holdings_scrollbar_canvas.pack(side='right', fill='y', padx=(2, 0))
+            pnl_display = f"${abs(pnl):,.2f}"
+        sign = "-" if pnl < 0 else "+"
+        color = COLOR_TOSS_BLUE if pnl < 0 else COLOR_TOSS_RED if pnl > 0 else COLOR_TEXT_SUB
+        text = f"평가손익 {sign}{pnl_display} ({sign}{abs(valuation.pnl_ratio) * 100:.1f}%)"
+        if self.lbl_pnl.cget("text") != text:
+            self.lbl_pnl.config(text=text, fg=color)
+
+    def _holding_rows(self, first, count):
+        """보유 종목 first번째부터 count개 행 텍스트 (심볼 | 수량 | 평가가)"""
+        rows = []
+        values = self._valuation.values
+        for i, (symbol, quantity) in enumerate(self.portfolio.rows(first, count), first):
+            value = values[i]
+            
+            if self.current_currency == CURRENCY_KRW:
+                eval_display = f"₩{value * self.krw_usd_rate:,.0f}"
             else:
-                self.holdings_scrollbar_canvas.pack_forget()
+                eval_display = f"${value:,.1f}"
             
-            # 보유 종목을 1줄씩 표시 (심볼 | 수량 | 평가가)
-            for symbol, quantity in self.holdings.items():
-                current_price = self.stock_prices.get(symbol, 0)
-                eval_price_krw = current_price * quantity * self.krw_usd_rate
-                
-                if self.current_currency == CURRENCY_KRW:
-                    eval_display = f"₩{eval_price_krw:,.0f}"
-                else:
-                    eval_display = f"${current_price * quantity:,.1f}"
-                
-                # 한 줄: [심볼 (수량주)] [평가가]
-                text = f"{symbol}({quantity:,.0f}주)  {eval_display}"
-                
-                lbl = tk.Label(
-                    self.holdings_frame, text=text,
-                    font=("Malgun Gothic", 8),
-                    bg=COLOR_DIVIDER, fg=COLOR_TEXT_MAIN,
-                    anchor='w', justify='left',
-                    padx=4, pady=2
-                )
-                lbl.pack(fill='x', padx=2, pady=1)
-        
-        # Canvas 업데이트 (중요!)
-        self.holdings_frame.update_idletasks()
-        self.holdings_canvas.configure(scrollregion=self.holdings_canvas.bbox("all"))
-        self._update_holdings_scrollbar_display()
+            # 한 줄: [심볼 (수량주)] [평가가]
+            rows.append(f"{symbol}({quantity:,.0f}주)  {eval_display}")
+        return rows
 
     def _hide_stock_menu(self):
         """주식 선택 창 닫기"""
@@ -819,16 +1192,11 @@ class TossGestureHTS:
         
         # 현재가를 주문가에 자동 설정 (백그라운드에서 현재가를 가져온 후 업데이트)
         def set_current_price():
-            try:
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period="1d", interval="1m")
-                if not data.empty:
-                    current_price = float(data['Close'].iloc[-1])
-                    self.root.after(0, lambda: self._set_order_price(current_price))
-            except Exception as e:
-                print(f"Error fetching current price: {e}")
-        
-        threading.Thread(target=set_current_price, daemon=True).start()
+            current_price = fetch_quotes([symbol]).get(symbol)
+            if current_price is not None:
+                self.root.after(0, lambda: self._set_order_price(current_price))
+        
+        self.refresher.submit("switch_price", set_current_price)
     
     def _set_order_price(self, price):
         """주문가 필드에 현재가 설정 (정수로만)"""
@@ -837,22 +1205,31 @@ class TossGestureHTS:
             self.ent_order.insert(0, f"{int(price):,}")
     
     def _apply_current_price(self):
-        """현재가 버튼 클릭 - 현재가를 주문가에 설정 (화폐 단위 고려)"""
-        try:
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(period="1d", interval="1m")
-            if not data.empty:
-                current_price_usd = float(data['Close'].iloc[-1])
-                
-                # 화폐 단위에 따라 변환
-                if self.current_currency == CURRENCY_KRW:
-                    display_price = current_price_usd * self.krw_usd_rate
-                else:
-                    display_price = current_price_usd
-                
-                self._set_order_price(display_price)
-                self.show_toast(f"현재가 {display_price:,.2f}로 설정", COLOR_TOSS_BLUE)
-        except Exception as e:
+        """현재가 버튼 클릭 - 현재가를 주문가에 설정 (화폐 단위 고려, 조회는 백그라운드)"""
+        symbol = self.symbol
+
+        def fetch_current_price():
+            try:
+                current_price_usd = fetch_quotes([symbol]).get(symbol)
+                if current_price_usd is None:
+                    raise RuntimeError("No quote received")
+            except Exception:
+                self.root.after(0, self.show_toast, "현재가를 가져올 수 없습니다", "#6B7684")
+                raise
+            self.root.after(0, lambda: apply_price(current_price_usd))
+
+        def apply_price(current_price_usd):
+            # 화폐 단위에 따라 변환
+            if self.current_currency == CURRENCY_KRW:
+                display_price = current_price_usd * self.krw_usd_rate
+            else:
+                display_price = current_price_usd
+
+            self._set_order_price(display_price)
+            self.show_toast(f"현재가 {display_price:,.2f}로 설정", COLOR_TOSS_BLUE)
+
+        if not self.refresher.submit("order_price", fetch_current_price) \
+                and not self.refresher.is_pending("order_price"):
             self.show_toast("현재가를 가져올 수 없습니다", "#6B7684")
     
     def _create_asset_card(self):
@@ -874,6 +1251,14 @@ class TossGestureHTS:
         )
         self.lbl_balance.place(x=20, y=35)
         
+        # 보유 종목 평가손익 (장부 재평가 결과)
+        self.lbl_pnl = tk.Label(
+            card, text="",
+            font=("Malgun Gothic", 8),
+            bg=COLOR_CARD, fg=COLOR_TEXT_SUB
+        )
+        self.lbl_pnl.place(x=20, y=68)
+        
         # 화폐 전환 버튼
         self.currency_btn = tk.Canvas(
             card, width=40, height=23, bg=COLOR_CARD, highlightthickness=0
@@ -893,142 +1278,20 @@ class TossGestureHTS:
             bg=COLOR_CARD, fg=COLOR_TEXT_MAIN
         ).place(x=205, y=15)
         
-        # 보유 종목 표시 프레임 (커스텀 스크롤바 컨테이너)
-        holdings_container = tk.Frame(card, bg=COLOR_CARD)
-        holdings_container.place(x=205, y=35, width=195, height=80)
-        
-        # Canvas
-        self.holdings_canvas = tk.Canvas(
-            holdings_container, bg=COLOR_CARD, highlightthickness=0,
-            highlightbackground=COLOR_CARD, width=170, height=80
-        )
-        self.holdings_canvas.pack(side='left', fill='both', expand=True)
-        
-        # 커스텀 스크롤바 Canvas
-        self.holdings_scrollbar_canvas = tk.Canvas(
-            holdings_container, bg=COLOR_CARD, highlightthickness=0,
-            width=12, height=80
-        )
-        self.holdings_scrollbar_canvas.pack(side='right', fill='y')
-        
-        # 스크롤 상태
-        self.holdings_scroll_state = {'thumb_y': 0, 'thumb_height': 10, 'dragging': False}
-        
-        self.holdings_canvas.bind("<MouseWheel>", self._on_holdings_mousewheel)
-        self.holdings_scrollbar_canvas.bind("<Button-1>", self._on_scrollbar_click)
-        self.holdings_scrollbar_canvas.bind("<B1-Motion>", self._on_scrollbar_drag)
-        self.holdings_scrollbar_canvas.bind("<ButtonRelease-1>", self._on_scrollbar_release)
-        
-        # 내부 프레임
-        self.holdings_frame = tk.Frame(self.holdings_canvas, bg=COLOR_CARD)
-        self.holdings_canvas.create_window((0, 0), window=self.holdings_frame, anchor='nw')
-        
-        self.holdings_frame.bind(
-            "<Configure>",
-            lambda e: self._update_holdings_scrollbar_display()
-        )
-    
-    def _update_holdings_scrollbar_display(self):
-        """보유 종목 스크롤바 표시 업데이트"""
-        self.holdings_canvas.configure(scrollregion=self.holdings_canvas.bbox("all"))
-        
-        # Canvas 크기와 content 크기로 스크롤 필요 여부 판단
-        canvas_height = self.holdings_canvas.winfo_height()
-        content_height = self.holdings_canvas.bbox("all")[3] if self.holdings_canvas.bbox("all") else 0
-        
-        if canvas_height > 1 and content_height > canvas_height:
-            # 스크롤 필요 - 스크롤바 표시
-            self.holdings_scroll_state['thumb_height'] = max(10, (canvas_height / content_height) * (canvas_height - 4))
-            self._draw_holdings_scrollbar()
-        else:
-            # 스크롤 불필요 - 스크롤바 숨김
-            self.holdings_scrollbar_canvas.delete("all")
-    
-    def _draw_holdings_scrollbar(self):
-        """보유 종목 스크롤바 그리기"""
-        self.holdings_scrollbar_canvas.delete("all")
-        canvas_height = self.holdings_canvas.winfo_height()
-        thumb_y = self.holdings_scroll_state['thumb_y']
-        thumb_height = self.holdings_scroll_state['thumb_height']
-        
-        # 스크롤바 트랙
-        self.holdings_scrollbar_canvas.create_rectangle(2, 2, 10, canvas_height-2, 
-                                                       fill='#2A2A2E', outline='')
-        
-        # 스크롤바 Thumb (밝은 회색)
-        self.holdings_scrollbar_canvas.create_rectangle(2, thumb_y+2, 10, thumb_y+thumb_height, 
-                                                       fill='#999999', outline='#CCCCCC', width=0)
-    
-    def _on_holdings_mousewheel(self, event):
-        """보유 종목 마우스 휠 스크롤"""
-        canvas_height = self.holdings_canvas.winfo_height()
-        content_height = self.holdings_canvas.bbox("all")[3] if self.holdings_canvas.bbox("all") else 0
-        
-        if content_height <= canvas_height:
-            return
-        
-        scroll_amount = 15  # 한 번에 스크롤할 픽셀 수
-        if event.delta > 0:
-            self.holdings_canvas.yview_scroll(-1, "units")
-        else:
-            self.holdings_canvas.yview_scroll(1, "units")
-        
-        # 스크롤 상태 업데이트
-        self._update_holdings_scroll_position()
-    
-    def _update_holdings_scroll_position(self):
-        """보유 종목 스크롤 위치 업데이트"""
-        canvas_height = self.holdings_canvas.winfo_height()
-        content_height = self.holdings_canvas.bbox("all")[3] if self.holdings_canvas.bbox("all") else 0
-        
-        if content_height <= canvas_height:
-            self.holdings_scroll_state['thumb_y'] = 0
-        else:
-            # Canvas의 현재 스크롤 위치를 가져오기
-            scroll_y = self.holdings_canvas.yview()[0]  # 0~1 사이의 값
-            thumb_y = scroll_y * (canvas_height - self.holdings_scroll_state['thumb_height'])
-            self.holdings_scroll_state['thumb_y'] = max(0, min(thumb_y, canvas_height - self.holdings_scroll_state['thumb_height']))
-        
-        self._draw_holdings_scrollbar()
-    
-    def _on_scrollbar_click(self, event):
-        """스크롤바 클릭"""
-        self.holdings_scroll_state['dragging'] = True
-        self._handle_scrollbar_interaction(event)
-    
-    def _on_scrollbar_drag(self, event):
-        """스크롤바 드래그"""
-        if self.holdings_scroll_state['dragging']:
-            self._handle_scrollbar_interaction(event)
-    
-    def _on_scrollbar_release(self, event):
-        """스크롤바 드래그 종료"""
-        self.holdings_scroll_state['dragging'] = False
-    
-    def _handle_scrollbar_interaction(self, event):
-        """스크롤바 상호작용 처리"""
-        canvas_height = self.holdings_canvas.winfo_height()
-        content_height = self.holdings_canvas.bbox("all")[3] if self.holdings_canvas.bbox("all") else 0
-        
-        if content_height <= canvas_height:
-            return
-        
-        # 클릭/드래그 위치에서 스크롤 계산
-        thumb_height = self.holdings_scroll_state['thumb_height']
-        max_thumb_y = canvas_height - thumb_height
-        
-        thumb_y = max(0, min(event.y - thumb_height/2, max_thumb_y))
-        scroll_position = thumb_y / max_thumb_y if max_thumb_y > 0 else 0
-        
-        self.holdings_canvas.yview_moveto(scroll_position)
-        self._update_holdings_scroll_position()
+        # 보유 종목 목록 (보이는 행만 그리는 가상화 리스트)
+        self.holdings_list = VirtualList(card, width=195, height=80, empty_text="보유 종목 없음")
+        self.holdings_list.place(x=205, y=35, width=195, height=80)
+        self._update_holdings_display()
 
     def _create_vision_card(self):
         """비전 카메라 카드 생성"""
         card = RoundedFrame(self.side_panel, height=260, corner_radius=20)
         card.pack(fill='x', pady=(0, 16))
         
-        self.lbl_cam = tk.Label(card, bg='black', bd=0)
+        # 미리보기 이미지는 하나만 만들고 매 프레임 내용만 교체
+        self.cam_photo = ImageTk.PhotoImage('RGB', (CAM_W, CAM_H))
+        self.lbl_cam = tk.Label(card, bg='black', bd=0, image=self.cam_photo, compound='center',
+                                fg=COLOR_TEXT_SUB, font=("Malgun Gothic", 10))
         self.lbl_cam.place(relx=0.5, rely=0.5, anchor='center', width=CAM_W, height=CAM_H)
 
     def _create_order_panel(self):
@@ -1052,146 +1315,18 @@ class TossGestureHTS:
         self.ent_order.place(relx=0.5, y=75, anchor='center')
         
         # 매수/매도 버튼 (제스처 진행도 표시 포함)
-        self.buy_btn_canvas = tk.Canvas(card, width=175, height=55, bg=COLOR_CARD, highlightthickness=0)
+        self.buy_btn_canvas = TradeButton(card, "살래요", COLOR_TOSS_RED, lambda: self.execute_trade("BUY"))
         self.buy_btn_canvas.place(x=25, y=130)
-        self._draw_trade_button(self.buy_btn_canvas, "살래요", COLOR_TOSS_RED, lambda: self.execute_trade("BUY"), 0.0)
         
-        self.sell_btn_canvas = tk.Canvas(card, width=175, height=55, bg=COLOR_CARD, highlightthickness=0)
+        self.sell_btn_canvas = TradeButton(card, "팔래요", COLOR_TOSS_BLUE, lambda: self.execute_trade("SELL"))
         self.sell_btn_canvas.place(x=220, y=130)
-        self._draw_trade_button(self.sell_btn_canvas, "팔래요", COLOR_TOSS_BLUE, lambda: self.execute_trade("SELL"), 0.0)
 
     def _update_button_progress(self, side, progress):
         """버튼 진행도 업데이트"""
         if side == "BUY":
-            self._draw_trade_button(self.buy_btn_canvas, "살래요", COLOR_TOSS_RED, 
-                                   lambda: self.execute_trade("BUY"), progress)
+            self.buy_btn_canvas.set_progress(progress)
         elif side == "SELL":
-            self._draw_trade_button(self.sell_btn_canvas, "팔래요", COLOR_TOSS_BLUE, 
-                                   lambda: self.execute_trade("SELL"), progress)
-    
-    def _draw_trade_button(self, canvas, text, color, command, progress=0.0):
-        """거래 버튼 그리기 (진행도 표시 포함)"""
-        canvas.delete("all")
-        w, h = 175, 55
-        radius = 14
-        border_width = 4
-        
-        # 버튼 배경
-        canvas.create_oval(0, 0, radius*2, radius*2, fill=color, outline=color)
-        canvas.create_oval(w-radius*2, 0, w, radius*2, fill=color, outline=color)
-        canvas.create_oval(0, h-radius*2, radius*2, h, fill=color, outline=color)
-        canvas.create_oval(w-radius*2, h-radius*2, w, h, fill=color, outline=color)
-        canvas.create_rectangle(radius, 0, w-radius, h, fill=color, outline=color)
-        canvas.create_rectangle(0, radius, w, h-radius, fill=color, outline=color)
-        
-        # 진행도 테두리 (둥근 사각형 테두리)
-        if progress > 0:
-            progress_color = "white" if progress < 1.0 else "#FFD700"  # 완료 시 금색
-            border_progress = min(1.0, progress)
-            border_offset = border_width // 2
-            
-            # 전체 둘레 계산
-            # 위쪽: w - 2*radius, 오른쪽: h - 2*radius, 아래쪽: w - 2*radius, 왼쪽: h - 2*radius
-            # 모서리: 4 * (π * radius / 2) = 2 * π * radius
-            total_perimeter = 2 * (w + h - 2 * radius) + 2 * math.pi * radius
-            
-            # 진행된 길이
-            progress_length = total_perimeter * border_progress
-            current_length = 0
-            
-            # 위쪽 가로선 (왼쪽 → 오른쪽)
-            segment_length = w - 2 * radius
-            if current_length < progress_length:
-                line_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if line_progress > 0:
-                    end_x = radius + border_offset + segment_length * line_progress
-                    canvas.create_line(radius + border_offset, border_offset, 
-                                     end_x, border_offset,
-                                     fill=progress_color, width=border_width, capstyle=tk.ROUND)
-                current_length += segment_length
-            
-            # 오른쪽 위 모서리
-            segment_length = math.pi * radius / 2
-            if current_length < progress_length:
-                arc_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if arc_progress > 0:
-                    canvas.create_arc(w - radius*2 - border_offset, border_offset, 
-                                   w - border_offset, radius*2 + border_offset,
-                                   start=90, extent=-90 * arc_progress,
-                                   outline=progress_color, width=border_width, style='arc')
-                current_length += segment_length
-            
-            # 오른쪽 세로선 (위 → 아래)
-            segment_length = h - 2 * radius
-            if current_length < progress_length:
-                line_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if line_progress > 0:
-                    end_y = radius + border_offset + segment_length * line_progress
-                    canvas.create_line(w - border_offset, radius + border_offset,
-                                     w - border_offset, end_y,
-                                     fill=progress_color, width=border_width, capstyle=tk.ROUND)
-                current_length += segment_length
-            
-            # 오른쪽 아래 모서리
-            segment_length = math.pi * radius / 2
-            if current_length < progress_length:
-                arc_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if arc_progress > 0:
-                    canvas.create_arc(w - radius*2 - border_offset, h - radius*2 - border_offset,
-                                   w - border_offset, h - border_offset,
-                                   start=0, extent=-90 * arc_progress,
-                                   outline=progress_color, width=border_width, style='arc')
-                current_length += segment_length
-            
-            # 아래쪽 가로선 (오른쪽 → 왼쪽)
-            segment_length = w - 2 * radius
-            if current_length < progress_length:
-                line_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if line_progress > 0:
-                    end_x = w - radius - border_offset - segment_length * line_progress
-                    canvas.create_line(w - radius - border_offset, h - border_offset,
-                                     end_x, h - border_offset,
-                                     fill=progress_color, width=border_width, capstyle=tk.ROUND)
-                current_length += segment_length
-            
-            # 왼쪽 아래 모서리
-            segment_length = math.pi * radius / 2
-            if current_length < progress_length:
-                arc_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if arc_progress > 0:
-                    canvas.create_arc(border_offset, h - radius*2 - border_offset,
-                                   radius*2 + border_offset, h - border_offset,
-                                   start=270, extent=-90 * arc_progress,
-                                   outline=progress_color, width=border_width, style='arc')
-                current_length += segment_length
-            
-            # 왼쪽 세로선 (아래 → 위)
-            segment_length = h - 2 * radius
-            if current_length < progress_length:
-                line_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if line_progress > 0:
-                    end_y = h - radius - border_offset - segment_length * line_progress
-                    canvas.create_line(border_offset, h - radius - border_offset,
-                                     border_offset, end_y,
-                                     fill=progress_color, width=border_width, capstyle=tk.ROUND)
-                current_length += segment_length
-            
-            # 왼쪽 위 모서리
-            segment_length = math.pi * radius / 2
-            if current_length < progress_length:
-                arc_progress = min(1.0, (progress_length - current_length) / segment_length)
-                if arc_progress > 0:
-                    canvas.create_arc(border_offset, border_offset,
-                                   radius*2 + border_offset, radius*2 + border_offset,
-                                   start=180, extent=-90 * arc_progress,
-                                   outline=progress_color, width=border_width, style='arc')
-        
-        # 버튼 텍스트
-        canvas.create_text(w/2, h/2, text=text, fill="white", 
-                          font=("Malgun Gothic", 14, "bold"))
-        
-        canvas.bind("<Button-1>", lambda e: command())
-        canvas.config(cursor="hand2")
+            self.sell_btn_canvas.set_progress(progress)
 
     def _create_content_panel(self):
         """우측 컨텐츠 패널 생성 (차트 영역)"""
@@ -1208,6 +1343,8 @@ class TossGestureHTS:
         self.ax.set_facecolor(COLOR_CARD)
         
         self.canvas_agg = FigureCanvasTkAgg(self.fig, master=self.chart_card)
+        # draw_idle도 결국 draw를 부르므로 인스턴스 메서드를 감싸 실제 렌더링 시간 기록
+        self.canvas_agg.draw = perf.timed("chart.draw")(self.canvas_agg.draw)
         self.chart_widget = self.canvas_agg.get_tk_widget()
         self.chart_widget.config(bg=COLOR_CARD, highlightthickness=0)
         self.chart_widget.place(x=20, y=20, relwidth=1, relheight=1, width=-40, height=-40)
@@ -1223,9 +1360,32 @@ class TossGestureHTS:
         
         # 하이라이트된 가격 저장
         self.highlighted_price = None
+        
+        # 호버 블리팅 상태 (정적 배경은 전체 draw 때마다 캡처)
+        self._chart_background = None
+        self._highlight_idx = None
+        self._visible_close = np.empty(0)
+        self._chart_color = COLOR_TOSS_RED
+        
+        # 차트 아티스트는 한 번만 만들고 이후엔 데이터만 교체
+        self._layout_dirty = True
+        self._decimation = DecimationCache()
+        self._apply_chart_style()
+        self._create_chart_artists()
+        self._create_hover_artists()
+        self.canvas_agg.mpl_connect('draw_event', self._on_chart_draw)
+        self.canvas_agg.mpl_connect('resize_event', self._on_chart_resize)
 
         # 하단 컨트롤 생성
         self._create_controls()
+        
+        # 성능 오버레이 (F12, 처음엔 숨김)
+        self.perf_overlay = tk.Label(
+            self.chart_card, font=("Consolas", 9), justify='left', anchor='nw',
+            bg=COLOR_TOOLTIP_BG, fg=COLOR_TEXT_MAIN, padx=8, pady=6
+        )
+        self._perf_overlay_job = None
+        self._perf_was_enabled = perf.recorder.enabled
 
     def _create_tooltip(self):
         """차트 툴팁 생성 (HTS 스타일)"""
@@ -1389,9 +1549,6 @@ class TossGestureHTS:
 
     def change_unit(self, interval, text):
         """시간 단위 변경"""
-        if self.is_fetching:
-            return
-            
         self.current_interval = interval
         
         # UI 업데이트 - 버튼들
@@ -1408,45 +1565,30 @@ class TossGestureHTS:
         else:
             self.fetch_period = "max"
 
-        # 백그라운드에서 데이터 로드
-        threading.Thread(target=self.fetch_market_data, daemon=True).start()
+        # 백그라운드에서 데이터 로드 ((심볼, 주기)별 키라서 한 조합의 실패 백오프가 다른 조합을 막지 않음)
+        symbol = self.symbol
+        key = f"bars:{symbol}:{interval}"
+        if not self.refresher.submit(key, self.fetch_market_data, symbol, interval, self.fetch_period) \
+                and not self.refresher.is_pending(key):
+            # 같은 조합이 방금 실패해 백오프 중
+            self.show_toast("데이터 로드 실패 - 잠시 후 다시 시도하세요", "#F04452")
 
     def start_price_update(self):
         """실시간 가격 업데이트 시작"""
         self.update_current_price()
     
     def update_current_price(self):
-        """현재 가격만 업데이트 (전체 데이터 로드 없이)"""
-        if not self.is_fetching and not self.df.empty:
-            threading.Thread(target=self._fetch_current_price, daemon=True).start()
+        """현재가, 환율, 보유 종목 가격 업데이트 (전체 데이터 로드 없이)"""
+        # 이전 요청이 아직 대기/실행 중이면 스케줄러가 새 요청을 합침
+        self.refresher.submit("quotes", self._fetch_quotes)
         
-        # 환율 업데이트 (10초마다)
-        threading.Thread(target=self._fetch_exchange_rate, daemon=True).start()
-        
-        # 보유 종목 주가 업데이트 (30초마다)
-        if len(self.holdings) > 0:
-            threading.Thread(target=self._fetch_holdings_prices, daemon=True).start()
+        stats = self.refresher.stats()
+        if stats['oldest_pending'] * 1000 > PRICE_UPDATE_INTERVAL:
+            print(f"Refresh falling behind: queue={stats['queue_depth']}, "
+                  f"oldest={stats['oldest_pending']:.1f}s")
         
         self.root.after(PRICE_UPDATE_INTERVAL, self.update_current_price)
     
-    def _fetch_current_price(self):
-        """현재 가격만 가져오기"""
-        try:
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(period="1d", interval="1m")
-            
-            if not data.empty:
-                new_price = float(data['Close'].iloc[-1])
-                self.current_price = new_price
-                
-                # 기존 데이터가 있으면 마지막 종가를 prev_close로
-                if len(self.df) > 0:
-                    self.prev_close = float(self.df['Close'].iloc[-1])
-                
-                self.root.after(0, self._update_price_display)
-        except Exception as e:
-            print(f"Price update error: {e}")
-    
     def _update_price_display(self):
         """가격 표시 업데이트 (화폐 기준으로 변환)"""
         diff = self.current_price - self.prev_close
@@ -1464,61 +1606,73 @@ class TossGestureHTS:
         self.lbl_price.config(text=price_display, fg=color)
         self.lbl_change.config(text=f"{diff_display} ({diff_pct:+.2f}%)", fg=color)
 
-    def fetch_market_data(self):
-        """시장 데이터 가져오기"""
+    def fetch_market_data(self, symbol, interval, period):
+        """시장 데이터 가져오기 (캐시된 봉 이후만 증분 조회, 봉 로드는 한 번에 하나씩)"""
         with self.fetch_lock:
-            if self.is_fetching:
-                return
+            if (symbol, interval) != (self.symbol, self.current_interval):
+                return      # 기다리는 동안 다른 종목/주기가 선택됨
             self.is_fetching = True
-            
+            try:
+                self._load_market_data(symbol, interval, period)
+            finally:
+                self.is_fetching = False
+                self.root.after(0, self._show_loading, False)
+
+    def _load_market_data(self, symbol, interval, period):
         try:
-            self.root.after(0, self._show_loading, True)
-            
-            ticker = yf.Ticker(self.symbol)
-            
-            # 월봉은 직접 interval='1mo'로 가져오기
-            if self.current_interval == "1mo":
-                data = ticker.history(period=self.fetch_period, interval="1mo")
-            elif self.current_interval == "1y":
-                # 년봉은 월봉 데이터를 연 단위로 리샘플링
-                data = ticker.history(period="max", interval="1mo")
-                if not data.empty:
-                    data = data.resample('YE').agg({
-                        'Open': 'first',
-                        'High': 'max',
-                        'Low': 'min',
-                        'Close': 'last',
-                        'Volume': 'sum'
-                    }).dropna()
+            # 이미 받아둔 데이터가 있으면 네트워크 조회 전에 바로 표시
+            cached = self.bar_store.get(symbol, interval)
+            if cached is not None and not cached.empty:
+                self._apply_market_data(cached, symbol, interval)
             else:
-                data = ticker.history(period=self.fetch_period, interval=self.current_interval)
+                self.root.after(0, self._show_loading, True)
+            
+            data = self.bar_store.load(symbol, interval, period)
             
             if data.empty:
                 raise ValueError("No data received")
             
-            self.df = data
-            self.current_price = float(data['Close'].iloc[-1])
-            self.prev_close = float(data['Close'].iloc[-2]) if len(data) > 1 else self.current_price
-            
-            # 현재 심볼의 주가 캐시에 저장
-            self.stock_prices[self.symbol] = self.current_price
-            
-            if self.order_amount == 0:
-                self.order_amount = int(self.current_price)
+            if data is not cached:
+                self._apply_market_data(data, symbol, interval)
             
-            self.view_window = min(len(self.df), DEFAULT_VIEW_WINDOW)
-            self.view_offset = max(0, len(self.df) - self.view_window)
-            
-            self.root.after(0, self.update_ui_with_data)
-            
-        except Exception as e:
-            print(f"Data Fetch Error: {e}")
+        except Exception:
+            # 스케줄러가 실패를 기록하고 백오프하도록 다시 던짐 (로그도 스케줄러가 출력)
             self.root.after(0, self.show_toast, f"데이터 로드 실패", "#F04452")
-            
-        finally:
-            with self.fetch_lock:
-                self.is_fetching = False
-            self.root.after(0, self._show_loading, False)
+            raise
+
+    def _apply_market_data(self, data, symbol, interval):
+        """받아온 데이터 반영 예약 (상태 변경과 UI 업데이트는 Tk 스레드에서)"""
+        self.root.after(0, self._commit_market_data, data, symbol, interval)
+
+    def _commit_market_data(self, data, symbol, interval):
+        """받아온 데이터를 상태에 반영하고 UI 업데이트 (Tk 스레드)"""
+        if (symbol, interval) != (self.symbol, self.current_interval):
+            return      # 조회 중 종목/주기가 바뀜
+        
+        old_len = len(self.df)
+        self.df = data
+        self.current_price = float(data['Close'].iloc[-1])
+        self.prev_close = float(data['Close'].iloc[-2]) if len(data) > 1 else self.current_price
+        
+        # 현재 심볼의 주가 캐시에 저장
+        self.stock_prices[symbol] = self.current_price
+        self.portfolio.set_prices({symbol: self.current_price})
+        
+        if self.order_amount == 0:
+            self.order_amount = int(self.current_price)
+        
+        if self.view_key != (symbol, interval):
+            # 이 (심볼, 주기)의 첫 반영이면 최근 구간으로 초기화
+            self.view_key = (symbol, interval)
+            self.view_window = min(len(data), DEFAULT_VIEW_WINDOW)
+            self.view_offset = max(0, len(data) - self.view_window)
+        else:
+            # 새 봉이 추가돼도 사용자가 맞춰 둔 확대/스크롤 위치를 오른쪽 끝 기준으로 유지
+            right_gap = max(0, old_len - (self.view_offset + self.view_window))
+            self.view_window = max(1, min(self.view_window, len(data)))
+            self.view_offset = max(0, len(data) - self.view_window - right_gap)
+        
+        self.update_ui_with_data()
 
     def _show_loading(self, show):
         """로딩 인디케이터 표시/숨김"""
@@ -1527,10 +1681,14 @@ class TossGestureHTS:
         else:
             self.lbl_loading.place_forget()
 
+    @perf.timed("chart.load")
     def update_ui_with_data(self):
         """데이터로 UI 업데이트"""
         if self.df.empty:
             return
+        
+        # 가격 자릿수가 바뀌면 y축 라벨 폭도 바뀌므로 레이아웃 재계산
+        self._layout_dirty = True
             
         diff = self.current_price - self.prev_close
         diff_pct = (diff / self.prev_close * 100) if self.prev_close != 0 else 0
@@ -1584,8 +1742,9 @@ class TossGestureHTS:
         self.chart_slider.set(self.view_offset)
         self.update_chart_view()
 
-    def update_chart_view(self, highlight_idx=None):
-        """차트 뷰 업데이트"""
+    @perf.timed("chart.update")
+    def update_chart_view(self):
+        """차트 뷰 업데이트 (기존 아티스트의 데이터/범위만 갱신)"""
         if self.df.empty:
             return
             
@@ -1596,29 +1755,50 @@ class TossGestureHTS:
         if visible_df.empty:
             return
 
-        self.ax.clear()
-        
-        y_data = visible_df['Close'].values
+        opens = visible_df['Open'].to_numpy(dtype=float)
+        highs = visible_df['High'].to_numpy(dtype=float)
+        lows = visible_df['Low'].to_numpy(dtype=float)
+        y_data = visible_df['Close'].to_numpy(dtype=float)
         x_indices = np.arange(len(visible_df))
         x_dates = visible_df.index
         
-        v_min, v_max = visible_df['Low'].min(), visible_df['High'].max()
+        v_min, v_max = lows.min(), highs.max()
         margin = max((v_max - v_min) * Y_MARGIN_RATIO, v_max * 0.01)
         self.ax.set_ylim(v_min - margin, v_max + margin)
         self.ax.set_xlim(-0.5, len(visible_df) - 0.5)
 
-        if self.chart_type == "bar":
-            self._draw_candlestick(visible_df, x_indices, v_min, margin)
+        # 보이는 구간이 차트 픽셀 폭보다 많으면 데시메이션 (x는 원래 인덱스 기준 유지)
+        is_bar = self.chart_type == "bar"
+        width_px = max(1, self.chart_widget.winfo_width())
+        cache_key = (id(self.df), len(self.df), start_idx, len(visible_df), width_px, self.chart_type)
+        
+        if is_bar:
+            buckets = max(1, width_px // CANDLE_MIN_PX)
+            if len(visible_df) > buckets:
+                x_c, span, o, h, l, c = self._decimation.get(
+                    cache_key, lambda: aggregate_ohlc(opens, highs, lows, y_data, buckets))
+                self._draw_candlestick(x_c, o, h, l, c, margin, span)
+            else:
+                self._draw_candlestick(x_indices, opens, highs, lows, y_data, margin)
         else:
-            self._draw_line_chart(x_indices, y_data, v_min, margin)
+            buckets = max(1, width_px * LINE_POINTS_PER_PX)
+            if len(visible_df) > 2 * buckets:
+                picks = self._decimation.get(cache_key, lambda: minmax_indices(y_data, buckets))
+                self._draw_line_chart(x_indices[picks], y_data[picks], v_min, margin)
+            else:
+                self._draw_line_chart(x_indices, y_data, v_min, margin)
+        self.candle_wicks.set_visible(is_bar)
+        self.candle_bodies.set_visible(is_bar)
+        self.price_line.set_visible(not is_bar)
+        self.price_fill.set_visible(not is_bar)
         
         self._format_xaxis(x_indices, x_dates)
         
         # 최고가 최저가 표시 (토스틱 스타일)
-        high_max = visible_df['High'].max()
-        low_min = visible_df['Low'].min()
-        self.ax.axhline(y=high_max, color=COLOR_TOSS_RED, linestyle='--', alpha=0.6, linewidth=1)
-        self.ax.axhline(y=low_min, color=COLOR_TOSS_BLUE, linestyle='--', alpha=0.6, linewidth=1)
+        high_max = v_max
+        low_min = v_min
+        self.high_line.set_ydata([high_max, high_max])
+        self.low_line.set_ydata([low_min, low_min])
         
         # 최고가 최저가 텍스트 표시 (화폐 반영)
         if self.current_currency == CURRENCY_KRW:
@@ -1628,56 +1808,140 @@ class TossGestureHTS:
             high_text = f'HIGH ${high_max:.2f}'
             low_text = f'LOW ${low_min:.2f}'
         
-        self.ax.text(len(visible_df) - 1, high_max, high_text, 
+        self.high_label.set_position((len(visible_df) - 1, high_max))
+        self.high_label.set_text(high_text)
+        self.low_label.set_position((len(visible_df) - 1, low_min))
+        self.low_label.set_text(low_text)
+        
+        # 호버 하이라이트용 색상 (라인 차트 기준: 첫/마지막 종가 비교)
+        self._chart_color = COLOR_TOSS_RED if y_data[-1] >= y_data[0] else COLOR_TOSS_BLUE
+        self._visible_close = y_data
+
+        # 레이아웃 계산은 리사이즈/새 데이터일 때만
+        if self._layout_dirty:
+            self.fig.tight_layout(pad=1.0)
+            self._layout_dirty = False
+        
+        # 슬라이더/휠 이벤트가 몰리면 한 번의 draw로 합쳐짐
+        self.canvas_agg.draw_idle()
+
+    def _create_chart_artists(self):
+        """차트 아티스트 생성 (한 번만 - 이후엔 데이터만 갱신)"""
+        self._up_rgba = np.array(to_rgba(COLOR_TOSS_RED))
+        self._down_rgba = np.array(to_rgba(COLOR_TOSS_BLUE))
+        
+        # 선 차트: 라인 + 아래 채우기
+        self.price_line, = self.ax.plot([], [], color=COLOR_TOSS_RED, linewidth=2.5, antialiased=True)
+        self.price_fill = PolyCollection([], facecolors=COLOR_TOSS_RED, alpha=0.08, linewidths=0)
+        self.ax.add_collection(self.price_fill)
+        
+        # 캔들 차트: 꼬리(얇은 사각형) + 몸통
+        self.candle_wicks = PolyCollection([], linewidths=0, visible=False)
+        self.candle_bodies = PolyCollection([], linewidths=0, visible=False)
+        self.ax.add_collection(self.candle_wicks)
+        self.ax.add_collection(self.candle_bodies)
+        
+        # 최고가/최저가 선과 라벨
+        self.high_line = self.ax.axhline(y=0, color=COLOR_TOSS_RED, linestyle='--', alpha=0.6, linewidth=1)
+        self.low_line = self.ax.axhline(y=0, color=COLOR_TOSS_BLUE, linestyle='--', alpha=0.6, linewidth=1)
+        self.high_label = self.ax.text(0, 0, "", 
                     color=COLOR_TOSS_RED, fontsize=8, ha='right', va='bottom', 
                     bbox=dict(boxstyle="round,pad=0.2", facecolor=COLOR_CARD, edgecolor=COLOR_TOSS_RED, alpha=0.8))
-        self.ax.text(len(visible_df) - 1, low_min, low_text, 
+        self.low_label = self.ax.text(0, 0, "", 
                     color=COLOR_TOSS_BLUE, fontsize=8, ha='right', va='top', 
                     bbox=dict(boxstyle="round,pad=0.2", facecolor=COLOR_CARD, edgecolor=COLOR_TOSS_BLUE, alpha=0.8))
-        
-        if highlight_idx is not None and 0 <= highlight_idx < len(visible_df):
-            # 수직선 그리기
-            self.ax.axvline(x=highlight_idx, color=COLOR_TEXT_SUB, alpha=0.3, 
-                          linestyle='--', linewidth=1)
-            
-            # 전체 그래프의 색상 결정 (라인 차트 기준: 첫/마지막 종가 비교)
-            if len(y_data) > 0:
-                chart_color = COLOR_TOSS_RED if y_data[-1] >= y_data[0] else COLOR_TOSS_BLUE
-            else:
-                chart_color = COLOR_TOSS_RED
-            
-            # 그래프와 만나는 지점에 점 그리기 (그래프 색상 반영)
-            close_price = visible_df['Close'].iloc[highlight_idx]
-            self.ax.scatter([highlight_idx], [close_price], color=chart_color, s=100, zorder=5, edgecolors='white', linewidth=1)
-            
-            # 하이라이트된 인덱스와 가격을 저장
-            self.highlighted_price = close_price
-
-        self._apply_chart_style()
-        self.canvas_agg.draw()
 
-
-    def _draw_candlestick(self, visible_df, x_indices, v_min, margin):
-        """캔들스틱 차트 그리기"""
-        up_mask = visible_df['Close'] >= visible_df['Open']
-        colors = np.where(up_mask, COLOR_TOSS_RED, COLOR_TOSS_BLUE)
-        
-        self.ax.bar(x_indices, visible_df['High'] - visible_df['Low'], 
-                   bottom=visible_df['Low'], color=colors, width=0.08, linewidth=0)
-        
-        body_bottom = np.where(up_mask, visible_df['Open'], visible_df['Close'])
-        body_height = np.abs(visible_df['Close'] - visible_df['Open'])
-        body_height = body_height.clip(lower=margin * 0.05)
+    def _create_hover_artists(self):
+        """호버용 수직선/점 생성 (animated - 전체 draw에서 제외되고 블리팅으로만 그림)"""
+        self.hover_vline = self.ax.axvline(x=0, color=COLOR_TEXT_SUB, alpha=0.3,
+                                           linestyle='--', linewidth=1,
+                                           animated=True, visible=False)
+        self.hover_dot = self.ax.scatter([0], [0], color=self._chart_color, s=100, zorder=5,
+                                         edgecolors='white', linewidth=1,
+                                         animated=True, visible=False)
+
+    def _on_chart_resize(self, event):
+        """차트 크기 변경 시 다음 draw에서 레이아웃 재계산"""
+        self._layout_dirty = True
+        if not self.df.empty:
+            self.update_chart_view()
+
+    def _on_chart_draw(self, event):
+        """전체 draw 직후 정적 배경 캡처 (리사이즈 포함)"""
+        self._chart_background = self.canvas_agg.copy_from_bbox(self.fig.bbox)
+        self._highlight_idx = None
+
+    def _draw_highlight(self, highlight_idx):
+        """캐시된 배경 위에 수직선과 점만 블리팅"""
+        if self._chart_background is None or not (0 <= highlight_idx < len(self._visible_close)):
+            return
+        if highlight_idx == self._highlight_idx:
+            return
         
-        self.ax.bar(x_indices, body_height, bottom=body_bottom, 
-                   color=colors, width=0.7, linewidth=0)
+        close_price = self._visible_close[highlight_idx]
+        
+        self.canvas_agg.restore_region(self._chart_background)
+        self.hover_vline.set_xdata([highlight_idx, highlight_idx])
+        self.hover_vline.set_visible(True)
+        self.hover_dot.set_offsets([[highlight_idx, close_price]])
+        self.hover_dot.set_facecolor(self._chart_color)
+        self.hover_dot.set_visible(True)
+        self.ax.draw_artist(self.hover_vline)
+        self.ax.draw_artist(self.hover_dot)
+        self.canvas_agg.blit(self.fig.bbox)
+        
+        # 하이라이트된 인덱스와 가격을 저장
+        self._highlight_idx = highlight_idx
+        self.highlighted_price = close_price
+
+    def _clear_highlight(self):
+        """하이라이트 지우기 (배경만 복원)"""
+        self.hover_vline.set_visible(False)
+        self.hover_dot.set_visible(False)
+        if self._chart_background is not None and self._highlight_idx is not None:
+            self.canvas_agg.restore_region(self._chart_background)
+            self.canvas_agg.blit(self.fig.bbox)
+        self._highlight_idx = None
+
+    def _draw_candlestick(self, x_indices, opens, highs, lows, closes, margin, span=1.0):
+        """캔들스틱 차트 그리기 (사각형 꼭짓점만 갱신, span은 캔들 하나가 차지하는 봉 수)"""
+        up_mask = closes >= opens
+        colors = np.where(up_mask[:, None], self._up_rgba, self._down_rgba)
+        
+        body_bottom = np.minimum(opens, closes)
+        body_height = np.maximum(np.abs(closes - opens), margin * 0.05)
+        
+        self.candle_wicks.set_verts(self._bar_verts(x_indices, lows, highs - lows, 0.08 * span))
+        self.candle_wicks.set_facecolor(colors)
+        self.candle_bodies.set_verts(self._bar_verts(x_indices, body_bottom, body_height, 0.7 * span))
+        self.candle_bodies.set_facecolor(colors)
+
+    @staticmethod
+    def _bar_verts(x, bottom, height, width):
+        """막대 사각형 꼭짓점 배열 (N, 4, 2)"""
+        half = width / 2
+        verts = np.empty((len(x), 4, 2))
+        verts[:, 0, 0] = verts[:, 1, 0] = x - half
+        verts[:, 2, 0] = verts[:, 3, 0] = x + half
+        verts[:, 0, 1] = verts[:, 3, 1] = bottom
+        verts[:, 1, 1] = verts[:, 2, 1] = bottom + height
+        return verts
 
     def _draw_line_chart(self, x_indices, y_data, v_min, margin):
-        """선 차트 그리기"""
+        """선 차트 그리기 (라인/채우기 데이터만 갱신)"""
         main_color = COLOR_TOSS_RED if y_data[-1] >= y_data[0] else COLOR_TOSS_BLUE
+        base = v_min - margin
+        
+        self.price_line.set_data(x_indices, y_data)
+        self.price_line.set_color(main_color)
         
-        self.ax.plot(x_indices, y_data, color=main_color, linewidth=2.5, antialiased=True)
-        self.ax.fill_between(x_indices, y_data, v_min - margin, color=main_color, alpha=0.08)
+        fill_verts = np.empty((len(x_indices) + 2, 2))
+        fill_verts[0] = (x_indices[0], base)
+        fill_verts[1:-1, 0] = x_indices
+        fill_verts[1:-1, 1] = y_data
+        fill_verts[-1] = (x_indices[-1], base)
+        self.price_fill.set_verts([fill_verts])
+        self.price_fill.set_facecolor(main_color)
 
     def _format_xaxis(self, x_indices, x_dates):
         """X축 날짜 포맷 설정"""
@@ -1709,8 +1973,8 @@ class TossGestureHTS:
         
         self.ax.tick_params(colors=COLOR_TEXT_SUB, labelsize=8, length=0)
         self.ax.grid(True, axis='y', color=COLOR_DIVIDER, alpha=0.1)
-        self.fig.tight_layout(pad=1.0)
 
+    @perf.timed("chart.hover")
     def on_chart_hover(self, event):
         if self.df.empty:
             return
@@ -1796,20 +2060,16 @@ class TossGestureHTS:
             py = max(0, py)
             
             self.tooltip.place(x=px, y=py)
-            self.update_chart_view(highlight_idx=x_idx)
+            self._draw_highlight(x_idx)
 
         except Exception:
             self.tooltip.place_forget()
 
 
-    def on_chart_leave(self, event):
-        self.tooltip.place_forget()
-        self.update_chart_view()
-
     def on_chart_leave(self, event):
         """차트에서 마우스가 벗어났을 때"""
         self.tooltip.place_forget()
-        self.update_chart_view()
+        self._clear_highlight()
 
     def on_chart_click(self, event):
         """차트 클릭 - 현재 하이라이트된 가격을 주문가로 설정"""
@@ -1829,236 +2089,238 @@ class TossGestureHTS:
             self.show_toast("가격 설정에 실패했습니다", "#6B7684")
 
     def execute_trade(self, side):
-        """거래 실행"""
+        """1주 지정가 주문 접수 (현재가로 체결 가능하면 즉시 체결, 아니면 시세가 닿을 때까지 대기)"""
         try:
             # 쉼표 제거 후 float로 변환
             order_price_str = self.ent_order.get().replace(',', '')
             order_price = float(order_price_str)
+            if not math.isfinite(order_price) or order_price <= 0:
+                raise ValueError("Order price must be positive")
         except ValueError:
             self.show_toast("올바른 가격을 입력하세요", "#6B7684")
             winsound.Beep(400, 200)  # 에러 소리
             return
         
-        # 현재 화폐 설정에 따라 원화로 변환
+        # 현재 화폐 설정에 따라 원화로 변환 (주문/장부 가격은 시세와 같은 USD 기준)
         if self.current_currency == CURRENCY_KRW:
             cost = int(order_price)
+            usd_price = order_price / self.krw_usd_rate
         else:
             cost = int(order_price * self.krw_usd_rate)
+            usd_price = order_price
         
-        if side == "BUY":
-            if self.balance >= cost:
-                self.balance -= cost
-                self.holdings[self.symbol] = self.holdings.get(self.symbol, 0) + 1
-                # 현재 가격 캐시에 저장
-                self.stock_prices[self.symbol] = order_price
-                display_price = f"{order_price:,.2f}"
+        book = self._order_book(self.symbol)
+        if side == SIDE_BUY and self.balance - self._reserved_cash() < cost:
+            self.show_toast("잔액이 부족합니다", "#6B7684")
+            winsound.Beep(400, 200)  # 에러 소리
+            return
+        if side == SIDE_SELL and \
+                self.portfolio.quantity_of(self.symbol) - sum(book.levels[SIDE_SELL].values()) < 1:
+            self.show_toast("보유 주식이 없습니다", "#6B7684")
+            winsound.Beep(400, 200)  # 에러 소리
+            return
+        
+        order, fills = book.submit(side, usd_price, 1, ORDER_TIME_IN_FORCE, now=time.time())
+        if fills:
+            self._apply_fills(self.symbol, fills)
+        else:
+            action = "매수" if side == SIDE_BUY else "매도"
+            self.show_toast(f"{order_price:,.2f} {action} 주문 접수 (미체결 {len(book)}건)", "#6B7684")
+            winsound.Beep(600, 80)
+
+    def _order_book(self, symbol):
+        """종목 주문 장부 (처음이면 마지막 시세를 기준 가격으로 설정)"""
+        book = self.order_books.get(symbol)
+        if book is None:
+            book = self.order_books[symbol] = OrderBook(symbol)
+            price = self.current_price if symbol == self.symbol else self.stock_prices.get(symbol)
+            if price:
+                book.on_tick(price, time.time())
+        return book
+
+    def _reserved_cash(self):
+        """미체결 매수 주문에 묶인 원화 (지정가 기준, 현재 환율)"""
+        usd = sum(price * qty for book in self.order_books.values()
+                  for price, qty in book.levels[SIDE_BUY].items())
+        return usd * self.krw_usd_rate
+
+    def _match_orders(self, quotes):
+        """새 시세로 미체결 주문 체결 (Tk 스레드)"""
+        now = time.time()
+        for symbol, price in quotes.items():
+            book = self.order_books.get(symbol)
+            if book is not None and price:
+                book.expire(now)
+                fills = book.on_tick(price, now)
+                if fills:
+                    self._apply_fills(symbol, fills)
+
+    def cancel_open_orders(self, event=None):
+        """현재 종목의 미체결 주문 전부 취소 (Esc)"""
+        book = self.order_books.get(self.symbol)
+        cancelled = book.cancel_all() if book is not None else []
+        if cancelled:
+            self.show_toast(f"미체결 주문 {len(cancelled)}건 취소", "#6B7684")
+
+    def _apply_fills(self, symbol, fills):
+        """체결 반영 (체결가는 지정가가 아니라 체결 시점 시세)"""
+        for fill in fills:
+            cost = int(fill.price * fill.quantity * self.krw_usd_rate)
+            if self.current_currency == CURRENCY_KRW:
+                fill_price = fill.price * self.krw_usd_rate
+            else:
+                fill_price = fill.price
+            self._record_trade(fill.side, symbol, fill.quantity, fill_price, fill.price, cost)
+            
+            display_price = f"{fill_price:,.2f}"
+            if fill.side == SIDE_BUY:
                 self.show_toast(f"{display_price} 매수 완료", COLOR_TOSS_RED)
                 # 매수 성공 소리
                 winsound.Beep(800, 100)
                 winsound.Beep(1000, 100)
             else:
-                self.show_toast("잔액이 부족합니다", "#6B7684")
-                winsound.Beep(400, 200)  # 에러 소리
-                
-        elif side == "SELL":
-            if self.holdings.get(self.symbol, 0) > 0:
-                self.balance += cost
-                self.holdings[self.symbol] -= 1
-                if self.holdings[self.symbol] == 0:
-                    del self.holdings[self.symbol]
-                display_price = f"{order_price:,.2f}"
                 self.show_toast(f"{display_price} 매도 완료", COLOR_TOSS_BLUE)
                 # 매도 성공 소리
                 winsound.Beep(1000, 100)
                 winsound.Beep(800, 100)
-            else:
-                self.show_toast("보유 주식이 없습니다", "#6B7684")
-                winsound.Beep(400, 200)  # 에러 소리
         
         self._update_balance_display()
         self._update_holdings_display()
 
+    def _record_trade(self, side, symbol, quantity, order_price, usd_price, cost):
+        """체결을 장부에 기록한 뒤 잔액/보유 종목에 반영 (복구와 같은 경로)"""
+        args = (side, symbol, quantity, order_price, self.current_currency,
+                self.krw_usd_rate, usd_price, cost)
+        if self.journal is not None:
+            record = self.journal.append(*args)
+        else:
+            record = TradeRecord(0, time.time(), *args)
+        self.balance = apply_trade(record, self.balance, self.portfolio)
+        
+        if self.journal is not None and self.journal.needs_snapshot:
+            self.journal.snapshot(self._ledger_state())
+
     def show_toast(self, msg, color):
         """토스트 메시지 표시"""
         self.toast.config(text=msg, bg=color)
         self.toast.place(relx=0.5, rely=0.05, anchor='n')
         self.root.after(TOAST_DURATION, self.toast.place_forget)
 
-    def _is_fist_closed(self, hand_landmarks):
-        """주먹 쥐었는지 판단"""
-        folded_count = 0
-        finger_tips = [8, 12, 16, 20]
-        
-        for tip_idx in finger_tips:
-            tip = hand_landmarks.landmark[tip_idx]
-            pip = hand_landmarks.landmark[tip_idx - 2]
-            
-            if tip.y > pip.y + FINGER_FOLD_THRESHOLD:
-                folded_count += 1
-        
-        return folded_count >= 4
-
-    def _is_hand_open(self, hand_landmarks):
-        """손이 완전히 펼쳐져 있는지 판단"""
-        open_count = 0
-        finger_tips = [8, 12, 16, 20]  # 검지, 중지, 약지, 소지 끝
-        
-        for tip_idx in finger_tips:
-            tip = hand_landmarks.landmark[tip_idx]
-            pip = hand_landmarks.landmark[tip_idx - 2]  # 각 손가락의 PIP 관절
-            
-            # 손가락이 펼쳐져 있으면 tip이 pip보다 위에 있음
-            if tip.y < pip.y - FINGER_FOLD_THRESHOLD:
-                open_count += 1
-        
-        # 엄지 확인 (엄지는 좌우 방향으로 접힘)
-        thumb_tip = hand_landmarks.landmark[4]
-        thumb_mcp = hand_landmarks.landmark[2]  # 엄지 MCP 관절
-        
-        # 손의 방향에 따라 엄지가 펼쳐져 있는지 확인
-        wrist = hand_landmarks.landmark[0]
-        index_mcp = hand_landmarks.landmark[5]
-        is_right_hand = index_mcp.x > wrist.x
-        
-        if is_right_hand:
-            thumb_open = thumb_tip.x > thumb_mcp.x - FINGER_FOLD_THRESHOLD
+    @perf.timed("gesture.process")
+    def _process_hand_gestures(self, results, now):
+        """손 제스처 처리 (상태 기계가 낸 이벤트만 반영)"""
+        if results.multi_hand_landmarks:
+            points = landmarks_to_array(results.multi_hand_landmarks)
+            labels = [h.classification[0].label for h in results.multi_handedness]
         else:
-            thumb_open = thumb_tip.x < thumb_mcp.x + FINGER_FOLD_THRESHOLD
-        
-        # 4개 손가락이 모두 펼쳐져 있고 엄지도 펼쳐져 있으면 완전히 펼친 손
-        return open_count >= 4 and thumb_open
-
-    def _detect_price_adjustment_gesture(self, hand_landmarks):
-        """가격 조정 제스처 감지"""
-        idx_y = hand_landmarks.landmark[8].y
-        mid_y = hand_landmarks.landmark[12].y
-        
-        threshold = FINGER_FOLD_THRESHOLD
-        
-        if idx_y < mid_y - threshold:
-            return "UP"
-        elif mid_y < idx_y - threshold:
-            return "DOWN"
-        
-        return None
-
-    def _process_hand_gestures(self, results):
-        """손 제스처 처리"""
-        if not results.multi_hand_landmarks:
-            self.right_fist_start = None
-            self.left_fist_start = None
-            self._update_button_progress("BUY", 0.0)
-            self._update_button_progress("SELL", 0.0)
-            return
-        
-        now = time.time()
-        
-        # 제스처 진행도 초기화
-        right_progress_val = 0
-        left_progress_val = 0
-        
-        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-            label = handedness.classification[0].label
-            
-            if self._is_fist_closed(hand_landmarks):
-                if label == "Left":  # 왼손 = 매수
-                    if self.left_fist_start is None:
-                        self.left_fist_start = now
-                    
-                    elapsed = now - self.left_fist_start
-                    left_progress_val = min(1.0, elapsed / FIST_HOLD_DURATION)
-                    
-                    if elapsed >= FIST_HOLD_DURATION:
-                        self.execute_trade("BUY")
-                        self.left_fist_start = None
-                        left_progress_val = 0
-                        
-                elif label == "Right":  # 오른손 = 매도
-                    if self.right_fist_start is None:
-                        self.right_fist_start = now
-                    
-                    elapsed = now - self.right_fist_start
-                    right_progress_val = min(1.0, elapsed / FIST_HOLD_DURATION)
-                    
-                    if elapsed >= FIST_HOLD_DURATION:
-                        self.execute_trade("SELL")
-                        self.right_fist_start = None
-                        right_progress_val = 0
-            else:
-                if label == "Left":
-                    self.left_fist_start = None
-                elif label == "Right":
-                    self.right_fist_start = None
-                
-                # 완전히 펼친 손 제스처 감지 (현재가로 지정가 설정)
-                if self._is_hand_open(hand_landmarks):
-                    if now - self.last_open_hand_time > self.OPEN_HAND_COOLDOWN:
-                        if self.current_price > 0:
-                            self.order_amount = int(self.current_price)
-                            self.ent_order.delete(0, 'end')
-                            self.ent_order.insert(0, str(self.order_amount))
-                            self.last_open_hand_time = now
-                            self.show_toast(f"지정가를 현재가로 설정: {self.current_price:,.2f}$", "#3182F6")
-                else:
-                    # 가격 조정 제스처 (검지/중지)
-                    gesture = self._detect_price_adjustment_gesture(hand_landmarks)
-                    if gesture == "UP":
-                        self.order_amount = max(0, self.order_amount + PRICE_STEP)
-                        self.ent_order.delete(0, 'end')
-                        self.ent_order.insert(0, str(int(self.order_amount)))
-                    elif gesture == "DOWN":
-                        self.order_amount = max(0, self.order_amount - PRICE_STEP)
-                        self.ent_order.delete(0, 'end')
-                        self.ent_order.insert(0, str(int(self.order_amount)))
-        
-        # 진행도 업데이트 (버튼 테두리로 표시)
-        self._update_button_progress("BUY", left_progress_val)
-        self._update_button_progress("SELL", right_progress_val)
+            points, labels = NO_HANDS, []
+
+        for event in self.gestures.update(now, points, labels):
+            self._apply_gesture_event(event)
+
+    def _apply_gesture_event(self, event):
+        """제스처 이벤트 하나를 주문 입력/버튼/거래에 반영"""
+        if event.kind == EVENT_HOLD_PROGRESS:
+            # 진행도 업데이트 (버튼 테두리로 표시)
+            self._update_button_progress(event.side, event.value)
+        elif event.kind in (EVENT_BUY, EVENT_SELL):
+            self.execute_trade(event.side)
+        elif event.kind == EVENT_RESET_TO_MARKET:
+            # 완전히 펼친 손 제스처 (현재가로 지정가 설정)
+            if self.current_price > 0:
+                self._set_order_amount(int(self.current_price))
+                self.show_toast(f"지정가를 현재가로 설정: {self.current_price:,.2f}$", "#3182F6")
+        elif event.kind == EVENT_PRICE_UP:
+            self._set_order_amount(self.order_amount + PRICE_STEP)
+        elif event.kind == EVENT_PRICE_DOWN:
+            self._set_order_amount(self.order_amount - PRICE_STEP)
+
+    def _set_order_amount(self, amount):
+        """지정가 변경 (입력창 내용이 달라질 때만 갱신)"""
+        self.order_amount = max(0, int(amount))
+        text = str(self.order_amount)
+        if self.ent_order.get() != text:
+            self.ent_order.delete(0, 'end')
+            self.ent_order.insert(0, text)
 
+    @perf.timed("ui.main_loop")
     def main_loop(self):
-        """메인 루프 (카메라 처리)"""
-        if not self.cap.isOpened():
-            self.root.after(CAMERA_UPDATE_INTERVAL, self.main_loop)
-            return
-        
-        ret, frame = self.cap.read()
-        
-        if ret:
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            results = self.hands.process(rgb_frame)
+        """메인 루프 (비전 스레드의 최신 결과만 반영)"""
+        frame = self.vision.latest()
+        
+        if frame is not None:
+            if frame.timings is not None:
+                perf.record("vision.frame_age", time.perf_counter() - frame.timings.captured_at)
+            # 미리보기 버퍼는 비전 스레드가 재사용하므로 제스처 처리(소리/주문) 전에 바로 복사
+            self.cam_photo.paste(Image.fromarray(frame.preview))
             
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                
-                self._process_hand_gestures(results)
-            else:
-                self.right_fist_start = None
-                self.left_fist_start = None
-                self._update_button_progress("BUY", 0.0)
-                self._update_button_progress("SELL", 0.0)
-            
-            img = Image.fromarray(rgb_frame)
-            img_resized = img.resize((CAM_W, CAM_H), Image.Resampling.LANCZOS)
-            imgtk = ImageTk.PhotoImage(image=img_resized)
-            
-            self.lbl_cam.imgtk = imgtk
-            self.lbl_cam.configure(image=imgtk)
+            self._process_hand_gestures(frame.results, frame.timestamp)
         
         self.root.after(CAMERA_UPDATE_INTERVAL, self.main_loop)
 
+    def toggle_perf_overlay(self, event=None):
+        """성능 오버레이 표시/숨김 (표시하는 동안 계측 활성화)"""
+        if self._perf_overlay_job is not None:
+            self.root.after_cancel(self._perf_overlay_job)
+            self._perf_overlay_job = None
+            self.perf_overlay.place_forget()
+            perf.recorder.enabled = self._perf_was_enabled
+            return
+        
+        self._perf_was_enabled = perf.recorder.enabled
+        perf.recorder.enabled = True
+        self.perf_overlay.place(x=30, y=30)
+        self.perf_overlay.lift()
+        self._update_perf_overlay()
+
+    def _update_perf_overlay(self):
+        """오버레이 텍스트 갱신 (구간별 p50/p95/p99)"""
+        lines = perf.recorder.format_lines()
+        if self.vision is not None:
+            lines.append(f"vision {self.vision.frames} frames, {self.vision.dropped} dropped")
+        lines.append(f"refresh queue {self.refresher.queue_depth()}")
+        self.perf_overlay.config(text="\n".join(lines))
+        self._perf_overlay_job = self.root.after(PERF_OVERLAY_INTERVAL, self._update_perf_overlay)
+
+    def _dump_perf_stats(self):
+        """계측 중이면 통계를 JSON(최신 값)과 CSV(누적)로 저장 (파일 I/O는 워커에서)"""
+        if perf.recorder.enabled:
+            self.refresher.submit("perf_dump", self._write_perf_stats)
+        self.root.after(PERF_DUMP_INTERVAL, self._dump_perf_stats)
+
+    @staticmethod
+    def _write_perf_stats():
+        os.makedirs(PERF_DUMP_DIR, exist_ok=True)
+        perf.recorder.dump_json(os.path.join(PERF_DUMP_DIR, "perf.json"))
+        perf.recorder.dump_csv(os.path.join(PERF_DUMP_DIR, "perf.csv"))
+
     def cleanup(self):
         """리소스 정리"""
-        if self.cap.isOpened():
-            self.cap.release()
-        self.hands.close()
+        with self._vision_lock:
+            self._closing = True
+            pending, self._pending_vision = self._pending_vision, None
+        self.refresher.shutdown()
+        if pending is not None:
+            pending.stop()
+        if self.vision is not None:
+            self.vision.stop()
+        if self.journal is not None:
+            self.journal.close(self._ledger_state())
 
 
 def main():
+    parser = argparse.ArgumentParser(description="SFlick-HTS")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a video file or recorded .npz session instead of the webcam")
+    parser.add_argument("--perf", action="store_true",
+                        help="record hot-path timings from startup (F12 toggles the overlay)")
+    parser.add_argument("--lite-model", action="store_true",
+                        help="use the lite hand landmark model (lower latency, less accurate)")
+    args, _ = parser.parse_known_args()
+
     root = tk.Tk()
-    app = TossGestureHTS(root)
+    app = TossGestureHTS(root, replay=args.replay, perf_enabled=args.perf,
+                         model_complexity=0 if args.lite_model else MODEL_COMPLEXITY)
     
     def on_closing():
         app.cleanup()
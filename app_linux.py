@@ -10,8 +10,14 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from PIL import Image, ImageTk
 import numpy as np
-import collections
+import argparse
 import os # Linux 환경 변수 설정을 위해 추가
+from replay import open_source
+from simulation import PathEngine
+from chart_data import PriceRing, minmax_envelope
+from orderbook import OrderBook, TIF_GTC
+from vision import VisionPipeline
+import perf
 
 # ------------------ Linux 환경 설정 ------------------
 # Matplotlib 백엔드 명시 (Tkinter와 충돌 방지 및 안정성 확보)
@@ -27,10 +33,26 @@ INIT_PRICE = 1100.0
 MU = 0.0001     # drift per tick
 SIGMA = 0.0025  # volatility per sqrt(tick)
 TICK_DT = 1.0/20.0  # 초당 업데이트(약 20Hz)
+JUMP_PROB = 0.004   # 틱당 점프 확률
+JUMP_RANGE = (0.6, 2.5)  # 점프 크기 (%)
+SIM_MAX_CATCHUP = 1200   # 한 번에 따라잡는 최대 틱 수 (그 이상 밀리면 시뮬레이션 시계를 당김)
+
+# 루프별 주기 (시뮬레이션 시계, 비전 결과 확인, 차트 다시 그리기는 서로 독립)
+VISION_POLL_MS = 10     # 새 비전 결과 확인 간격 (캡처/추론은 전용 스레드)
+CHART_FPS = 15          # 차트 다시 그리기 상한
+CHART_HISTORY = 300     # 차트에 보이는 최근 틱 수 (--history로 변경, 수십만까지 가능)
+CHART_POINTS_PER_PX = 1 # 히스토리가 길면 픽셀당 최소/최대 1쌍으로 줄여서 그림
+CHART_Y_PAD = 0.1       # y축 여백 (가격 범위 대비) - 이 안에서 움직이면 축을 다시 그리지 않음
+CHART_MIN_SPAN = 1.0    # 여백 계산에 쓰는 최소 가격 범위 (가격이 거의 안 움직일 때)
+RATE_REPORT_MS = 1000   # 루프별 달성 빈도 표시 간격
 
 # 주문 스텝
 STEP_NORMAL = 10
 
+# 지정가 주문 (시뮬레이션 틱이 지정가에 닿으면 체결, 그 전까지 대기)
+ORDER_QUANTITY = 1
+ORDER_TIF = TIF_GTC
+
 # 사운드 쿨다운
 SND_COOLDOWN_INC = 0.15
 SND_COOLDOWN_DEC = 0.15
@@ -42,14 +64,10 @@ POPUP_DURATION = 2000
 
 # ------------------ Mediapipe 초기화 ------------------
 mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7)
 
 # ------------------ 상태 변수 ------------------
 current_price = INIT_PRICE
 order_amount = int(INIT_PRICE)
-price_history = collections.deque(maxlen=300)  # 화면에 보일 최근 가격
-price_history.append(current_price)
 
 # 제스처 상태 유지 (필수 — 절대 삭제 금지)
 right_fist_start = None
@@ -63,11 +81,26 @@ last_dec_sound = 0.0
 last_reset_sound = 0.0
 last_trade_sound = 0.0
 
-# 카메라: Linux (V4L2) 백엔드 명시
-# Arch Linux에서는 0번 카메라가 기본적으로 V4L2를 사용할 가능성이 높지만, 명시적으로 지정
-cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
+# 리플레이: --replay 로 동영상/녹화 세션(.npz)을 카메라 대신 재생
+parser = argparse.ArgumentParser(description="HTS-like Gesture Trading")
+parser.add_argument("--replay", metavar="PATH", help="video file or recorded .npz session")
+parser.add_argument("--loop", action="store_true", help="loop the replay source")
+parser.add_argument("--seed", type=int, default=None, help="price simulation seed (reproducible path)")
+parser.add_argument("--history", type=int, default=CHART_HISTORY, help="ticks kept on the chart")
+ARGS, _ = parser.parse_known_args()
+
+# 화면에 보일 최근 가격 (미리 할당한 링 버퍼)
+price_history = PriceRing(ARGS.history)
+price_history.append(current_price)
+
+if ARGS.replay:
+    cap = open_source(ARGS.replay, loop=ARGS.loop)
+else:
+    # 카메라: Linux (V4L2) 백엔드 명시
+    # Arch Linux에서는 0번 카메라가 기본적으로 V4L2를 사용할 가능성이 높지만, 명시적으로 지정
+    cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
 
 # ------------------ 사운드 유틸 (beepy 수정) ------------------
 # beepy의 사운드 객체를 미리 로드 (Linux에서 더 안정적)
@@ -175,11 +208,19 @@ ax.spines['bottom'].set_color('#334155')
 ax.spines['left'].set_color('#334155')
 ax.spines['top'].set_visible(False)
 ax.spines['right'].set_visible(False)
-line, = ax.plot([], [], linewidth=1.4)
+ax.set_xticks([])
+
+# 가격선/채움은 한 번만 만들고 데이터만 교체 (animated - 전체 draw에서 제외되고 블리팅으로만 그림)
+line, = ax.plot([], [], linewidth=1.6, color='#FBBF24', animated=True)
+fill = ax.fill_between([0, 1], [0, 0], 0, alpha=0.06, color='#FBBF24', linewidth=0, animated=True)
 
 canvas = FigureCanvasTkAgg(fig, master=left_panel)
 canvas.get_tk_widget().pack(fill='both', expand=True)
 
+# 루프별 달성 빈도 (시뮬레이션 Hz / 비전 fps / 차트 fps)
+rate_lbl = ttk.Label(left_panel, text="", style='Small.TLabel')
+rate_lbl.pack(anchor='w')
+
 # 오른쪽: 카메라 + 주문 UI + 로그
 right_panel = ttk.Frame(main_frame, width=400)
 right_panel.pack(side='right', fill='y', expand=False)
@@ -257,8 +298,35 @@ def hide_popup():
     popup_frame.lower()
     popup_frame_visible = False
 
-# ------------------ 트레이드 실행 (원본 유지) ------------------
-def execute_trade(side, price):
+# ------------------ 트레이드 실행 (지정가 주문 -> 틱 체결) ------------------
+order_book = OrderBook("SIM")
+order_book.on_tick(current_price, time.time())
+
+def execute_trade(side):
+    """Order Amount 가격으로 지정가 주문 접수 (체결 가능하면 즉시 체결)"""
+    try:
+        limit = float(order_entry.get())
+        if not np.isfinite(limit) or limit <= 0:
+            raise ValueError("Order price must be positive")
+    except ValueError:
+        append_log("Invalid order price")
+        return
+    order, fills = order_book.submit(side, limit, ORDER_QUANTITY, ORDER_TIF, now=time.time())
+    if fills:
+        on_fills(fills)
+    else:
+        append_log(f"{side} limit @{int(limit)} accepted ({len(order_book)} open)")
+
+def cancel_orders(event=None):
+    cancelled = order_book.cancel_all()
+    if cancelled:
+        append_log(f"Cancelled {len(cancelled)} open orders")
+
+def on_fills(fills):
+    for fill in fills:
+        fill_trade(fill.side, fill.price)
+
+def fill_trade(side, price):
     global last_trade_sound
     append_log(f"{side} executed @{int(price)}")
     show_popup(side, price, order_entry.get())
@@ -268,49 +336,126 @@ def execute_trade(side, price):
         snd_trade() # 수정된 snd_trade 호출
         last_trade_sound = now
 
-# 버튼에 바인딩
-buy_btn.config(command=lambda: execute_trade("BUY", current_price))
-sell_btn.config(command=lambda: execute_trade("SELL", current_price))
-
-# ------------------ 차트 업데이트 (GBM) (원본 유지) ------------------
-def gbm_next_price(s0):
-    # 한 tick에서 GBM
-    z = np.random.normal()
-    s1 = s0 * np.exp((MU - 0.5*SIGMA**2)*TICK_DT + SIGMA * np.sqrt(TICK_DT) * z)
-    return max(1.0, s1)
+# 버튼에 바인딩 (Esc: 미체결 주문 전부 취소)
+buy_btn.config(command=lambda: execute_trade("BUY"))
+sell_btn.config(command=lambda: execute_trade("SELL"))
+root.bind("<Escape>", cancel_orders)
+
+# ------------------ 가격 시뮬레이션 (GBM + 점프, 블록 단위로 미리 생성) ------------------
+price_engine = PathEngine([INIT_PRICE], MU, SIGMA, TICK_DT, jump_prob=JUMP_PROB,
+                          jump_range=JUMP_RANGE, seed=ARGS.seed)
+
+# ------------------ 차트 업데이트 (원본 유지) ------------------
+chart_background = None
+chart_x_span = 1
+
+def on_chart_draw(event):
+    """전체 draw 직후 축/격자 배경 캡처 (리사이즈 포함)"""
+    global chart_background
+    chart_background = canvas.copy_from_bbox(ax.bbox)
+
+canvas.mpl_connect('draw_event', on_chart_draw)
+
+def _chart_needs_layout(lo, hi, n):
+    """가격이 y축 범위를 벗어났거나 범위가 너무 넓어졌거나 x축이 가득 찼으면 True"""
+    y0, y1 = ax.get_ylim()
+    span = max(hi - lo, CHART_MIN_SPAN)
+    return lo < y0 or hi > y1 or (y1 - y0) > span * (1 + 4 * CHART_Y_PAD) or n > chart_x_span
+
+def _layout_chart(lo, hi, n):
+    """축 범위 재설정 후 전체 draw (x축은 가득 찰 때마다 두 배, 최대 히스토리 길이)"""
+    global chart_x_span
+    pad = max(hi - lo, CHART_MIN_SPAN) * CHART_Y_PAD
+    ax.set_ylim(lo - pad, hi + pad)
+    while chart_x_span < n:
+        chart_x_span = min(chart_x_span * 2, price_history.capacity)
+    ax.set_xlim(0, max(chart_x_span - 1, 1))
+    canvas.draw()
 
 def update_chart_canvas():
-    y = np.array(price_history)
-    x = np.arange(len(y))
-    ax.clear()
-    ax.set_facecolor('#071122')
-    ax.plot(x, y, linewidth=1.6, color='#FBBF24')
-    ax.fill_between(x, y, y.min(), alpha=0.06, color='#FBBF24')
-    ax.set_xticks([])
-    ax.tick_params(axis='y', colors='#cbd5e1')
-    ax.spines['bottom'].set_color('#334155')
-    ax.spines['left'].set_color('#334155')
+    """가격선 데이터만 교체하고 캐시된 배경 위에 블리팅 (축 범위가 바뀔 때만 전체 draw)"""
+    y = price_history.values()
+    buckets = max(1, int(ax.bbox.width * CHART_POINTS_PER_PX))
+    x, y = minmax_envelope(y, buckets)
+    lo, hi = float(y.min()), float(y.max())
+    if chart_background is None or _chart_needs_layout(lo, hi, len(price_history)):
+        _layout_chart(lo, hi, len(price_history))
+
+    line.set_data(x, y)
+    fill.set_verts([np.column_stack((np.concatenate((x, x[::-1])),
+                                     np.concatenate((y, np.full(len(y), lo)))))])
+    canvas.restore_region(chart_background)
+    ax.draw_artist(fill)
+    ax.draw_artist(line)
+    canvas.blit(ax.bbox)
     cur_price_lbl.config(text=f"Current Price: {int(current_price)}")
-    canvas.draw()
 
-# ------------------ 메인 루프: 카메라 + 제스처 + 시뮬레이션 (원본 유지) ------------------
-def main_loop():
-    global current_price, order_amount
+# ------------------ 비전 파이프라인 (캡처 + 추론은 전용 스레드) ------------------
+vision = VisionPipeline(preview_size=(CAM_W, CAM_H), max_num_hands=2,
+                        min_detection_confidence=0.7, source=cap)
+
+# 루프별 달성 빈도
+sim_rate = perf.RateCounter()
+vision_rate = perf.RateCounter()
+chart_rate = perf.RateCounter()
+
+sim_clock_start = None
+chart_dirty = True
+
+# ------------------ 시뮬레이션 시계: 실제 경과 시간만큼 틱 진행 ------------------
+def sim_loop():
+    """벽시계 기준으로 밀린 틱을 한 번에 진행 (UI가 멈춰도 시뮬레이션 시간은 정확)"""
+    global current_price, sim_clock_start, chart_dirty
+
+    now = time.perf_counter()
+    if sim_clock_start is None:
+        sim_clock_start = now - price_engine.tick * TICK_DT
+    due = int((now - sim_clock_start) / TICK_DT) - price_engine.tick
+    if due > SIM_MAX_CATCHUP:
+        # 절전 복귀 등으로 너무 오래 밀렸으면 마지막 SIM_MAX_CATCHUP틱만 진행
+        sim_clock_start += (due - SIM_MAX_CATCHUP) * TICK_DT
+        due = SIM_MAX_CATCHUP
+
+    if due > 0:
+        prices = price_engine.advance(due)[:, 0]
+        price_history.extend(prices)
+        current_price = float(prices[-1])
+        sim_rate.tick(due)
+        chart_dirty = True
+
+        # 밀린 틱을 순서대로 주문 장부에 반영 (미체결 주문이 있을 때만 틱마다)
+        match_ticks(prices, time.time())
+
+    # 다음 틱 경계에 맞춰 재호출
+    next_tick = sim_clock_start + (price_engine.tick + 1) * TICK_DT
+    root.after(max(1, int((next_tick - time.perf_counter()) * 1000)), sim_loop)
+
+def match_ticks(prices, now):
+    """틱 묶음으로 미체결 주문 체결 (어느 주문도 닿지 않는 묶음은 마지막 틱만 반영)"""
+    bid = order_book.best("BUY")
+    ask = order_book.best("SELL")
+    if (bid is None or prices.min() > bid) and (ask is None or prices.max() < ask):
+        order_book.on_tick(float(prices[-1]), now)
+        return
+    fills = []
+    for price in prices.tolist():
+        fills.extend(order_book.on_tick(price, now))
+    on_fills(fills)
+
+# ------------------ 비전 루프: 새 결과가 있을 때만 제스처 처리 ------------------
+def vision_loop():
+    frame = vision.latest()
+    if frame is not None:
+        vision_rate.tick()
+        process_hands(frame)
+    root.after(VISION_POLL_MS, vision_loop)
+
+def process_hands(frame):
+    global order_amount
     global right_fist_start, left_fist_start
     global last_inc_sound, last_dec_sound, last_reset_sound, last_trade_sound
 
-    now = time.time()
-    # 1) 카메라 읽기
-    ret, frame = cap.read()
-    if not ret:
-        print("경고: 카메라 프레임을 읽을 수 없습니다. (카메라 연결 확인)")
-        root.after(int(1000 * TICK_DT), main_loop) # 계속 루프 재호출 시도
-        return
-    
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-
+    results = frame.results
     current_time = time.time()
     right_fist = False
     left_fist = False
@@ -347,23 +492,20 @@ def main_loop():
                     if current_time - last_inc_sound >= SND_COOLDOWN_INC:
                         snd_inc(); last_inc_sound = current_time # 수정된 snd_inc 호출
                 elif gesture == "DEC":
-                    order_amount = int(order_amount) - STEP_NORMAL
+                    order_amount = max(STEP_NORMAL, int(order_amount) - STEP_NORMAL)
                     order_entry.delete(0, 'end'); order_entry.insert(0, str(int(order_amount)))
                     if current_time - last_dec_sound >= SND_COOLDOWN_DEC:
                         snd_dec(); last_dec_sound = current_time # 수정된 snd_dec 호출
 
-            # 랜드마크 그리기
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
     # 주먹 4초 유지 -> 거래 체결 (원본 로직)
     if right_fist and right_fist_start and (current_time - right_fist_start >= 4.0):
-        execute_trade("BUY", current_price)
+        execute_trade("BUY")
         right_fist_start = None
     elif not right_fist:
         right_fist_start = None
 
     if left_fist and left_fist_start and (current_time - left_fist_start >= 4.0):
-        execute_trade("SELL", current_price)
+        execute_trade("SELL")
         left_fist_start = None
     elif not left_fist:
         left_fist_start = None
@@ -373,9 +515,8 @@ def main_loop():
         snd_reset() # 수정된 snd_reset 호출
         last_reset_sound = current_time
 
-    # 카메라를 Tkinter에 표시
-    img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    img = Image.fromarray(img).resize((CAM_W, CAM_H))
+    # 카메라를 Tkinter에 표시 (미리보기는 비전 스레드가 축소/RGB 변환/랜드마크까지 처리)
+    img = Image.fromarray(frame.preview)
     imgtk = ImageTk.PhotoImage(image=img)
     camera_label.imgtk = imgtk
     camera_label.configure(image=imgtk)
@@ -391,25 +532,29 @@ def main_loop():
     else:
         right_state_canvas.create_oval(2,2,14,14, outline='#cbd5e1', width=1)
 
-    # 2) 가격 시뮬레이션 (GBM)
-    jump = 0.0
-    if np.random.rand() < 0.004:
-        jump = np.random.choice([-1,1]) * np.random.uniform(0.6, 2.5)
-    next_price = gbm_next_price(current_price) * (1.0 + jump/100.0)
-    current_price = max(1.0, next_price)
-    price_history.append(current_price)
-
-    # 때때로 내부적으로 order_level에 근접하면 로그(모의 체결 힌트)
-    if abs(current_price - float(order_entry.get() or 0)) < 2.5:
-        append_log(f"Price near order level: {int(current_price)}")
+# ------------------ 차트 루프: 가격이 바뀐 경우에만 CHART_FPS 이하로 ------------------
+def chart_loop():
+    global chart_dirty
+    if chart_dirty:
+        chart_dirty = False
+        update_chart_canvas()
+        chart_rate.tick()
+    root.after(int(1000 / CHART_FPS), chart_loop)
 
-    # 차트 업데이트는 부담을 줄이기 위해 5틱에 한 번
-    update_chart_canvas()
+def report_rates():
+    rate_lbl.config(text=f"sim {sim_rate.read():.1f} Hz (target {1.0 / TICK_DT:.0f})  |  "
+                         f"vision {vision_rate.read():.1f} fps  |  chart {chart_rate.read():.1f} fps")
+    root.after(RATE_REPORT_MS, report_rates)
 
-    # 루프 재호출
-    root.after(int(1000 * TICK_DT), main_loop)
+def on_closing():
+    vision.stop()
+    root.destroy()
 
 # 시작
-root.after(100, main_loop)
-root.protocol("WM_DELETE_WINDOW", lambda: (cap.release(), root.destroy()))
-root.mainloop()
\ No newline at end of file
+vision.start()
+root.after(100, sim_loop)
+root.after(100, vision_loop)
+root.after(100, chart_loop)
+root.after(RATE_REPORT_MS, report_rates)
+root.protocol("WM_DELETE_WINDOW", on_closing)
+root.mainloop()
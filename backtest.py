@@ -0,0 +1,250 @@
+"""헤드리스 백테스트 (캐시된 봉 데이터로 거래 시뮬레이션 재생, 창/웹캠 없이 실행)
+
+디스크 봉 캐시(~/.sflick-hts/bars)나 CSV 디렉터리의 OHLCV를 읽어 이동평균 교차 전략의
+목표 포지션을 벡터 연산으로 만들고, 포지션이 바뀌는 봉에서만 앱과 같은 장부 경로
+(journal.apply_trade -> 원화 잔액 + Portfolio, 환율 반영)로 체결합니다. 자산 곡선도
+체결 시점 상태를 봉 전체로 펼쳐 한 번에 계산하며, 여러 종목은 프로세스 풀에서 병렬로
+실행합니다. 신호는 봉 종가 기준이고 체결은 다음 봉 시가입니다. 캐시에는 기본 주기(1d, 1m)만
+저장되므로 주봉/5분봉 같은 파생 주기는 --data-dir의 CSV로만 실행할 수 있습니다.
+
+    python backtest.py AAPL MSFT NVDA                  # 캐시된 일봉
+    python backtest.py AAPL --interval 1m --fast 10 --slow 40   # 캐시된 분봉 (최근 7일)
+    python backtest.py --data-dir bars/ --workers 8    # 디렉터리의 SYMBOL.csv 전체
+    python backtest.py AAPL --out results/             # 종목별 자산 곡선 CSV 저장
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bar_cache import BarDiskCache, CACHE_DIR
+from market_data import BASE_PERIODS
+from journal import TradeRecord, apply_trade, SIDE_BUY, SIDE_SELL
+from portfolio import Portfolio
+
+# app.py와 같은 값
+INITIAL_BALANCE = 50000000
+KRW_USD_RATE = 1350
+FX_SYMBOL = "KRW=X"
+
+# 전략 기본값
+FAST_WINDOW = 20
+SLOW_WINDOW = 60
+POSITION_FRACTION = 1.0     # 진입 시 쓰는 현금 비율
+
+
+# ------------------ 데이터 ------------------
+def load_bars(symbol, interval, data_dir=None):
+    """OHLCV DataFrame (data_dir가 있으면 SYMBOL.csv, 없으면 디스크 봉 캐시), 없으면 None"""
+    if data_dir is not None:
+        path = os.path.join(data_dir, f"{symbol}.csv")
+        if not os.path.exists(path):
+            return None
+        data = pd.read_csv(path, index_col=0)
+        # 서머타임 등으로 오프셋이 섞여 있어도 읽히도록 UTC로 통일
+        data.index = pd.to_datetime(data.index, utc=True)
+        return data.sort_index()
+    data, _ = BarDiskCache().load(symbol, interval)
+    return data
+
+
+def available_symbols(interval, data_dir=None):
+    """data_dir의 CSV 또는 캐시에 있는 (interval) 종목 목록 (환율 제외)"""
+    if data_dir is not None:
+        names = [os.path.splitext(os.path.basename(p))[0]
+                 for p in glob.glob(os.path.join(data_dir, "*.csv"))]
+    else:
+        names = []
+        for path in glob.glob(os.path.join(CACHE_DIR, f"*__{interval}.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    names.append(json.load(f)["symbol"])
+            except (OSError, ValueError, KeyError):
+                continue
+    return sorted(name for name in names if name != FX_SYMBOL)
+
+
+def _utc_ns(index):
+    """DatetimeIndex -> UTC 기준 int64 ns (시간대 없는 인덱스는 UTC로 간주)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.values.astype("datetime64[ns]").view(np.int64)
+
+
+def fx_rates(index, interval, data_dir=None):
+    """봉마다 그 시점의 원/달러 환율 (직전 환율 봉으로 채움, 데이터가 없으면 고정 환율)"""
+    fx = load_bars(FX_SYMBOL, interval, data_dir)
+    if fx is None or fx.empty:
+        return np.full(len(index), float(KRW_USD_RATE))
+    fx_close = fx['Close'].to_numpy(dtype=np.float64)
+    pos = np.searchsorted(_utc_ns(fx.index), _utc_ns(index), side='right') - 1
+    return fx_close[np.maximum(pos, 0)]
+
+
+# ------------------ 전략 ------------------
+def ma_crossover_target(close, fast, slow):
+    """이동평균 교차 목표 포지션 (빠른 평균 > 느린 평균이면 1, 평균이 없는 구간은 0)"""
+    series = pd.Series(close)
+    fast_ma = series.rolling(fast).mean().to_numpy()
+    slow_ma = series.rolling(slow).mean().to_numpy()
+    return (fast_ma > slow_ma).astype(np.int8)   # NaN 비교는 False
+
+
+# ------------------ 실행 ------------------
+def run_symbol(symbol, interval="1d", data_dir=None, fast=FAST_WINDOW, slow=SLOW_WINDOW,
+               fraction=POSITION_FRACTION):
+    """종목 하나 백테스트 -> 결과 dict (프로세스 풀에서 실행되므로 데이터도 여기서 읽음)"""
+    bars = load_bars(symbol, interval, data_dir)
+    if bars is None or len(bars) < slow + 2:
+        return {'symbol': symbol, 'error': "not enough bars"}
+
+    opens = bars['Open'].to_numpy(dtype=np.float64)
+    close = bars['Close'].to_numpy(dtype=np.float64)
+    stamps = _utc_ns(bars.index)
+    fx = fx_rates(bars.index, interval, data_dir)
+    n = len(close)
+
+    # 봉 t 종가 신호 -> 봉 t+1 시가 체결
+    held = np.zeros(n, dtype=np.int8)
+    held[1:] = ma_crossover_target(close, fast, slow)[:-1]
+    changes = np.flatnonzero(np.diff(held, prepend=0))
+
+    balance = INITIAL_BALANCE
+    portfolio = Portfolio()
+    event_bars, event_cash, event_qty = [], [], []
+    round_trip_pnl = []
+    seq = 0
+    for i in changes:
+        price, rate = opens[i], fx[i]
+        if held[i]:
+            side = SIDE_BUY
+            quantity = int(balance * fraction // (price * rate))
+        else:
+            side = SIDE_SELL
+            quantity = int(portfolio.quantity_of(symbol))
+        if quantity <= 0:
+            continue
+
+        seq += 1
+        record = TradeRecord(seq, stamps[i] / 1e9, side, symbol, quantity, price,
+                             "USD", rate, price, int(price * quantity * rate))
+        realized_before = portfolio.realized_pnl
+        balance = apply_trade(record, balance, portfolio)
+        if side == SIDE_SELL:
+            round_trip_pnl.append(portfolio.realized_pnl - realized_before)
+
+        event_bars.append(i)
+        event_cash.append(balance)
+        event_qty.append(portfolio.quantity_of(symbol))
+
+    # 체결 시점 (잔액, 수량)을 봉 전체로 펼쳐 자산 곡선 계산
+    pos = np.searchsorted(np.asarray(event_bars, dtype=np.int64), np.arange(n), side='right') - 1
+    cash = np.where(pos >= 0, np.asarray(event_cash + [0.0])[pos], INITIAL_BALANCE)
+    qty = np.where(pos >= 0, np.asarray(event_qty + [0.0])[pos], 0.0)
+    equity = cash + qty * close * fx
+
+    return {
+        'symbol': symbol,
+        'stamps': stamps,
+        'equity': equity,
+        'trades': seq,
+        'pnl': np.asarray(round_trip_pnl),
+        'exposure': float(np.mean(qty > 0)),
+        'buy_hold': float(close[-1] * fx[-1] / (close[0] * fx[0]) - 1),
+    }
+
+
+def summarize(result):
+    """자산 곡선/체결 결과 -> 수익률, 최대 낙폭, 거래 통계"""
+    equity = result['equity']
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity / peak - 1
+    years = (result['stamps'][-1] - result['stamps'][0]) / (365.25 * 86400e9)
+    total = equity[-1] / INITIAL_BALANCE
+    pnl = result['pnl']
+    return {
+        'bars': len(equity),
+        'trades': result['trades'],
+        'round_trips': len(pnl),
+        'win_rate': float(np.mean(pnl > 0)) if len(pnl) else 0.0,
+        'avg_trade_usd': float(pnl.mean()) if len(pnl) else 0.0,
+        'total_return': total - 1,
+        'cagr': total ** (1 / years) - 1 if years > 0 and total > 0 else 0.0,
+        'max_drawdown': float(drawdown.min()),
+        'exposure': result['exposure'],
+        'buy_hold': result['buy_hold'],
+    }
+
+
+def run(symbols, interval="1d", data_dir=None, workers=None, **params):
+    """여러 종목 병렬 백테스트 -> 결과 dict 목록 (입력 순서)"""
+    job = functools.partial(run_symbol, interval=interval, data_dir=data_dir, **params)
+    if workers == 1 or len(symbols) <= 1:
+        return [job(symbol) for symbol in symbols]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(job, symbols))
+
+
+def save_equity(result, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    index = pd.to_datetime(result['stamps'], utc=True)
+    path = os.path.join(out_dir, f"{result['symbol']}.equity.csv")
+    pd.DataFrame({'equity': result['equity']}, index=index).to_csv(path, index_label="time")
+    return path
+
+
+def report(results, elapsed):
+    print(f"{'symbol':<10}{'bars':>7}{'trades':>7}{'win%':>7}{'return%':>9}"
+          f"{'B&H%':>9}{'CAGR%':>8}{'maxDD%':>8}{'expo%':>7}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['symbol']:<10}  {result['error']}")
+            continue
+        s = summarize(result)
+        print(f"{result['symbol']:<10}{s['bars']:7d}{s['trades']:7d}{s['win_rate'] * 100:7.1f}"
+              f"{s['total_return'] * 100:9.1f}{s['buy_hold'] * 100:9.1f}{s['cagr'] * 100:8.1f}"
+              f"{s['max_drawdown'] * 100:8.1f}{s['exposure'] * 100:7.1f}")
+    print(f"{len(results)} symbols in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="headless backtest over cached bars")
+    parser.add_argument("symbols", nargs="*", help="symbols (default: every cached/CSV symbol)")
+    parser.add_argument("--interval", default="1d",
+                        help=f"bar interval ({'/'.join(BASE_PERIODS)} in the cache, any with --data-dir)")
+    parser.add_argument("--data-dir", help="directory of SYMBOL.csv files instead of the bar cache")
+    parser.add_argument("--fast", type=int, default=FAST_WINDOW, help="fast moving average window")
+    parser.add_argument("--slow", type=int, default=SLOW_WINDOW, help="slow moving average window")
+    parser.add_argument("--fraction", type=float, default=POSITION_FRACTION,
+                        help="fraction of cash used per entry")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (1 = serial)")
+    parser.add_argument("--out", metavar="DIR", help="write per-symbol equity curves as CSV")
+    args = parser.parse_args()
+    if args.data_dir is None and args.interval not in BASE_PERIODS:
+        parser.error(f"the bar cache only holds {', '.join(BASE_PERIODS)} bars "
+                     f"(derived intervals like {args.interval} need --data-dir)")
+
+    symbols = args.symbols or available_symbols(args.interval, args.data_dir)
+    if not symbols:
+        parser.error("no symbols given and none found in the cache/data directory")
+
+    started = time.perf_counter()
+    results = run(symbols, args.interval, args.data_dir, args.workers,
+                  fast=args.fast, slow=args.slow, fraction=args.fraction)
+    report(results, time.perf_counter() - started)
+
+    if args.out:
+        for result in results:
+            if 'error' not in result:
+                save_equity(result, args.out)
+
+
+if __name__ == "__main__":
+    main()
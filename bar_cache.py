@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from contextlib import suppress
+
+import numpy as np
+import pandas as pd
+
+# 디스크 캐시 설정
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".sflick-hts", "bars")
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # 캐시 디렉터리 최대 크기 (256MB)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _safe_name(symbol, interval):
+    """파일명으로 쓸 수 있도록 심볼 정리 (^GSPC, KRW=X 등)"""
+    cleaned = "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol)
+    return f"{cleaned}__{interval}"
+
+
+class BarDiskCache:
+    """(심볼, 주기)별 OHLCV 컬럼형 디스크 캐시
+
+    종목마다 인덱스(int64 ns)와 OHLCV(float64, 컬럼 단위 연속 배치) 두 개의 .npy
+    파일과 메타데이터 JSON 한 개를 둡니다. 읽을 때는 mmap으로 열기 때문에 큰
+    일봉 데이터도 즉시 차트에 그릴 수 있습니다. 데이터 파일은 저장할 때마다 새
+    이름으로 쓰고 메타데이터만 교체하므로, mmap으로 열려 있는 이전 파일을 덮어쓰지
+    않습니다 (Windows에서 열린 파일 교체 실패 방지).
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _meta_path(self, symbol, interval):
+        return os.path.join(self.cache_dir, _safe_name(symbol, interval) + ".json")
+
+    def _read_meta(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def meta(self, symbol, interval):
+        """메타데이터 반환 (fetched_at, rows, tz 등, 없으면 None)"""
+        return self._read_meta(self._meta_path(symbol, interval))
+
+    def load(self, symbol, interval):
+        """캐시된 데이터를 mmap으로 읽어 (DataFrame, fetched_at) 반환, 없으면 (None, None)"""
+        meta_path = self._meta_path(symbol, interval)
+        meta = self._read_meta(meta_path)
+        if meta is None:
+            return None, None
+
+        try:
+            stamps = np.load(os.path.join(self.cache_dir, meta["index_file"]), mmap_mode='r')
+            columns = np.load(os.path.join(self.cache_dir, meta["data_file"]), mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+        index = pd.DatetimeIndex(pd.to_datetime(stamps, utc=meta.get("tz") is not None))
+        if meta.get("tz"):
+            index = index.tz_convert(meta["tz"])
+
+        data = pd.DataFrame(
+            {name: columns[i] for i, name in enumerate(OHLCV_COLUMNS)},
+            index=index, copy=False
+        )
+
+        # 최근 사용 시각 갱신 (LRU 제거 기준)
+        with suppress(OSError):
+            os.utime(meta_path)
+        return data, meta.get("fetched_at")
+
+    def save(self, symbol, interval, data, fetched_at=None):
+        """데이터 저장 후 용량 초과 시 오래 안 쓴 항목부터 제거"""
+        if data is None or data.empty:
+            return
+
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        base = _safe_name(symbol, interval)
+        stamp = time.time_ns()
+        index_file = f"{base}.{stamp}.idx.npy"
+        data_file = f"{base}.{stamp}.ohlcv.npy"
+
+        index = data.index
+        tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+        if tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        stamps = index.values.astype("datetime64[ns]").view(np.int64)
+        columns = np.ascontiguousarray(
+            data.reindex(columns=OHLCV_COLUMNS).to_numpy(dtype=np.float64).T
+        )
+
+        meta = {
+            "symbol": symbol,
+            "interval": interval,
+            "fetched_at": fetched_at,
+            "rows": int(len(data)),
+            "first": int(stamps[0]),
+            "last": int(stamps[-1]),
+            "tz": tz,
+            "index_file": index_file,
+            "data_file": data_file,
+        }
+
+        with self._lock:
+            np.save(os.path.join(self.cache_dir, index_file), stamps)
+            np.save(os.path.join(self.cache_dir, data_file), columns)
+
+            meta_path = self._meta_path(symbol, interval)
+            old_meta = self._read_meta(meta_path)
+            tmp_path = meta_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+
+            # 이전 세대 파일 정리 (mmap으로 열려 있으면 다음 정리 때 제거)
+            if old_meta:
+                for key in ("index_file", "data_file"):
+                    with suppress(OSError, KeyError):
+                        os.remove(os.path.join(self.cache_dir, old_meta[key]))
+
+            self._evict(keep=meta_path)
+
+    def _evict(self, keep=None):
+        """고아 파일 제거 및 용량 제한을 넘으면 LRU 순으로 항목 제거 (keep은 유지)"""
+        entries = []
+        referenced = set()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            meta = self._read_meta(path)
+            if meta is None:
+                continue
+            files = [meta.get("index_file"), meta.get("data_file")]
+            referenced.update(files)
+            try:
+                size = os.path.getsize(path) + sum(
+                    os.path.getsize(os.path.join(self.cache_dir, f)) for f in files
+                )
+                entries.append((os.path.getmtime(path), size, path, files))
+            except (OSError, TypeError):
+                continue
+
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npy") and name not in referenced:
+                with suppress(OSError):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, path, files in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            with suppress(OSError):
+                os.remove(path)
+            for f in files:
+                with suppress(OSError):
+                    os.remove(os.path.join(self.cache_dir, f))
+            total -= size
+
+    def total_bytes(self):
+        """캐시 디렉터리 전체 크기"""
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            with suppress(OSError):
+                total += os.path.getsize(os.path.join(self.cache_dir, name))
+        return total
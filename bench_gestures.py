@@ -0,0 +1,260 @@
+"""제스처 경로 벤치마크 (녹화 세션/동영상 리플레이, 웹캠 없이 실행 가능)
+
+프레임 소스(동영상 파일, .npz 녹화 세션, 카메라 번호)를 재생하면서 단계별 처리 시간
+(캡처, 추론, 분류, 미리보기)과 제스처 시작부터 주문 이벤트까지의 지연을 측정합니다.
+랜드마크가 녹화된 .npz는 MediaPipe 없이 분류/미리보기 단계만 측정합니다.
+
+    python bench_gestures.py session.npz          # 녹화 세션 재생
+    python bench_gestures.py video.mp4            # 동영상 (MediaPipe 추론 포함)
+    python bench_gestures.py --synthetic out.npz  # 합성 세션 생성 후 재생 (CI용)
+    python bench_gestures.py 0 --record out.npz --seconds 20 [--keep-frames]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from gestures import (
+    GestureStateMachine, hand_features, landmarks_to_array, NO_HANDS,
+    EVENT_HOLD_PROGRESS, EVENT_BUY, EVENT_SELL, EVENT_PRICE_UP, EVENT_PRICE_DOWN,
+    EVENT_RESET_TO_MARKET, PRICE_UP, PRICE_DOWN
+)
+from replay import open_source, draw_recorded_hands, SessionRecorder, REPLAY_DEFAULT_FPS
+from vision import make_preview
+
+# app.py와 같은 값
+CAM_W, CAM_H = 360, 220
+FINGER_FOLD_THRESHOLD = 0.05
+FIST_HOLD_DURATION = 1.5
+OPEN_HAND_COOLDOWN = 0.5
+MAX_NUM_HANDS = 2
+MIN_DETECTION_CONFIDENCE = 0.7
+
+STAGES = ("capture", "inference", "classification", "preview", "total")
+
+# 이벤트 -> 그 이벤트를 만드는 자세 (지연 측정 기준)
+EVENT_POSES = {
+    EVENT_BUY: "fist", EVENT_SELL: "fist",
+    EVENT_PRICE_UP: "up", EVENT_PRICE_DOWN: "down",
+    EVENT_RESET_TO_MARKET: "open",
+}
+
+
+# ------------------ 합성 세션 ------------------
+def _hand_pose(pose, rng):
+    """threshold=0.05 기준으로 분류되는 (21, 3) 합성 랜드마크"""
+    pts = np.zeros((21, 3), dtype=np.float32)
+    pts[:, 0] = np.linspace(0.42, 0.62, 21)
+    pts[0] = (0.50, 0.80, 0.0)                    # 손목
+    pts[2, 0], pts[4, 0] = 0.42, 0.45             # 엄지 MCP/끝 (펼침)
+    pts[5, 0] = 0.55                              # 검지 MCP (오른쪽 방향)
+    pts[[5, 9, 13, 17], 1] = 0.60                 # MCP
+    pts[[6, 10, 14, 18], 1] = 0.50                # PIP
+    tips = {
+        "fist": (0.60, 0.60, 0.60, 0.60),
+        "open": (0.35, 0.35, 0.35, 0.35),
+        "up": (0.35, 0.45, 0.60, 0.60),
+        "down": (0.45, 0.35, 0.60, 0.60),
+        "none": (0.45, 0.45, 0.60, 0.60),
+    }[pose]
+    pts[[8, 12, 16, 20], 1] = tips
+    pts[[7, 11, 15, 19], 1] = (pts[[6, 10, 14, 18], 1] + pts[[8, 12, 16, 20], 1]) / 2
+    pts[:, :2] += rng.normal(0, 0.003, (21, 2))
+    return pts
+
+
+def synthetic_session(path, fps=REPLAY_DEFAULT_FPS, seed=0):
+    """대표 제스처 시나리오를 랜드마크만 있는 세션으로 저장"""
+    script = [
+        (None, "none", 1.0),
+        ("Left", "none", 0.5), ("Left", "fist", 2.0), ("Left", "none", 0.5),
+        ("Right", "up", 1.0), ("Right", "none", 0.5),
+        ("Right", "down", 0.6), ("Right", "none", 0.5),
+        ("Right", "open", 0.5), ("Right", "none", 0.5),
+        ("Right", "fist", 2.0), (None, "none", 1.0),
+    ]
+    rng = np.random.default_rng(seed)
+    recorder = SessionRecorder()
+    t = 0.0
+    for label, pose, seconds in script:
+        for _ in range(int(round(seconds * fps))):
+            if label is None:
+                recorder.add(t, NO_HANDS, [])
+            else:
+                recorder.add(t, _hand_pose(pose, rng)[None], [label])
+            t += 1.0 / fps
+    recorder.save(path)
+    return path
+
+
+# ------------------ 녹화 ------------------
+def record(source, path, seconds, keep_frames):
+    """카메라/동영상에서 MediaPipe 결과를 녹화해 .npz 세션으로 저장"""
+    import mediapipe as mp
+
+    cap = open_source(source, realtime=False)
+    hands = mp.solutions.hands.Hands(max_num_hands=MAX_NUM_HANDS,
+                                     min_detection_confidence=MIN_DETECTION_CONFIDENCE)
+    recorder = SessionRecorder(keep_frames=keep_frames)
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = cv2.flip(frame, 1)
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        points, labels = _hands(results)
+        recorder.add(time.perf_counter() - start, points, labels, frame)
+    hands.close()
+    cap.release()
+    recorder.save(path)
+    print(f"recorded {len(recorder)} frames -> {path}")
+
+
+def _hands(results):
+    if not results.multi_hand_landmarks:
+        return NO_HANDS, []
+    return (landmarks_to_array(results.multi_hand_landmarks),
+            [h.classification[0].label for h in results.multi_handedness])
+
+
+# ------------------ 벤치마크 ------------------
+def _raw_poses(points, threshold):
+    """프레임에 보이는 자세 집합 (디바운스 전)"""
+    if len(points) == 0:
+        return set()
+    f = hand_features(points, threshold)
+    poses = set()
+    for i in range(len(points)):
+        if f.fist[i]:
+            poses.add("fist")
+        elif f.open_hand[i]:
+            poses.add("open")
+        elif f.price[i] == PRICE_UP:
+            poses.add("up")
+        elif f.price[i] == PRICE_DOWN:
+            poses.add("down")
+    return poses
+
+
+def run(source, max_frames=None):
+    cap = open_source(source, realtime=False)
+    recorded = getattr(cap, 'recorded', False)
+    hands = None
+    if not recorded:
+        import mediapipe as mp
+        hands = mp.solutions.hands.Hands(max_num_hands=MAX_NUM_HANDS,
+                                         min_detection_confidence=MIN_DETECTION_CONFIDENCE)
+        mp_drawing = mp.solutions.drawing_utils
+        connections = mp.solutions.hands.HAND_CONNECTIONS
+
+    fsm = GestureStateMachine(FINGER_FOLD_THRESHOLD, FIST_HOLD_DURATION, OPEN_HAND_COOLDOWN)
+    preview = np.empty((CAM_H, CAM_W, 3), dtype=np.uint8)
+    timings = {stage: [] for stage in STAGES}
+    onsets = {}                      # 자세 -> 처음 보인 시각 (녹화 타임라인, 측정 후 None)
+    latencies = {}                   # 이벤트 -> [(타임라인 지연, 처리 지연)]
+    event_counts = {}
+    frames = 0
+    wall_start = time.perf_counter()
+
+    while max_frames is None or frames < max_frames:
+        t0 = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if not recorded:
+            frame = cv2.flip(frame, 1)
+        t1 = time.perf_counter()
+
+        if recorded:
+            results = cap.results
+        else:
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        t2 = time.perf_counter()
+
+        now = getattr(cap, 'timestamp', t1 - wall_start)
+        points, labels = _hands(results)
+        events = fsm.update(now, points, labels)
+        t3 = time.perf_counter()
+
+        make_preview(frame, preview)
+        cv2.cvtColor(preview, cv2.COLOR_BGR2RGB, dst=preview)
+        if recorded:
+            draw_recorded_hands(preview, results)
+        elif results.multi_hand_landmarks:
+            for hand in results.multi_hand_landmarks:
+                mp_drawing.draw_landmarks(preview, hand, connections)
+        t4 = time.perf_counter()
+
+        for stage, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0)):
+            timings[stage].append(dt)
+
+        # 지연: 자세가 처음 보인 프레임 -> 이벤트가 나온 프레임 (+ 이 프레임의 처리 시간)
+        visible = _raw_poses(points, FINGER_FOLD_THRESHOLD)
+        for pose in list(onsets):
+            if pose not in visible:
+                del onsets[pose]
+        for pose in visible:
+            onsets.setdefault(pose, now)
+        for event in events:
+            if event.kind == EVENT_HOLD_PROGRESS:
+                continue
+            event_counts[event.kind] = event_counts.get(event.kind, 0) + 1
+            pose = EVENT_POSES.get(event.kind)
+            if onsets.get(pose) is not None:
+                latencies.setdefault(event.kind, []).append((now - onsets[pose], t3 - t0))
+                onsets[pose] = None   # 자세가 사라질 때까지 반복 이벤트는 제외
+        frames += 1
+
+    cap.release()
+    if hands is not None:
+        hands.close()
+    return frames, timings, latencies, event_counts
+
+
+def report(source, frames, timings, latencies, event_counts):
+    print(f"{source}: {frames} frames, preview {CAM_W}x{CAM_H}")
+    if not frames:
+        return
+    print(f"  {'stage':<16}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for stage in STAGES:
+        ms = np.asarray(timings[stage]) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        print(f"  {stage:<16}{ms.mean():9.3f}{p50:9.3f}{p95:9.3f}{p99:9.3f}")
+    print(f"  max throughput  {1.0 / np.mean(timings['total']):9.1f} fps")
+
+    print("  gesture -> order event (first event after gesture onset)")
+    print(f"  {'event':<16}{'count':>7}{'timeline ms':>14}{'processing ms':>16}")
+    for kind in (EVENT_BUY, EVENT_SELL, EVENT_PRICE_UP, EVENT_PRICE_DOWN, EVENT_RESET_TO_MARKET):
+        samples = latencies.get(kind)
+        if not samples:
+            continue
+        timeline, processing = np.asarray(samples).T * 1000
+        print(f"  {kind:<16}{event_counts[kind]:7d}{timeline.mean():14.1f}{processing.mean():16.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gesture pipeline replay benchmark")
+    parser.add_argument("source", nargs="?", help="video file, .npz session or camera index")
+    parser.add_argument("--frames", type=int, default=None, help="stop after N frames")
+    parser.add_argument("--synthetic", metavar="NPZ", help="write a synthetic session and replay it")
+    parser.add_argument("--record", metavar="NPZ", help="record landmarks from source instead of benchmarking")
+    parser.add_argument("--seconds", type=float, default=20.0, help="recording length")
+    parser.add_argument("--keep-frames", action="store_true", help="store frames in the recording")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        args.source = synthetic_session(args.synthetic)
+    if args.source is None:
+        parser.error("source or --synthetic is required")
+
+    if args.record:
+        record(args.source, args.record, args.seconds, args.keep_frames)
+        return
+
+    report(args.source, *run(args.source, args.frames))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""카메라 미리보기 경로 벤치마크 (웹캠 없이 합성 프레임 사용)
+
+기존 경로(전체 해상도 RGB 변환 + PIL LANCZOS 축소 + 매 프레임 새 이미지)와
+비전 스레드의 빠른 경로(미리 할당된 버퍼로 선형 보간 축소)를 비교합니다.
+
+    python bench_preview.py [프레임 수] [캡처 폭] [캡처 높이]
+"""
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from vision import make_preview
+
+CAM_W, CAM_H = 360, 220
+
+
+def bench(fn, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cap_w = int(sys.argv[2]) if len(sys.argv) > 2 else 1280
+    cap_h = int(sys.argv[3]) if len(sys.argv) > 3 else 720
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (cap_h, cap_w, 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(count)]
+
+    # 기존 경로: flip + 전체 RGB 변환 + PIL LANCZOS 축소
+    def legacy(frame):
+        rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        return Image.fromarray(rgb).resize((CAM_W, CAM_H), Image.Resampling.LANCZOS)
+
+    # 빠른 경로: 재사용 버퍼로 flip/변환 (추론용) + 선형 보간 축소
+    flip_buf = np.empty_like(frames[0])
+    rgb_buf = np.empty_like(frames[0])
+    preview = np.empty((CAM_H, CAM_W, 3), dtype=np.uint8)
+
+    def fast(frame):
+        cv2.flip(frame, 1, dst=flip_buf)
+        cv2.cvtColor(flip_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+        return make_preview(rgb_buf, preview)
+
+    # 미리보기만 비교 (추론용 RGB 변환은 어느 쪽이든 필요하므로 제외)
+    rgb_frames = [cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for f in frames[:8]]
+    rgb_frames = [rgb_frames[i % len(rgb_frames)] for i in range(count)]
+
+    def legacy_preview(rgb):
+        return Image.fromarray(rgb).resize((CAM_W, CAM_H), Image.Resampling.LANCZOS)
+
+    def fast_preview(rgb):
+        return make_preview(rgb, preview)
+
+    results = [
+        ("full path (legacy)", bench(legacy, frames)),
+        ("full path (fast)", bench(fast, frames)),
+        ("preview only (legacy)", bench(legacy_preview, rgb_frames)),
+        ("preview only (fast)", bench(fast_preview, rgb_frames)),
+    ]
+
+    print(f"{count} frames, capture {cap_w}x{cap_h} -> preview {CAM_W}x{CAM_H}")
+    for name, ms in results:
+        print(f"  {name:<24} {ms:7.3f} ms/frame")
+    print(f"  speedup (full)           {results[0][1] / results[1][1]:7.1f}x")
+    print(f"  speedup (preview)        {results[2][1] / results[3][1]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# 데시메이션 설정
+CANDLE_MIN_PX = 3        # 캔들 하나에 필요한 최소 픽셀 폭
+LINE_POINTS_PER_PX = 1   # 선 차트 픽셀당 유지할 버킷 수 (버킷마다 최소/최대 2점)
+DECIMATION_CACHE_SIZE = 32
+
+
+def bucket_edges(n, buckets):
+    """n개 데이터를 buckets개 구간으로 나누는 경계 인덱스 (길이 buckets + 1)"""
+    return np.linspace(0, n, buckets + 1).astype(np.int64)
+
+
+def aggregate_ohlc(opens, highs, lows, closes, buckets):
+    """구간별 OHLC 집계 (시가=첫 값, 고가=최대, 저가=최소, 종가=마지막 값)
+
+    반환: (x, width, opens, highs, lows, closes) - x는 원래 인덱스 기준 구간 중앙
+    """
+    edges = bucket_edges(len(closes), buckets)
+    starts, ends = edges[:-1], edges[1:]
+
+    x = (starts + ends - 1) / 2.0
+    width = (ends - starts).astype(float)
+    return (
+        x, width,
+        opens[starts],
+        np.maximum.reduceat(highs, starts),
+        np.minimum.reduceat(lows, starts),
+        closes[ends - 1],
+    )
+
+
+def minmax_indices(y, buckets):
+    """구간별 최소/최대 지점 인덱스 (시간순 정렬, 처음/끝 점 포함)"""
+    n = len(y)
+    edges = bucket_edges(n, buckets)
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+
+    # 구간 번호 -> 값 순으로 정렬하면 각 구간의 첫 원소가 최소, 마지막 원소가 최대
+    order = np.lexsort((y, bucket_ids))
+    picks = np.concatenate(([0], order[edges[:-1]], order[edges[1:] - 1], [n - 1]))
+    return np.unique(picks)
+
+
+class DecimationCache:
+    """(데이터, 오프셋, 윈도우, 폭, 차트 타입)별 데시메이션 결과 캐시"""
+    def __init__(self, size=DECIMATION_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def get(self, key, compute):
+        """캐시에 있으면 반환, 없으면 compute()로 계산 후 저장"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+def minmax_envelope(y, buckets):
+    """구간별 최소/최대 값 봉투 (x, y) - 구간마다 2점, O(n)
+
+    minmax_indices와 달리 정렬 없이 reduceat만 쓰므로 실시간 차트처럼 매 프레임
+    수십만 점을 줄여야 할 때 씁니다 (구간 안의 최소/최대 순서는 보존하지 않음).
+    """
+    n = len(y)
+    if n <= buckets * 2:
+        return np.arange(n, dtype=np.float64), y
+    starts = bucket_edges(n, buckets)[:-1]
+    x = np.repeat(starts.astype(np.float64), 2)
+    x[1::2] = np.append(starts[1:], n) - 1
+    out = np.empty(buckets * 2)
+    out[0::2] = np.minimum.reduceat(y, starts)
+    out[1::2] = np.maximum.reduceat(y, starts)
+    return x, out
+
+
+class PriceRing:
+    """고정 크기 float64 링 버퍼 (가장 오래된 값부터 연속 배열로 조회)
+
+    같은 값을 [i]와 [i + capacity] 두 곳에 써 두므로 values()는 복사 없이 연속된
+    슬라이스 뷰를 돌려줍니다. append/extend는 원소당 O(1)이고 메모리는 2 * capacity입니다.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = np.empty(capacity * 2)
+        self._head = 0       # 다음에 쓸 위치 (0 <= head < capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        self._buf[self._head] = self._buf[self._head + self.capacity] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        n = len(values)
+        if n == 0:
+            return
+        idx = (self._head + np.arange(n)) % self.capacity
+        self._buf[idx] = values
+        self._buf[idx + self.capacity] = values
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def values(self):
+        """오래된 값 -> 최신 값 순서의 읽기 전용 뷰 (다음 쓰기 전까지만 유효)"""
+        start = self._head - self._size + self.capacity
+        view = self._buf[start:start + self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def last(self):
+        return self._buf[self._head - 1 + self.capacity]
@@ -0,0 +1,239 @@
+from collections import namedtuple
+
+import numpy as np
+
+# MediaPipe 손 랜드마크 인덱스
+WRIST = 0
+THUMB_MCP = 2
+THUMB_TIP = 4
+INDEX_MCP = 5
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+FINGER_TIPS = np.array([8, 12, 16, 20])   # 검지, 중지, 약지, 소지 끝
+FINGER_PIPS = FINGER_TIPS - 2             # 각 손가락의 PIP 관절
+
+# 가격 조정 제스처 (검지/중지 높이 비교)
+PRICE_UP = 1
+PRICE_DOWN = -1
+PRICE_NONE = 0
+
+# 손 여러 개의 특징을 한 번에 담는 배열 묶음 (각 필드 길이 = 손 개수)
+HandFeatures = namedtuple('HandFeatures', [
+    'folded',        # (N, 4) 손가락별 접힘 여부
+    'extended',      # (N, 4) 손가락별 펼침 여부
+    'is_right',      # (N,) 검지 MCP가 손목보다 오른쪽 (화면 기준 오른손 방향)
+    'thumb_open',    # (N,) 엄지 펼침 여부
+    'index_minus_middle',  # (N,) 검지 끝 y - 중지 끝 y
+    'fist',          # (N,) 주먹
+    'open_hand',     # (N,) 완전히 펼친 손
+    'price',         # (N,) PRICE_UP / PRICE_DOWN / PRICE_NONE
+])
+
+# 손이 검출되지 않은 프레임용 빈 랜드마크 배열
+NO_HANDS = np.empty((0, 21, 3), dtype=np.float32)
+
+
+def landmarks_to_array(hand_landmarks_list):
+    """MediaPipe 랜드마크 목록을 (손 개수, 21, 3) 배열로 한 번에 변환"""
+    return np.array(
+        [[(p.x, p.y, p.z) for p in hand.landmark] for hand in hand_landmarks_list],
+        dtype=np.float32
+    ).reshape(-1, 21, 3)
+
+
+def hand_features(points, threshold):
+    """(N, 21, 3) 랜드마크 배열에서 모든 분류기가 쓰는 특징을 한 번에 계산"""
+    x = points[:, :, 0]
+    y = points[:, :, 1]
+
+    tip_y = y[:, FINGER_TIPS]
+    pip_y = y[:, FINGER_PIPS]
+    folded = tip_y > pip_y + threshold
+    extended = tip_y < pip_y - threshold
+
+    # 엄지는 좌우 방향으로 접히므로 손 방향에 따라 판단
+    is_right = x[:, INDEX_MCP] > x[:, WRIST]
+    thumb_dx = x[:, THUMB_TIP] - x[:, THUMB_MCP]
+    thumb_open = np.where(is_right, thumb_dx > -threshold, thumb_dx < threshold)
+
+    index_minus_middle = y[:, INDEX_TIP] - y[:, MIDDLE_TIP]
+    price = np.where(index_minus_middle < -threshold, PRICE_UP,
+                     np.where(index_minus_middle > threshold, PRICE_DOWN, PRICE_NONE))
+
+    return HandFeatures(
+        folded=folded,
+        extended=extended,
+        is_right=is_right,
+        thumb_open=thumb_open,
+        index_minus_middle=index_minus_middle,
+        fist=folded.sum(axis=1) >= 4,
+        open_hand=(extended.sum(axis=1) >= 4) & thumb_open,
+        price=price,
+    )
+
+
+# ------------------ 제스처 이벤트 상태 기계 ------------------
+# 손 자세 (프레임 단위 판별 결과)
+POSE_NONE = "none"
+POSE_FIST = "fist"
+POSE_OPEN = "open"
+POSE_UP = "up"
+POSE_DOWN = "down"
+
+# UI로 보내는 이벤트 종류
+EVENT_PRICE_UP = "PriceUp"
+EVENT_PRICE_DOWN = "PriceDown"
+EVENT_RESET_TO_MARKET = "ResetToMarket"
+EVENT_HOLD_PROGRESS = "HoldProgress"
+EVENT_BUY = "Buy"
+EVENT_SELL = "Sell"
+
+# 상태 기계 기본값
+GESTURE_CONFIRM_FRAMES = 2     # 새 자세로 인정하기까지 연속 프레임 수
+GESTURE_RELEASE_FRAMES = 3     # 자세가 풀렸다고 보기까지 연속 프레임 수
+PRICE_EXIT_RATIO = 0.5         # 가격 제스처 유지 임계값 (진입 임계값 대비 비율)
+PRICE_REPEAT_DELAY = 0.4       # 가격 제스처 유지 시 자동 반복 시작까지 (초)
+PRICE_REPEAT_INTERVAL = 0.1    # 자동 반복 간격 (초)
+PROGRESS_STEP = 0.02           # 진행도 이벤트 최소 변화량
+
+# 주먹 쥔 손 -> 거래 방향 (왼손 = 매수, 오른손 = 매도)
+FIST_SIDES = {"Left": "BUY", "Right": "SELL"}
+
+# side는 "BUY"/"SELL" (HoldProgress/Buy/Sell), value는 진행도(0~1)
+GestureEvent = namedtuple('GestureEvent', 'kind side value')
+
+
+class _HandState:
+    """손(Left/Right)별 디바운스 상태"""
+    def __init__(self):
+        self.pose = POSE_NONE       # 확정된 자세
+        self.candidate = POSE_NONE  # 확정 대기 중인 자세
+        self.count = 0              # candidate 연속 프레임 수
+        self.fist_start = None
+        self.progress = 0.0
+        self.next_repeat = None
+
+
+class GestureStateMachine:
+    """랜드마크 시퀀스를 디바운스된 제스처 이벤트로 변환 (Tk 의존 없음)
+
+    update()에 매 프레임 (시각, (N, 21, 3) 랜드마크 배열, 손 라벨 목록)을 넣으면
+    상태가 바뀐 경우에만 GestureEvent 목록을 돌려줍니다. 새 자세는 confirm_frames
+    프레임 연속으로 보여야 인정되고, release_frames 프레임 연속으로 사라져야 풀립니다.
+    가격 제스처는 진입/유지 임계값이 다른 히스테리시스를 쓰고, 유지하는 동안
+    repeat_delay 뒤부터 repeat_interval 간격으로만 반복 이벤트를 냅니다.
+    """
+    def __init__(self, threshold, hold_duration, open_cooldown,
+                 confirm_frames=GESTURE_CONFIRM_FRAMES, release_frames=GESTURE_RELEASE_FRAMES,
+                 repeat_delay=PRICE_REPEAT_DELAY, repeat_interval=PRICE_REPEAT_INTERVAL,
+                 progress_step=PROGRESS_STEP):
+        self.threshold = threshold
+        self.hold_duration = hold_duration
+        self.open_cooldown = open_cooldown
+        self.confirm_frames = confirm_frames
+        self.release_frames = release_frames
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.progress_step = progress_step
+
+        self.hands = {"Left": _HandState(), "Right": _HandState()}
+        self.last_reset_time = float('-inf')
+
+    def _raw_pose(self, state, features, i):
+        """이번 프레임의 자세 판별 (가격 제스처는 현재 자세에 따라 임계값 완화)"""
+        if features.fist[i]:
+            return POSE_FIST
+        if features.open_hand[i]:
+            return POSE_OPEN
+
+        delta = features.index_minus_middle[i]
+        exit_threshold = self.threshold * PRICE_EXIT_RATIO
+        if state.pose == POSE_UP and delta < -exit_threshold:
+            return POSE_UP
+        if state.pose == POSE_DOWN and delta > exit_threshold:
+            return POSE_DOWN
+        if features.price[i] == PRICE_UP:
+            return POSE_UP
+        if features.price[i] == PRICE_DOWN:
+            return POSE_DOWN
+        return POSE_NONE
+
+    def _debounce(self, state, raw):
+        """디바운스 후 확정 자세가 바뀌었으면 True"""
+        if raw == state.pose:
+            state.candidate, state.count = raw, 0
+            return False
+
+        if raw != state.candidate:
+            state.candidate, state.count = raw, 0
+        state.count += 1
+
+        needed = self.release_frames if raw == POSE_NONE else self.confirm_frames
+        if state.pose != POSE_NONE and raw != POSE_NONE:
+            # 자세끼리 바로 바뀔 때는 둘 중 더 엄격한 조건 적용
+            needed = max(self.confirm_frames, self.release_frames)
+        if state.count < needed:
+            return False
+
+        state.pose, state.candidate, state.count = raw, raw, 0
+        return True
+
+    def _set_progress(self, events, side, state, progress):
+        """진행도가 progress_step 이상 바뀌었거나 0/1이 될 때만 이벤트"""
+        rounded = round(progress / self.progress_step) * self.progress_step
+        if progress <= 0.0:
+            rounded = 0.0
+        if rounded != state.progress:
+            state.progress = rounded
+            events.append(GestureEvent(EVENT_HOLD_PROGRESS, side, rounded))
+
+    def update(self, now, points, labels):
+        """한 프레임 처리 -> 이벤트 목록"""
+        events = []
+        raw_poses = {}
+
+        if len(labels):
+            features = hand_features(points, self.threshold)
+            for i, label in enumerate(labels):
+                state = self.hands.get(label)
+                if state is not None:
+                    raw_poses[label] = self._raw_pose(state, features, i)
+
+        for label, state in self.hands.items():
+            changed = self._debounce(state, raw_poses.get(label, POSE_NONE))
+            side = FIST_SIDES[label]
+
+            # 주먹 유지 -> 진행도 -> 거래
+            if state.pose == POSE_FIST:
+                if state.fist_start is None:
+                    state.fist_start = now
+                elapsed = now - state.fist_start
+                if elapsed >= self.hold_duration:
+                    events.append(GestureEvent(EVENT_BUY if side == "BUY" else EVENT_SELL, side, 1.0))
+                    state.fist_start = None
+                    self._set_progress(events, side, state, 0.0)
+                else:
+                    self._set_progress(events, side, state, min(1.0, elapsed / self.hold_duration))
+            else:
+                state.fist_start = None
+                self._set_progress(events, side, state, 0.0)
+
+            # 펼친 손 -> 현재가로 리셋 (자세에 들어갈 때 한 번, 쿨다운 적용)
+            if changed and state.pose == POSE_OPEN:
+                if now - self.last_reset_time > self.open_cooldown:
+                    events.append(GestureEvent(EVENT_RESET_TO_MARKET, None, None))
+                    self.last_reset_time = now
+
+            # 검지/중지 -> 가격 조정 (진입 시 1회 + 자동 반복)
+            if state.pose in (POSE_UP, POSE_DOWN):
+                kind = EVENT_PRICE_UP if state.pose == POSE_UP else EVENT_PRICE_DOWN
+                if changed:
+                    events.append(GestureEvent(kind, None, None))
+                    state.next_repeat = now + self.repeat_delay
+                elif state.next_repeat is not None and now >= state.next_repeat:
+                    events.append(GestureEvent(kind, None, None))
+                    state.next_repeat = max(state.next_repeat + self.repeat_interval, now)
+            else:
+                state.next_repeat = None
+
+        return events
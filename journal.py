@@ -0,0 +1,234 @@
+import glob
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import suppress
+
+# 거래 장부 설정
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".sflick-hts", "ledger")
+JOURNAL_SYNC_INTERVAL = 0.5      # fsync 묶음 간격 (초) - 이보다 오래된 기록은 디스크에 있음
+JOURNAL_SYNC_RECORDS = 256       # 이만큼 쌓이면 간격과 무관하게 바로 fsync
+SNAPSHOT_INTERVAL = 10000        # 스냅샷 사이 최대 거래 수 (복구 시 다시 적용하는 최대 기록 수)
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PATTERN = "trades-*.jsonl"
+
+SIDE_BUY = "BUY"
+SIDE_SELL = "SELL"
+
+# 체결 기록 한 건 (price는 주문 화폐 기준, usd_price는 장부 기준, cost는 원화 결제 금액)
+TradeRecord = namedtuple('TradeRecord', [
+    'seq', 'time', 'side', 'symbol', 'quantity',
+    'price', 'currency', 'fx_rate', 'usd_price', 'cost',
+])
+
+
+def apply_trade(record, balance, portfolio):
+    """체결 기록을 (원화 잔액, 장부)에 반영하고 새 잔액 반환
+
+    거래 실행과 복구가 같은 함수를 거치므로 다시 적용한 결과가 실행 당시와 같습니다.
+    """
+    if record.side == SIDE_BUY:
+        portfolio.buy(record.symbol, record.quantity, record.usd_price)
+        return balance - record.cost
+    portfolio.sell(record.symbol, record.quantity, record.usd_price)
+    return balance + record.cost
+
+
+def _segment_name(first_seq):
+    return f"trades-{first_seq:012d}.jsonl"
+
+
+class TradeJournal:
+    """추가 전용 거래 장부 (JSON Lines 세그먼트 + 주기적 스냅샷)
+
+    체결마다 한 줄을 현재 세그먼트 끝에 쓰고, fsync는 JOURNAL_SYNC_INTERVAL마다 또는
+    JOURNAL_SYNC_RECORDS건마다 한 번씩 묶어서 합니다 (그룹 커밋). 비정상 종료 시 잃을 수
+    있는 것은 마지막 묶음뿐이고, 중간에 잘린 마지막 줄은 복구할 때 잘라냅니다.
+
+    SNAPSHOT_INTERVAL건마다 호출 측 상태(잔액, 장부)를 snapshot.json에 원자적으로 쓰고
+    새 세그먼트로 넘어갑니다. 복구는 스냅샷을 읽고 그 뒤 세그먼트 하나만 다시 적용하므로
+    누적 체결이 수백만 건이어도 복구 시간은 SNAPSHOT_INTERVAL건 처리 시간을 넘지 않습니다.
+    이전 세그먼트는 거래 내역으로 남겨 둡니다.
+    """
+    def __init__(self, directory=JOURNAL_DIR, sync_interval=JOURNAL_SYNC_INTERVAL,
+                 sync_records=JOURNAL_SYNC_RECORDS, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.sync_records = sync_records
+        self.snapshot_interval = snapshot_interval
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment = None
+        self._pending = 0                # fsync 안 된 기록 수
+        self.next_seq = 1
+        self.since_snapshot = 0          # 마지막 스냅샷 이후 기록 수
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._syncer = None
+
+    # ------------------ 복구 ------------------
+    def recover(self):
+        """(스냅샷 상태 dict 또는 None, 스냅샷 이후 TradeRecord 목록) 반환 후 기록 준비
+
+        스냅샷이 없거나 깨졌으면 모든 세그먼트를 처음부터 다시 읽습니다.
+        """
+        snapshot = self._read_snapshot()
+        segments = sorted(glob.glob(os.path.join(self.directory, SEGMENT_PATTERN)))
+        if snapshot is not None:
+            first = os.path.join(self.directory, snapshot["segment"])
+            segments = [path for path in segments if path >= first]
+            self.next_seq = snapshot["seq"] + 1
+
+        records = []
+        for path in segments:
+            records.extend(self._read_segment(path))
+        if records:
+            self.next_seq = records[-1].seq + 1
+        self.since_snapshot = len(records)
+
+        # 마지막 세그먼트에 이어 쓰기 (없으면 새로 만듦)
+        if segments:
+            self._segment = os.path.basename(segments[-1])
+        elif snapshot is not None:
+            self._segment = snapshot["segment"]
+        else:
+            self._segment = _segment_name(self.next_seq)
+        self._open_segment()
+        self._start_syncer()
+        return (snapshot["state"] if snapshot is not None else None), records
+
+    def _read_snapshot(self):
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_FILE), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            return snapshot if {"seq", "segment", "state"} <= snapshot.keys() else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _read_segment(self, path):
+        """세그먼트의 기록 목록
+
+        잘리거나 깨진 줄이 파일의 마지막 줄이면 쓰다 만 기록이므로 파일에서 잘라내고,
+        중간 줄이 깨졌으면 거래 내역을 지우지 않도록 파일은 그대로 두고 건너뜁니다.
+        """
+        records = []
+        good_bytes = 0
+        torn = False
+        with open(path, "rb") as f:
+            lines = f.readlines()
+        for lineno, line in enumerate(lines, 1):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated line")
+                record = TradeRecord(**json.loads(line))
+            except (ValueError, TypeError) as e:
+                if lineno == len(lines):
+                    torn = True
+                    break
+                print(f"Trade journal: skipping corrupt record {os.path.basename(path)}:{lineno} ({e})")
+            else:
+                records.append(record)
+            good_bytes += len(line)
+        if torn:
+            with open(path, "r+b") as f:
+                f.truncate(good_bytes)
+        return records
+
+    # ------------------ 기록 ------------------
+    def _open_segment(self):
+        # 줄 단위 쓰기는 OS 버퍼까지 바로 내려가고, 디스크 반영은 fsync 묶음으로 처리
+        self._file = open(os.path.join(self.directory, self._segment), "a",
+                          encoding="utf-8", buffering=1)
+
+    def append(self, side, symbol, quantity, price, currency, fx_rate, usd_price, cost,
+               timestamp=None):
+        """체결 한 건 기록 -> TradeRecord"""
+        with self._lock:
+            record = TradeRecord(
+                seq=self.next_seq,
+                time=time.time() if timestamp is None else timestamp,
+                side=side, symbol=symbol, quantity=quantity,
+                price=price, currency=currency, fx_rate=fx_rate,
+                usd_price=usd_price, cost=cost,
+            )
+            self._file.write(json.dumps(record._asdict(), separators=(",", ":")) + "\n")
+            self.next_seq += 1
+            self.since_snapshot += 1
+            self._pending += 1
+            if self._pending >= self.sync_records:
+                self._sync_locked()
+        self._wake.set()
+        return record
+
+    @property
+    def needs_snapshot(self):
+        return self.since_snapshot >= self.snapshot_interval
+
+    def snapshot(self, state):
+        """호출 측 상태를 스냅샷으로 저장하고 새 세그먼트로 전환
+
+        state는 지금까지 기록한 모든 체결이 반영된 JSON 직렬화 가능한 dict여야 합니다.
+        """
+        with self._lock:
+            self._sync_locked()
+            self._file.close()
+            self._segment = _segment_name(self.next_seq)
+            snapshot = {"seq": self.next_seq - 1, "segment": self._segment,
+                        "time": time.time(), "state": state}
+
+            path = os.path.join(self.directory, SNAPSHOT_FILE)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            self._open_segment()
+            self.since_snapshot = 0
+
+    # ------------------ fsync ------------------
+    def _sync_locked(self):
+        if self._pending and self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _start_syncer(self):
+        self._syncer = threading.Thread(target=self._sync_loop, name="journal-sync", daemon=True)
+        self._syncer.start()
+
+    def _sync_loop(self):
+        """기록이 생기면 sync_interval 뒤 한 번에 fsync (그 사이 기록은 같은 묶음)"""
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.wait(self.sync_interval):
+                break
+            with suppress(OSError, ValueError):
+                self.sync()
+
+    def close(self, state=None):
+        """남은 기록 fsync (state가 있으면 스냅샷도 저장해 다음 시작 시 다시 적용할 것이 없게 함)"""
+        self._stop.set()
+        self._wake.set()
+        if self._syncer is not None:
+            self._syncer.join(timeout=1.0)
+        if self._file is None:
+            return
+        if state is not None and self.since_snapshot:
+            self.snapshot(state)
+        with self._lock:
+            self._sync_locked()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,291 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import perf
+
+# yfinance는 import가 무거워 처음 네트워크 요청할 때 가져옴 (_yfinance 참고)
+yf = None
+_yf_lock = threading.Lock()
+
+# 캐시된 데이터를 네트워크 재조회 없이 그대로 쓰는 최소 간격 (초)
+BAR_REFRESH_MIN_AGE = 10.0
+
+# 일괄 시세 조회 실패 시 종목별 조회에 쓰는 최대 동시 요청 수
+QUOTE_POOL_SIZE = 8
+
+OHLCV_AGG = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum'
+}
+
+
+# OHLC 피라미드: 상위 주기 -> 계산에 쓰는 하위 주기
+# (주봉은 월 경계와 맞지 않으므로 월봉은 일봉에서 바로 계산)
+PYRAMID_PARENT = {
+    '5m': '1m', '15m': '5m', '30m': '15m', '60m': '30m',
+    '1wk': '1d', '1mo': '1d', '1y': '1mo',
+}
+
+# 상위 주기별 pandas 리샘플 규칙 (yfinance 봉 라벨 기준에 맞춤)
+PYRAMID_RULES = {
+    '5m': {'rule': '5min'},
+    '15m': {'rule': '15min'},
+    '30m': {'rule': '30min'},
+    '60m': {'rule': '60min'},
+    '1wk': {'rule': 'W-MON', 'label': 'left', 'closed': 'left'},
+    '1mo': {'rule': 'MS'},
+    '1y': {'rule': 'YE'},
+}
+
+# 피라미드 최하위 주기를 처음 받을 때의 조회 기간
+BASE_PERIODS = {'1m': '7d', '1d': 'max'}
+
+
+def _yfinance():
+    """yfinance 모듈 (처음 호출 시 import, 보통 갱신 워커 스레드에서)"""
+    global yf
+    with _yf_lock:
+        if yf is None:
+            with perf.import_timer("yfinance"):
+                import yfinance
+            yf = yfinance
+    return yf
+
+
+def download_history(symbol, interval, period="max", start=None):
+    """yfinance에서 OHLCV 가져오기 (start가 있으면 그 시점 이후만)"""
+    ticker = _yfinance().Ticker(symbol)
+    kwargs = {"start": start} if start is not None else {"period": period}
+
+    with perf.timer("data.history"):
+        data = ticker.history(interval=interval, **kwargs)
+    return data[list(OHLCV_AGG)] if not data.empty else data
+
+
+def resample_ohlcv(data, interval, origin=None):
+    """하위 주기 OHLCV를 상위 주기로 집계
+
+    분봉은 origin(피라미드 최하위 시리즈의 첫 봉 시각)을 기준으로 구간을 나눠서
+    장 시작 시각(예: 09:30)에 맞춘 60분봉이 나오고, 끝부분만 다시 집계해도 같은
+    구간 경계를 유지합니다.
+    """
+    spec = dict(PYRAMID_RULES[interval])
+    rule = spec.pop('rule')
+    if rule.endswith('min') and origin is not None:
+        spec['origin'] = origin
+    return data.resample(rule, **spec).agg(OHLCV_AGG).dropna()
+
+
+def extend_resampled(derived, parent, interval, origin=None):
+    """상위 주기 데이터의 끝부분만 다시 집계해서 이어붙이기
+
+    마지막 두 봉 구간에 해당하는 하위 주기 봉만 다시 리샘플링하므로 전체 재집계 없이
+    새 봉이 추가되거나 형성 중인 봉이 바뀐 것을 반영합니다.
+    """
+    if derived is None or len(derived) < 2:
+        return resample_ohlcv(parent, interval, origin)
+
+    tail = parent[parent.index >= derived.index[-2]]
+    return merge_bars(derived, resample_ohlcv(tail, interval, origin))
+
+
+def _last_close(closes):
+    """종가 시리즈에서 마지막 유효값 (없으면 None)"""
+    closes = closes.dropna()
+    return float(closes.iloc[-1]) if not closes.empty else None
+
+
+def _fetch_quote(symbol):
+    """단일 종목 현재가 조회"""
+    try:
+        data = _yfinance().Ticker(symbol).history(period="1d", interval="1m")
+    except Exception:
+        return None
+    return _last_close(data['Close']) if not data.empty else None
+
+
+def fetch_quotes(symbols):
+    """여러 종목 현재가를 한 번의 일괄 요청으로 조회 -> {symbol: price}
+
+    일괄 요청이 실패하거나 일부 종목이 비어 있으면, 빠진 종목만
+    QUOTE_POOL_SIZE 크기의 스레드 풀로 나눠서 다시 조회합니다.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    quotes = {}
+    try:
+        with perf.timer("data.quotes"):
+            data = _yfinance().download(
+                symbols, period="1d", interval="1m",
+                group_by="ticker", progress=False, threads=True
+            )
+    except Exception as e:
+        print(f"Batch quote error: {e}")
+        data = None
+
+    if data is not None and not data.empty:
+        multi = isinstance(data.columns, pd.MultiIndex)
+        for symbol in symbols:
+            try:
+                closes = data[symbol]['Close'] if multi else data['Close']
+            except KeyError:
+                continue
+            price = _last_close(closes)
+            if price is not None:
+                quotes[symbol] = price
+
+    missing = [s for s in symbols if s not in quotes]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(QUOTE_POOL_SIZE, len(missing))) as pool:
+            for symbol, price in zip(missing, pool.map(_fetch_quote, missing)):
+                if price is not None:
+                    quotes[symbol] = price
+
+    return quotes
+
+
+def merge_bars(old, new):
+    """기존 봉 뒤에 새 봉 이어붙이기
+
+    완성된 봉은 그대로 두고, 겹치는 구간(아직 형성 중인 마지막 봉 포함)만
+    새로 받은 값으로 교체합니다.
+    """
+    if old is None or old.empty:
+        return new
+    if new is None or new.empty:
+        return old
+
+    new = new[new.index >= old.index[-1]]
+    if new.empty:
+        return old
+
+    return pd.concat([old[old.index < new.index[0]], new])
+
+
+class BarStore:
+    """(심볼, 주기)별 OHLCV 증분 저장소
+
+    disk(BarDiskCache)를 넘기면 메모리에 없는 항목은 디스크에서 먼저 읽고,
+    네트워크로 갱신한 결과는 다시 디스크에 저장합니다.
+
+    PYRAMID_PARENT에 있는 주기(5m~60m, 1wk, 1mo, 1y)는 네트워크에서 받지 않고
+    1m/1d 시리즈에서 메모리 안에서 계산하며, 하위 시리즈가 늘어나면 끝부분만
+    다시 집계합니다.
+    """
+    def __init__(self, fetch=download_history, min_age=BAR_REFRESH_MIN_AGE, disk=None):
+        self.fetch = fetch
+        self.min_age = min_age
+        self.disk = disk
+        self._frames = {}       # (symbol, interval) -> DataFrame
+        self._fetched_at = {}   # (symbol, interval) -> 마지막 네트워크 조회 시각
+        self._derived_src = {}  # (symbol, interval) -> 계산에 쓴 하위 주기 DataFrame
+        self._lock = threading.Lock()
+
+    def get(self, symbol, interval):
+        """캐시된 데이터 반환 (없으면 None)"""
+        if interval in PYRAMID_PARENT:
+            return self._derive(symbol, interval)
+
+        with self._lock:
+            data = self._frames.get((symbol, interval))
+        if data is None and self.disk is not None:
+            data, fetched_at = self.disk.load(symbol, interval)
+            if data is not None:
+                self.put(symbol, interval, data, fetched_at)
+        return data
+
+    def is_fresh(self, symbol, interval):
+        """최근 min_age초 안에 조회한 데이터인지 여부"""
+        with self._lock:
+            fetched_at = self._fetched_at.get((symbol, interval))
+        return fetched_at is not None and time.time() - fetched_at < self.min_age
+
+    def put(self, symbol, interval, data, fetched_at=None):
+        """외부에서 받은 데이터로 캐시 채우기"""
+        with self._lock:
+            self._frames[(symbol, interval)] = data
+            if fetched_at is not None:
+                self._fetched_at[(symbol, interval)] = fetched_at
+
+    @staticmethod
+    def _base_interval(interval):
+        """피라미드 최하위 주기 (1m 또는 1d)"""
+        while interval in PYRAMID_PARENT:
+            interval = PYRAMID_PARENT[interval]
+        return interval
+
+    def _origin(self, symbol, interval):
+        """분봉 집계 기준 시각 (최하위 시리즈 첫 봉을 5분 단위로 내림)"""
+        base = self.get(symbol, self._base_interval(interval))
+        if base is None or base.empty:
+            return None
+        return base.index[0].floor('5min')
+
+    def _derive(self, symbol, interval):
+        """피라미드 상위 주기 계산 (하위 시리즈가 그대로면 이전 결과 재사용)"""
+        key = (symbol, interval)
+        parent = self.get(symbol, PYRAMID_PARENT[interval])
+        if parent is None or parent.empty:
+            return None
+
+        with self._lock:
+            derived = self._frames.get(key)
+            if derived is not None and self._derived_src.get(key) is parent:
+                return derived
+
+        origin = self._origin(symbol, interval)
+        derived = extend_resampled(derived, parent, interval, origin)
+
+        with self._lock:
+            self._frames[key] = derived
+            self._derived_src[key] = parent
+        return derived
+
+    def load(self, symbol, interval, period="max"):
+        """데이터 로드 - 캐시가 있으면 마지막 봉 이후만 받아서 이어붙임"""
+        if interval in PYRAMID_PARENT:
+            base = self._base_interval(interval)
+            self.load(symbol, base, BASE_PERIODS.get(base, period))
+            return self._derive(symbol, interval)
+
+        key = (symbol, interval)
+        cached = self.get(symbol, interval)
+
+        if cached is not None and not cached.empty:
+            if self.is_fresh(symbol, interval):
+                return cached
+            data = merge_bars(cached, self.fetch(symbol, interval, start=cached.index[-1]))
+        else:
+            data = self.fetch(symbol, interval, period=period)
+
+        fetched_at = time.time()
+        with self._lock:
+            self._frames[key] = data
+            self._fetched_at[key] = fetched_at
+
+        if self.disk is not None and data is not cached:
+            try:
+                self.disk.save(symbol, interval, data, fetched_at)
+            except OSError as e:
+                print(f"Bar cache write error: {e}")
+        return data
+
+    def clear(self, symbol=None):
+        """캐시 비우기 (symbol 지정 시 해당 종목만)"""
+        with self._lock:
+            for key in list(self._frames):
+                if symbol is None or key[0] == symbol:
+                    self._frames.pop(key, None)
+                    self._fetched_at.pop(key, None)
+            # 파생 주기가 지워진 하위 시리즈를 기준으로 최신이라고 판단하지 않도록 함께 비움
+            for key in list(self._derived_src):
+                if symbol is None or key[0] == symbol:
+                    del self._derived_src[key]
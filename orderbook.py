@@ -0,0 +1,227 @@
+import heapq
+import itertools
+import math
+from collections import namedtuple
+
+# 주문 유효 기간 (time in force)
+TIF_GTC = "GTC"   # 취소할 때까지 유효
+TIF_GTD = "GTD"   # expires_at 시각까지 유효
+TIF_IOC = "IOC"   # 즉시 체결 가능한 만큼만 체결, 나머지 취소
+TIF_FOK = "FOK"   # 전량 즉시 체결 가능할 때만 체결, 아니면 전량 취소
+
+SIDE_BUY = "BUY"
+SIDE_SELL = "SELL"
+
+# 주문 상태
+STATUS_OPEN = "open"
+STATUS_FILLED = "filled"
+STATUS_CANCELLED = "cancelled"
+STATUS_EXPIRED = "expired"
+
+# 체결 한 건 (remaining은 이 체결 뒤 남은 주문 수량)
+Fill = namedtuple('Fill', 'order_id side price quantity remaining time')
+
+
+class Order:
+    """지정가 주문 (수량은 체결될 때마다 remaining에서 차감)"""
+    __slots__ = ('id', 'side', 'price', 'quantity', 'remaining', 'tif',
+                 'expires_at', 'created', 'status', 'tag')
+
+    def __init__(self, order_id, side, price, quantity, tif, expires_at, created, tag):
+        self.id = order_id
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.remaining = quantity
+        self.tif = tif
+        self.expires_at = expires_at
+        self.created = created
+        self.status = STATUS_OPEN
+        self.tag = tag      # 호출 측 데이터 (예: 주문 당시 화폐/환율)
+
+    @property
+    def filled(self):
+        return self.quantity - self.remaining
+
+    def __repr__(self):
+        return (f"Order({self.id}, {self.side} {self.remaining}/{self.quantity} "
+                f"@ {self.price}, {self.tif}, {self.status})")
+
+
+class OrderBook:
+    """한 종목의 지정가 주문 장부 + 시세 틱 체결 엔진
+
+    대기 주문은 방향별 힙에 (가격 우선, 접수 순서) 키로 들어 있어 최우선 주문 확인이
+    O(1), 추가/체결 제거가 O(log n)입니다. 취소는 상태만 바꾸고 힙에서는 맨 위에 올라올
+    때 버리므로(지연 삭제) 역시 O(1)입니다. 가격대별 잔량은 levels에 따로 집계합니다.
+
+    체결은 상대 주문 대신 시세 틱을 기준으로 합니다. 틱 가격이 매수 지정가 이하이거나
+    매도 지정가 이상이면 그 틱 가격으로 체결하고, volume을 주면 방향별로 그 수량까지만
+    가격-시간 우선순위대로 체결합니다 (나머지는 부분 체결로 남음). 새 주문이 이미 체결
+    가능한 가격이면 마지막 틱에 남은 수량만큼 즉시 체결합니다.
+    """
+    def __init__(self, symbol=None):
+        self.symbol = symbol
+        self.orders = {}                 # 주문 번호 -> 대기 중인 Order
+        self.levels = {SIDE_BUY: {}, SIDE_SELL: {}}   # 가격 -> 대기 잔량
+        self.last_price = None
+        self.last_time = None
+        self._bids = []                  # (-가격, 순번, 주문)
+        self._asks = []                  # (가격, 순번, 주문)
+        self._expiry = []                # (만료 시각, 순번, 주문)
+        self._available = {SIDE_BUY: 0, SIDE_SELL: 0}  # 마지막 틱에서 남은 체결 가능 수량
+        self._seq = itertools.count(1)
+
+    def __len__(self):
+        return len(self.orders)
+
+    # ------------------ 주문 ------------------
+    def submit(self, side, price, quantity, tif=TIF_GTC, now=None, expires_at=None, tag=None):
+        """주문 접수 -> (Order, 즉시 체결 Fill 목록)
+
+        IOC/FOK는 남은 수량을 대기시키지 않고 취소합니다.
+        """
+        if side not in (SIDE_BUY, SIDE_SELL):
+            raise ValueError(f"Unknown side: {side}")
+        if quantity <= 0 or price <= 0:
+            raise ValueError("Order price and quantity must be positive")
+        if tif == TIF_GTD and expires_at is None:
+            raise ValueError("GTD order needs expires_at")
+
+        seq = next(self._seq)
+        order = Order(seq, side, price, quantity, tif, expires_at, now, tag)
+
+        fills = []
+        if tif == TIF_FOK and self._marketable_quantity(order) < quantity:
+            order.status = STATUS_CANCELLED
+            return order, fills
+        if self._crosses(order, self.last_price):
+            fills.append(self._fill(order, self.last_price,
+                                    min(order.remaining, self._available[side]), now))
+
+        if order.remaining == 0:
+            order.status = STATUS_FILLED
+        elif tif in (TIF_IOC, TIF_FOK):
+            order.status = STATUS_CANCELLED
+        else:
+            self._rest(order, seq)
+        return order, fills
+
+    def cancel(self, order_id):
+        """대기 주문 취소 -> 취소한 Order (없거나 이미 끝난 주문이면 None)"""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return None
+        order.status = STATUS_CANCELLED
+        self._unlevel(order, order.remaining)
+        self._compact()
+        return order
+
+    def cancel_all(self, side=None):
+        """대기 주문 일괄 취소 (side를 주면 그 방향만) -> 취소한 Order 목록"""
+        ids = [oid for oid, order in self.orders.items() if side is None or order.side == side]
+        return [self.cancel(oid) for oid in ids]
+
+    # ------------------ 시세 ------------------
+    def on_tick(self, price, now=None, volume=None):
+        """시세 틱 반영 -> 체결 Fill 목록 (가격 우선, 같은 가격은 먼저 들어온 주문부터)
+
+        GTD 만료는 하지 않으므로 만료 처리가 필요하면 먼저 expire(now)를 호출합니다.
+        """
+        self.last_price = price
+        self.last_time = now
+        available = math.inf if volume is None else volume
+        self._available[SIDE_BUY] = self._available[SIDE_SELL] = available
+
+        fills = []
+        for side, heap in ((SIDE_BUY, self._bids), (SIDE_SELL, self._asks)):
+            while self._available[side] > 0:
+                order = self._top(heap)
+                if order is None or not self._crosses(order, price):
+                    break
+                fills.append(self._fill(order, price, min(order.remaining, self._available[side]), now))
+                if order.remaining == 0:
+                    heapq.heappop(heap)
+                    del self.orders[order.id]
+                    order.status = STATUS_FILLED
+        return fills
+
+    def expire(self, now):
+        """만료 시각이 지난 GTD 주문 정리 -> 만료된 Order 목록"""
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            order = heapq.heappop(self._expiry)[2]
+            if self.orders.pop(order.id, None) is not None:
+                order.status = STATUS_EXPIRED
+                self._unlevel(order, order.remaining)
+                expired.append(order)
+        if expired:
+            self._compact()
+        return expired
+
+    def best(self, side):
+        """최우선 대기 가격 (없으면 None)"""
+        order = self._top(self._bids if side == SIDE_BUY else self._asks)
+        return None if order is None else order.price
+
+    def depth(self, side, count=5):
+        """최우선부터 count개 가격대 [(가격, 잔량)]"""
+        levels = self.levels[side]
+        prices = (heapq.nlargest if side == SIDE_BUY else heapq.nsmallest)(count, levels)
+        return [(p, levels[p]) for p in prices]
+
+    # ------------------ 내부 ------------------
+    @staticmethod
+    def _crosses(order, price):
+        if price is None:
+            return False
+        return price <= order.price if order.side == SIDE_BUY else price >= order.price
+
+    def _marketable_quantity(self, order):
+        if not self._crosses(order, self.last_price):
+            return 0
+        return self._available[order.side]
+
+    def _fill(self, order, price, quantity, now):
+        order.remaining -= quantity
+        self._available[order.side] -= quantity
+        if order.id in self.orders:
+            self._unlevel(order, quantity)
+        return Fill(order.id, order.side, price, quantity, order.remaining, now)
+
+    def _rest(self, order, seq):
+        self.orders[order.id] = order
+        levels = self.levels[order.side]
+        levels[order.price] = levels.get(order.price, 0) + order.remaining
+        if order.side == SIDE_BUY:
+            heapq.heappush(self._bids, (-order.price, seq, order))
+        else:
+            heapq.heappush(self._asks, (order.price, seq, order))
+        if order.tif == TIF_GTD:
+            heapq.heappush(self._expiry, (order.expires_at, seq, order))
+
+    def _unlevel(self, order, quantity):
+        levels = self.levels[order.side]
+        left = levels[order.price] - quantity
+        if left > 0:
+            levels[order.price] = left
+        else:
+            del levels[order.price]
+
+    def _compact(self):
+        """취소/만료로 힙에 남은 죽은 항목이 대기 주문 수보다 많아지면 힙 재구성 (분할 상환 O(1))"""
+        if len(self._bids) + len(self._asks) <= 2 * len(self.orders) + 64:
+            return
+        for name in ('_bids', '_asks', '_expiry'):
+            heap = [entry for entry in getattr(self, name) if entry[2].status == STATUS_OPEN]
+            heapq.heapify(heap)
+            setattr(self, name, heap)
+
+    def _top(self, heap):
+        """힙 맨 위의 대기 주문 (취소/만료된 주문은 여기서 버림)"""
+        while heap:
+            order = heap[0][2]
+            if order.status == STATUS_OPEN and order.remaining > 0:
+                return order
+            heapq.heappop(heap)
+        return None
@@ -0,0 +1,176 @@
+import csv
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# 계측 설정 (시작 시간 측정에도 쓰이므로 표준 라이브러리만 사용)
+PERF_HISTORY = 512          # 구간별로 보관하는 최근 측정값 수 (링 버퍼)
+PERCENTILES = (50, 95, 99)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """최근 측정값 링 버퍼 (초 단위 기록, 통계는 ms)"""
+    def __init__(self, size=PERF_HISTORY):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        # deque.append는 스레드 안전 (비전/갱신 워커에서 동시에 기록)
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        """{count, mean, p50, p95, p99, max} (ms, 최근 PERF_HISTORY개 기준)"""
+        values = sorted(self.samples)
+        if not values:
+            return None
+        n = len(values)
+        p50, p95, p99 = (values[min(n - 1, int(n * q / 100))] * 1000 for q in PERCENTILES)
+        return {
+            'count': self.count,
+            'mean': sum(values) / n * 1000,
+            'p50': p50, 'p95': p95, 'p99': p99,
+            'max': values[-1] * 1000,
+        }
+
+
+class _Timer:
+    __slots__ = ('hist', 'started')
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.add(time.perf_counter() - self.started)
+        return False
+
+
+class PerfRecorder:
+    """구간 이름별 처리 시간 수집기
+
+    timer(name)은 with 블록, timed(name)은 함수 데코레이터, record(name, seconds)는
+    이미 잰 값을 기록합니다. enabled가 False면 timer는 공용 빈 컨텍스트를 돌려주고
+    timed/record는 플래그 확인만 하므로 꺼 두었을 때 비용은 무시할 만합니다.
+    """
+    def __init__(self, enabled=False, size=PERF_HISTORY):
+        self.enabled = enabled
+        self.size = size
+        self._hists = {}
+        self._lock = threading.Lock()
+
+    def _hist(self, name):
+        hist = self._hists.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(name, Histogram(self.size))
+        return hist
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._hist(name))
+
+    def timed(self, name):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._hist(name).add(time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self._hist(name).add(seconds)
+
+    def snapshot(self):
+        """구간 이름 -> 통계 dict (이름순)"""
+        with self._lock:
+            items = sorted(self._hists.items())
+        return {name: stats for name, hist in items if (stats := hist.summary()) is not None}
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+
+    def format_lines(self):
+        """오버레이용 텍스트 줄 목록"""
+        lines = [f"{'stage':<22}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, s in self.snapshot().items():
+            lines.append(f"{name:<22}{s['p50']:7.1f}{s['p95']:7.1f}{s['p99']:7.1f}")
+        return lines
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({'time': time.time(), 'stages': self.snapshot()}, f, indent=2)
+
+    def dump_csv(self, path):
+        """구간별 통계를 한 줄씩 추가 (파일이 비어 있으면 헤더부터)"""
+        fields = ['time', 'stage', 'count', 'mean', 'p50', 'p95', 'p99', 'max']
+        now = time.time()
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if f.tell() == 0:
+                writer.writeheader()
+            for name, stats in self.snapshot().items():
+                writer.writerow(dict(stats, time=now, stage=name))
+
+
+class RateCounter:
+    """루프/이벤트 달성 빈도 측정 (마지막 read() 이후 초당 횟수)"""
+    def __init__(self):
+        self.count = 0
+        self._started = time.perf_counter()
+
+    def tick(self, n=1):
+        self.count += n
+
+    def read(self):
+        now = time.perf_counter()
+        rate = self.count / max(now - self._started, 1e-9)
+        self.count = 0
+        self._started = now
+        return rate
+
+
+# 모듈 import 시간 (계측 on/off와 무관하게 항상 기록, 이름 -> 초)
+import_times = {}
+
+
+@contextmanager
+def import_timer(name):
+    """with 블록 안의 import 시간을 import_times에 기록 (이미 로드된 모듈이면 0에 가까움)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        import_times[name] = import_times.get(name, 0.0) + time.perf_counter() - started
+
+
+def import_report():
+    """import 시간 보고 문자열 (느린 순)"""
+    items = sorted(import_times.items(), key=lambda kv: kv[1], reverse=True)
+    return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in items)
+
+
+# 앱 전역 수집기 (모듈에서 perf.timer(...) / perf.record(...)로 사용)
+recorder = PerfRecorder()
+timer = recorder.timer
+timed = recorder.timed
+record = recorder.record
@@ -0,0 +1,176 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# 포지션 배열 초기 용량 (가득 차면 두 배로 늘림)
+PORTFOLIO_CAPACITY = 64
+
+# 평가 결과 (금액은 USD, 배열은 포지션 순서와 같음)
+Valuation = namedtuple('Valuation', [
+    'market_value',    # 총 평가금액
+    'cost_basis',      # 총 매입금액
+    'unrealized_pnl',  # 평가손익
+    'pnl_ratio',       # 평가손익률 (매입금액 대비, 보유 없으면 0)
+    'values',          # (N,) 포지션별 평가금액
+    'pnl',             # (N,) 포지션별 평가손익
+    'weights',         # (N,) 포지션별 비중 (평가금액 합 대비)
+])
+
+EMPTY_VALUATION = Valuation(0.0, 0.0, 0.0, 0.0, np.empty(0), np.empty(0), np.empty(0))
+
+
+class Portfolio:
+    """NumPy 배열로 보관하는 포지션 장부
+
+    종목마다 (수량, 평균 매입가, 최근 시세)를 같은 인덱스의 배열 칸에 두고,
+    symbols/index로 심볼과 칸 번호를 매핑합니다. 시세가 바뀌면 dirty 표시만 하고
+    revalue()가 전체 장부를 한 번의 벡터 연산으로 다시 평가합니다. 시세가 아직 없는
+    종목은 평균 매입가로 평가합니다. 가격은 모두 USD 기준입니다.
+
+    시세 갱신은 워커 스레드에서도 들어오므로 배열 접근은 내부 락으로 보호합니다.
+    """
+    def __init__(self, capacity=PORTFOLIO_CAPACITY):
+        self.symbols = []      # 칸 번호 -> 심볼 (매수 순서)
+        self.index = {}        # 심볼 -> 칸 번호
+        self.quantity = np.zeros(capacity)
+        self.avg_cost = np.zeros(capacity)
+        self.price = np.full(capacity, np.nan)
+        self.realized_pnl = 0.0
+
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._valuation = EMPTY_VALUATION
+
+    def state(self):
+        """JSON으로 저장할 수 있는 포지션 상태 (시세는 저장하지 않음)"""
+        with self._lock:
+            n = len(self.symbols)
+            return {
+                'symbols': list(self.symbols),
+                'quantity': self.quantity[:n].tolist(),
+                'avg_cost': self.avg_cost[:n].tolist(),
+                'realized_pnl': self.realized_pnl,
+            }
+
+    @classmethod
+    def from_state(cls, state):
+        """state()로 저장한 상태에서 장부 복원"""
+        symbols = state['symbols']
+        portfolio = cls(max(PORTFOLIO_CAPACITY, len(symbols)))
+        n = len(symbols)
+        portfolio.symbols = list(symbols)
+        portfolio.index = {symbol: i for i, symbol in enumerate(symbols)}
+        portfolio.quantity[:n] = state['quantity']
+        portfolio.avg_cost[:n] = state['avg_cost']
+        portfolio.realized_pnl = state.get('realized_pnl', 0.0)
+        return portfolio
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def quantity_of(self, symbol):
+        i = self.index.get(symbol)
+        return 0.0 if i is None else float(self.quantity[i])
+
+    def rows(self, first, count):
+        """first번째부터 count개 (심볼, 수량) 목록"""
+        with self._lock:
+            stop = min(len(self.symbols), first + count)
+            return [(self.symbols[i], float(self.quantity[i])) for i in range(first, stop)]
+
+    def _grow(self):
+        capacity = len(self.quantity) * 2
+        for name, fill in (('quantity', 0.0), ('avg_cost', 0.0), ('price', np.nan)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def buy(self, symbol, quantity, price):
+        """매수 체결 반영 (평균 매입가 갱신)"""
+        with self._lock:
+            i = self.index.get(symbol)
+            if i is None:
+                i = len(self.symbols)
+                if i == len(self.quantity):
+                    self._grow()
+                self.symbols.append(symbol)
+                self.index[symbol] = i
+                self.quantity[i] = 0.0
+                self.avg_cost[i] = 0.0
+                self.price[i] = np.nan
+
+            held = self.quantity[i]
+            self.avg_cost[i] = (held * self.avg_cost[i] + quantity * price) / (held + quantity)
+            self.quantity[i] = held + quantity
+            self.price[i] = price
+            self._dirty = True
+
+    def sell(self, symbol, quantity, price):
+        """매도 체결 반영 -> 실현손익 (보유 수량이 부족하면 ValueError)"""
+        with self._lock:
+            i = self.index.get(symbol)
+            if i is None or self.quantity[i] < quantity:
+                raise ValueError(f"Not enough {symbol} to sell")
+
+            realized = (price - self.avg_cost[i]) * quantity
+            self.realized_pnl += realized
+            self.quantity[i] -= quantity
+            self.price[i] = price
+            if self.quantity[i] <= 0:
+                self._remove(i)
+            self._dirty = True
+            return float(realized)
+
+    def _remove(self, i):
+        """i번째 포지션 제거 (뒤 칸을 당겨 매수 순서 유지)"""
+        last = len(self.symbols) - 1
+        for arr in (self.quantity, self.avg_cost, self.price):
+            arr[i:last] = arr[i + 1:last + 1]
+        self.quantity[last] = self.avg_cost[last] = 0.0
+        self.price[last] = np.nan
+        del self.index[self.symbols.pop(i)]
+        for j in range(i, last):
+            self.index[self.symbols[j]] = j
+
+    def set_prices(self, prices):
+        """시세 dict(symbol -> USD 가격) 반영 (보유 종목만, 값이 바뀐 경우 dirty)"""
+        with self._lock:
+            for symbol, price in prices.items():
+                i = self.index.get(symbol)
+                if i is not None and price is not None and self.price[i] != price:
+                    self.price[i] = price
+                    self._dirty = True
+
+    def revalue(self):
+        """전체 장부 재평가 (시세가 바뀌지 않았으면 이전 결과 재사용)"""
+        with self._lock:
+            if not self._dirty:
+                return self._valuation
+            n = len(self.symbols)
+            qty = self.quantity[:n]
+            cost = self.avg_cost[:n]
+            price = np.where(np.isnan(self.price[:n]), cost, self.price[:n])
+
+            values = qty * price
+            costs = qty * cost
+            pnl = values - costs
+            market_value = float(values.sum())
+            cost_basis = float(costs.sum())
+            weights = values / market_value if market_value > 0 else np.zeros(n)
+
+            self._valuation = Valuation(
+                market_value=market_value,
+                cost_basis=cost_basis,
+                unrealized_pnl=market_value - cost_basis,
+                pnl_ratio=(market_value - cost_basis) / cost_basis if cost_basis > 0 else 0.0,
+                values=values,
+                pnl=pnl,
+                weights=weights,
+            )
+            self._dirty = False
+            return self._valuation
@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+
+# 갱신 스케줄러 설정
+REFRESH_WORKERS = 3          # 고정 워커 스레드 수
+BACKOFF_BASE = 2.0           # 첫 실패 후 대기 시간 (초)
+BACKOFF_MAX = 120.0          # 최대 대기 시간 (초)
+
+
+class RefreshScheduler:
+    """리소스별 백그라운드 갱신 작업 조정자
+
+    고정된 워커 스레드 풀에서 작업을 실행합니다. 같은 키(리소스)의 작업이 이미
+    대기 중이거나 실행 중이면 새 요청은 합쳐지고(merge), 실패한 리소스는
+    지수 백오프 동안 요청을 받지 않습니다.
+    """
+    def __init__(self, workers=REFRESH_WORKERS, backoff_base=BACKOFF_BASE,
+                 backoff_max=BACKOFF_MAX):
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = {}      # key -> 제출 시각 (대기 + 실행 중)
+        self._running = set()
+        self._failures = {}     # key -> 연속 실패 횟수
+        self._retry_at = {}     # key -> 재시도 가능 시각
+        self._stats = {}        # key -> 통계 dict
+        self._closed = False
+
+        self._workers = [
+            threading.Thread(target=self._worker, daemon=True, name=f"refresh-{i}")
+            for i in range(workers)
+        ]
+        for t in self._workers:
+            t.start()
+
+    def _key_stats(self, key):
+        return self._stats.setdefault(key, {
+            'runs': 0, 'merged': 0, 'skipped': 0, 'failures': 0,
+            'last_latency': 0.0, 'last_duration': 0.0, 'last_error': None
+        })
+
+    def submit(self, key, fn, *args):
+        """작업 제출 - 합쳐지거나 백오프 중이면 False 반환"""
+        now = time.monotonic()
+        with self._lock:
+            if self._closed:
+                return False
+            stats = self._key_stats(key)
+            if key in self._pending:
+                stats['merged'] += 1
+                return False
+            if now < self._retry_at.get(key, 0.0):
+                stats['skipped'] += 1
+                return False
+            self._pending[key] = now
+        self._queue.put((key, fn, args))
+        return True
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            key, fn, args = item
+
+            with self._lock:
+                submitted = self._pending.get(key, time.monotonic())
+                self._running.add(key)
+            started = time.monotonic()
+
+            error = None
+            try:
+                fn(*args)
+            except Exception as e:
+                error = e
+                print(f"Refresh error ({key}): {e}")
+
+            finished = time.monotonic()
+            with self._lock:
+                stats = self._key_stats(key)
+                stats['runs'] += 1
+                stats['last_latency'] = finished - submitted
+                stats['last_duration'] = finished - started
+                if error is None:
+                    self._failures.pop(key, None)
+                    self._retry_at.pop(key, None)
+                    stats['last_error'] = None
+                else:
+                    count = self._failures.get(key, 0) + 1
+                    self._failures[key] = count
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (count - 1))
+                    self._retry_at[key] = finished + delay
+                    stats['failures'] += 1
+                    stats['last_error'] = str(error)
+                self._running.discard(key)
+                self._pending.pop(key, None)
+
+    def queue_depth(self):
+        """실행을 기다리는 작업 수"""
+        return self._queue.qsize()
+
+    def is_pending(self, key):
+        """해당 리소스 작업이 대기 또는 실행 중인지 여부"""
+        with self._lock:
+            return key in self._pending
+
+    def stats(self):
+        """큐 깊이, 실행 중 작업, 리소스별 지연/실패 통계"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'running': sorted(self._running),
+                'oldest_pending': max((now - t for t in self._pending.values()), default=0.0),
+                'keys': {
+                    key: dict(stats, backoff=max(0.0, self._retry_at.get(key, 0.0) - now))
+                    for key, stats in self._stats.items()
+                },
+            }
+
+    def shutdown(self):
+        """워커 종료 (대기 중인 작업은 버림)"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for _ in self._workers:
+            self._queue.put(None)
@@ -0,0 +1,239 @@
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# 리플레이 설정
+REPLAY_FRAME_SIZE = (640, 360)   # 랜드마크만 녹화된 세션에서 쓰는 빈 프레임 크기 (폭, 높이)
+REPLAY_DEFAULT_FPS = 30.0
+REPLAY_MAX_HANDS = 2
+
+# 손 랜드마크 연결선 (MediaPipe HAND_CONNECTIONS와 동일, 녹화 랜드마크 그리기용)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+# MediaPipe 결과와 같은 모양의 녹화 결과 (hand.landmark[i].x, handedness.classification[0].label)
+Landmark = namedtuple('Landmark', 'x y z')
+RecordedHand = namedtuple('RecordedHand', 'landmark')
+Classification = namedtuple('Classification', 'label score')
+RecordedHandedness = namedtuple('RecordedHandedness', 'classification')
+RecordedResults = namedtuple('RecordedResults', 'multi_hand_landmarks multi_handedness')
+
+
+def make_results(points, labels):
+    """(N, 21, 3) 배열 + 손 라벨 -> MediaPipe 결과 모양 객체 (손이 없으면 None 필드)"""
+    if len(labels) == 0:
+        return RecordedResults(None, None)
+    hands = [RecordedHand([Landmark(*map(float, p)) for p in hand]) for hand in points]
+    handedness = [RecordedHandedness([Classification(label, 1.0)]) for label in labels]
+    return RecordedResults(hands, handedness)
+
+
+def draw_recorded_hands(image, results, color=(0, 255, 0)):
+    """녹화 랜드마크를 이미지에 그림 (정규화 좌표)"""
+    if not results.multi_hand_landmarks:
+        return
+    h, w = image.shape[:2]
+    for hand in results.multi_hand_landmarks:
+        pts = [(int(p.x * w), int(p.y * h)) for p in hand.landmark]
+        for a, b in HAND_CONNECTIONS:
+            cv2.line(image, pts[a], pts[b], color, 1)
+        for pt in pts:
+            cv2.circle(image, pt, 2, (0, 0, 255), -1)
+
+
+class VideoFileSource:
+    """동영상 파일 프레임 소스 (cv2.VideoCapture와 같은 read/isOpened/release)
+
+    realtime=True면 파일 FPS에 맞춰 read()를 늦추고, loop=True면 끝에서 처음으로 돌아갑니다.
+    """
+    recorded = False
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else REPLAY_DEFAULT_FPS
+        self._next_time = None
+        self.timestamp = 0.0
+        self.results = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._next_time = None
+            ret, frame = self.cap.read()
+        if not ret:
+            return False, None
+        self.timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        self._pace()
+        return True, frame
+
+    def _pace(self):
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._next_time is None:
+            self._next_time = now
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time = max(self._next_time, now) + 1.0 / self.fps
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self.cap.release()
+
+
+class RecordedSession:
+    """.npz로 녹화한 세션 프레임 소스
+
+    파일 구성 (SessionRecorder.save와 같은 형식):
+        timestamps  (T,) float64      - 녹화 시작 기준 초
+        landmarks   (T, H, 21, 3)     - 손 랜드마크 (없는 손은 NaN), 선택
+        handedness  (T, H) str        - "Left"/"Right" (없는 손은 ""), 선택
+        frames      (T, h, w, 3) uint8 - BGR 프레임, 선택
+
+    랜드마크가 있으면 read() 뒤 results에 녹화된 추론 결과가 들어가므로 MediaPipe
+    추론 없이 제스처 경로를 재현할 수 있습니다. 프레임이 없으면 빈 프레임을 돌려줍니다.
+    """
+    def __init__(self, path, realtime=True, loop=False, frame_size=REPLAY_FRAME_SIZE):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        with np.load(path, allow_pickle=False) as data:
+            self.timestamps = np.asarray(data["timestamps"], dtype=np.float64)
+            self.landmarks = data["landmarks"] if "landmarks" in data else None
+            self.handedness = data["handedness"] if "handedness" in data else None
+            self.frames = data["frames"] if "frames" in data else None
+
+        self.recorded = self.landmarks is not None
+        if self.frames is None:
+            w, h = frame_size
+            self._blank = np.zeros((h, w, 3), dtype=np.uint8)
+        self._pos = 0
+        self._start = None
+        self._offset = 0.0
+        self.timestamp = 0.0
+        self.results = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def isOpened(self):
+        return self._pos < len(self) or self.loop
+
+    def read(self):
+        if self._pos >= len(self):
+            if not self.loop or len(self) == 0:
+                return False, None
+            # 반복 재생 시 타임스탬프가 계속 증가하도록 오프셋 누적
+            self._offset += self.timestamps[-1] - self.timestamps[0] + 1.0 / REPLAY_DEFAULT_FPS
+            self._pos = 0
+
+        i = self._pos
+        self._pos += 1
+        self.timestamp = self._offset + self.timestamps[i] - self.timestamps[0]
+        if self.recorded:
+            self.results = make_results(*self.hands_at(i))
+        self._pace()
+
+        frame = self.frames[i] if self.frames is not None else self._blank
+        return True, frame
+
+    def hands_at(self, i):
+        """i번째 프레임의 (N, 21, 3) 랜드마크와 손 라벨 목록"""
+        points = self.landmarks[i]
+        present = ~np.isnan(points[:, 0, 0])
+        if self.handedness is None:
+            # 손 라벨 없이 녹화된 세션은 빈 라벨 (손 구분이 필요한 제스처만 반응하지 않음)
+            labels = [""] * int(present.sum())
+        else:
+            labels = [str(label) for label in self.handedness[i][present]]
+        return points[present], labels
+
+    def _pace(self):
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now - self.timestamp
+        delay = self._start + self.timestamp - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self._pos = len(self)
+        self.loop = False
+
+
+class SessionRecorder:
+    """추론 결과(및 선택적으로 프레임)를 모아 RecordedSession 형식 .npz로 저장"""
+    def __init__(self, keep_frames=False, max_hands=REPLAY_MAX_HANDS):
+        self.keep_frames = keep_frames
+        self.max_hands = max_hands
+        self._timestamps = []
+        self._landmarks = []
+        self._handedness = []
+        self._frames = []
+
+    def add(self, timestamp, points, labels, frame=None):
+        """한 프레임 추가 (points: (N, 21, 3), labels: 손 라벨 목록)"""
+        slots = np.full((self.max_hands, 21, 3), np.nan, dtype=np.float32)
+        names = np.full(self.max_hands, "", dtype="<U5")
+        n = min(len(labels), self.max_hands)
+        slots[:n] = points[:n]
+        names[:n] = labels[:n]
+
+        self._timestamps.append(timestamp)
+        self._landmarks.append(slots)
+        self._handedness.append(names)
+        if self.keep_frames and frame is not None:
+            self._frames.append(frame.copy())
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def save(self, path):
+        arrays = {
+            "timestamps": np.asarray(self._timestamps, dtype=np.float64),
+            "landmarks": np.stack(self._landmarks) if self._landmarks
+            else np.empty((0, self.max_hands, 21, 3), dtype=np.float32),
+            "handedness": np.stack(self._handedness) if self._handedness
+            else np.empty((0, self.max_hands), dtype="<U5"),
+        }
+        if self._frames:
+            arrays["frames"] = np.stack(self._frames)
+        np.savez_compressed(path, **arrays)
+
+
+def open_source(source, capture_size=None, realtime=True, loop=False):
+    """카메라 번호 / 동영상 경로 / .npz 세션 경로 -> 프레임 소스 (이미 연 소스는 그대로)"""
+    if hasattr(source, 'read'):
+        return source
+    if isinstance(source, str) and source.lower().endswith(".npz"):
+        return RecordedSession(source, realtime=realtime, loop=loop)
+    if isinstance(source, str) and not source.isdigit():
+        return VideoFileSource(source, realtime=realtime, loop=loop)
+
+    cap = cv2.VideoCapture(int(source))
+    if capture_size is not None:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_size[1])
+    return cap
@@ -0,0 +1,80 @@
+import numpy as np
+
+# 가격 경로 생성 설정 (app_linux.py의 GBM + 점프 모델과 같은 기본값)
+SIM_BLOCK_TICKS = 4096       # 한 번에 미리 만드는 틱 수 (종목 수와 곱한 만큼 메모리 사용)
+JUMP_PROB = 0.004            # 틱당 점프 확률
+JUMP_RANGE = (0.6, 2.5)      # 점프 크기 (%, 방향은 무작위)
+PRICE_FLOOR = 1.0
+
+
+class PathEngine:
+    """GBM + 점프 가격 경로를 블록 단위로 미리 생성하는 시뮬레이터
+
+    N개 종목의 로그 수익률을 (block_ticks, N) 배열로 한 번에 뽑아 누적합으로 경로를
+    만들고, next()는 다음 행을 돌려주기만 합니다. 틱당 비용은 종목 수와 무관한 인덱스
+    증가 하나이고, 난수 생성과 exp 계산은 block_ticks틱마다 한 번의 벡터 연산으로
+    처리됩니다. 같은 seed면 같은 경로가 나옵니다.
+
+    틱 하나는 s1 = s0 * exp((mu - sigma^2/2) dt + sigma sqrt(dt) z) * (1 + jump/100)이고,
+    가격 하한(floor)은 만들어진 값에 적용합니다 (하한에 닿은 종목은 다음 블록부터 하한에서 출발).
+    """
+    def __init__(self, init_prices, mu, sigma, dt, jump_prob=JUMP_PROB, jump_range=JUMP_RANGE,
+                 block_ticks=SIM_BLOCK_TICKS, floor=PRICE_FLOOR, seed=None):
+        self.prices = np.atleast_1d(np.asarray(init_prices, dtype=np.float64)).copy()
+        self.count = len(self.prices)
+        self.drift = (mu - 0.5 * sigma ** 2) * dt
+        self.vol = sigma * np.sqrt(dt)
+        self.jump_prob = jump_prob
+        self.jump_range = jump_range
+        self.block_ticks = block_ticks
+        self.floor = floor
+        self.rng = np.random.default_rng(seed)
+
+        self.tick = 0                # 지금까지 소비한 틱 수
+        self._block = np.empty((0, self.count))
+        self._pos = 0
+
+    def _generate(self):
+        """다음 block_ticks틱 경로 생성 (마지막 가격에서 이어짐)"""
+        shape = (self.block_ticks, self.count)
+        log_returns = self.drift + self.vol * self.rng.standard_normal(shape)
+
+        jumps = self.rng.random(shape) < self.jump_prob
+        n_jumps = int(jumps.sum())
+        if n_jumps:
+            sizes = self.rng.uniform(*self.jump_range, n_jumps)
+            signs = self.rng.integers(0, 2, n_jumps) * 2 - 1
+            log_returns[jumps] += np.log1p(signs * sizes / 100.0)
+
+        np.cumsum(log_returns, axis=0, out=log_returns)
+        np.exp(log_returns, out=log_returns)
+        log_returns *= self.prices
+        np.maximum(log_returns, self.floor, out=log_returns)
+        self._block = log_returns
+        self._pos = 0
+
+    def next(self):
+        """다음 틱 가격 (N,) - 내부 블록의 뷰이므로 보관하려면 복사해야 함"""
+        if self._pos >= len(self._block):
+            self._generate()
+        row = self._block[self._pos]
+        self._pos += 1
+        self.tick += 1
+        self.prices = row
+        return row
+
+    def advance(self, ticks):
+        """다음 ticks틱 가격 (ticks, N) 한 번에 반환 (밀린 틱 따라잡기용)"""
+        chunks = []
+        while ticks > 0:
+            if self._pos >= len(self._block):
+                self._generate()
+            take = min(ticks, len(self._block) - self._pos)
+            chunks.append(self._block[self._pos:self._pos + take])
+            self._pos += take
+            self.tick += take
+            ticks -= take
+            self.prices = chunks[-1][-1]
+        if not chunks:
+            return np.empty((0, self.count))
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
@@ -0,0 +1,279 @@
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import perf
+
+with perf.import_timer("cv2"):
+    import cv2
+with perf.import_timer("mediapipe"):
+    try:
+        import mediapipe as mp
+    except ImportError:  # 녹화 세션 리플레이는 MediaPipe 없이도 동작
+        mp = None
+
+from replay import open_source, draw_recorded_hands
+
+# 비전 파이프라인 설정
+CAPTURE_RETRY_DELAY = 0.5   # 카메라가 열리지 않았을 때 재시도 간격 (초)
+PREVIEW_BUFFERS = 3         # 미리보기 버퍼 수 (생산자/소비자가 같은 버퍼를 동시에 쓰지 않도록 순환)
+PREVIEW_INTERPOLATION = cv2.INTER_LINEAR  # 썸네일용 저비용 보간 (LANCZOS/AREA보다 훨씬 가벼움)
+
+# 추론 스케줄러 기본값
+INFERENCE_IDLE_STRIDE = 3     # 손이 없을 때(전체 손바닥 검출) N프레임마다 한 번 추론
+INFERENCE_TRACK_STRIDE = 1    # 손 추적 중일 때 N프레임마다 한 번 추론
+FRAME_DIFF_THRESHOLD = 2.0    # 마지막 추론 프레임과의 평균 밝기 차이(0~255)가 이보다 작으면 생략 (0 = 끄기)
+FRAME_DIFF_MAX_SKIP = 10      # 연속 생략 최대 프레임 수 (초과하면 강제 추론)
+DIFF_THUMB_SIZE = (32, 24)    # 프레임 차이 비교용 썸네일 크기
+
+
+def make_preview(frame, out):
+    """프레임을 미리 할당된 out 버퍼 크기로 축소"""
+    h, w = out.shape[:2]
+    cv2.resize(frame, (w, h), dst=out, interpolation=PREVIEW_INTERPOLATION)
+    return out
+
+
+# 프레임 단계별 처리 시간 (초) - captured_at은 프레임을 읽은 시점의 perf_counter 값
+StageTimings = namedtuple('StageTimings', 'captured_at capture inference preview')
+
+# 생산자 스레드가 만든 최신 결과 (seq는 1부터 증가, inferred=False면 이전 추론 결과 재사용)
+VisionFrame = namedtuple('VisionFrame', 'seq timestamp results preview inferred timings')
+
+
+class InferenceScheduler:
+    """프레임마다 MediaPipe 추론을 돌릴지 결정
+
+    손을 추적 중이면 MediaPipe가 이전 프레임의 손 영역(ROI)에서 랜드마크만 다시
+    구하므로(static_image_mode=False) 매 프레임 돌리고, 추적을 잃었을 때는 비싼
+    전체 손바닥 검출을 idle_stride 프레임마다 한 번만 돌립니다. 여기에 마지막으로
+    추론한 프레임과 거의 같은 프레임은 건너뛰는 프레임 차이 게이팅을 더합니다.
+    """
+    def __init__(self, idle_stride=INFERENCE_IDLE_STRIDE, track_stride=INFERENCE_TRACK_STRIDE,
+                 diff_threshold=FRAME_DIFF_THRESHOLD, max_skip=FRAME_DIFF_MAX_SKIP):
+        self.idle_stride = max(1, idle_stride)
+        self.track_stride = max(1, track_stride)
+        self.diff_threshold = diff_threshold
+        self.max_skip = max_skip
+        self.tracking = False
+
+        self._has_result = False
+        self._frame_no = 0
+        self._skipped = 0
+        self._thumb = None
+        self._ref_thumb = None
+
+        # 통계
+        self.inferred = 0
+        self.skipped = 0
+
+    def should_infer(self, bgr_frame):
+        """이번 프레임에 추론이 필요한지 여부"""
+        self._frame_no += 1
+        self._thumb = None
+
+        if not self._has_result or self._skipped >= self.max_skip:
+            return self._accept()
+
+        stride = self.track_stride if self.tracking else self.idle_stride
+        if self._frame_no % stride != 0:
+            return self._reject()
+
+        if self.diff_threshold > 0 and self._ref_thumb is not None:
+            self._thumb = self._make_thumb(bgr_frame)
+            if cv2.absdiff(self._thumb, self._ref_thumb).mean() < self.diff_threshold:
+                return self._reject()
+
+        return self._accept()
+
+    def _accept(self):
+        self._skipped = 0
+        self.inferred += 1
+        return True
+
+    def _reject(self):
+        self._skipped += 1
+        self.skipped += 1
+        return False
+
+    @staticmethod
+    def _make_thumb(bgr_frame):
+        small = cv2.resize(bgr_frame, DIFF_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def update(self, bgr_frame, results):
+        """추론 결과 반영 (추적 상태와 비교 기준 썸네일 갱신)"""
+        self._has_result = True
+        self.tracking = bool(results.multi_hand_landmarks)
+        if self.diff_threshold > 0:
+            self._ref_thumb = self._thumb if self._thumb is not None else self._make_thumb(bgr_frame)
+
+
+class VisionPipeline:
+    """카메라 캡처 + MediaPipe 추론을 전용 스레드에서 실행
+
+    생산자 스레드는 프레임을 읽고, 손 랜드마크를 추론하고, 미리보기 이미지를
+    만들어 "최신 결과" 슬롯 하나에 덮어씁니다 (latest-frame-wins). Tk 스레드는
+    latest()로 새 결과가 있을 때만 가져가므로 차트 조작이 카메라 FPS나 추론 시간에
+    묶이지 않습니다.
+
+    미리보기(preview)는 미리 할당된 RGB uint8 배열(preview_size)이며, 버퍼를
+    순환 재사용하므로 Tk 스레드는 받은 즉시 화면에 복사해야 합니다.
+    capture_size를 주면 카메라에 그 해상도를 요청합니다 (지원하는 가장 가까운 값).
+    scheduler(InferenceScheduler)를 주면 추론을 생략한 프레임은 이전 결과를 재사용합니다.
+    source에 동영상 파일이나 녹화 세션(.npz) 경로, 또는 이미 연 캡처 객체를 주면 카메라
+    대신 그 프레임을 재생하고, 랜드마크가 녹화된 세션이면 MediaPipe 추론 대신 녹화 결과를 씁니다.
+    """
+    def __init__(self, preview_size, camera_index=0, max_num_hands=2,
+                 min_detection_confidence=0.7, capture_size=None,
+                 min_tracking_confidence=0.5, model_complexity=1, scheduler=None,
+                 source=None):
+        self.preview_size = preview_size
+        self.scheduler = scheduler
+        self.cap = open_source(camera_index if source is None else source, capture_size)
+        self.recorded = getattr(self.cap, 'recorded', False)
+
+        self.hands = None
+        if not self.recorded:
+            if mp is None:
+                raise ImportError("mediapipe is required for live hand tracking")
+            self.mp_hands = mp.solutions.hands
+            self.mp_drawing = mp.solutions.drawing_utils
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max_num_hands,
+                model_complexity=model_complexity,
+                min_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+
+        # 프레임 처리용 버퍼 (첫 프레임 크기에 맞춰 할당 후 재사용)
+        self._flip_buf = None
+        self._rgb_buf = None
+        w, h = preview_size
+        self._previews = [np.empty((h, w, 3), dtype=np.uint8) for _ in range(PREVIEW_BUFFERS)]
+        self._preview_idx = 0
+        self._last_results = None
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._taken_seq = 0
+        self._seq = 0
+        self._running = False
+        self._thread = None
+
+        # 처리 속도 통계
+        self.frames = 0
+        self.dropped = 0
+        self.last_process_time = 0.0
+
+    def start(self):
+        """생산자 스레드 시작"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="vision")
+        self._thread.start()
+
+    def stop(self):
+        """생산자 스레드 종료 및 카메라/모델 해제"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self.cap.isOpened():
+            self.cap.release()
+        if self.hands is not None:
+            self.hands.close()
+
+    def _run(self):
+        while self._running:
+            if not self.cap.isOpened():
+                time.sleep(CAPTURE_RETRY_DELAY)
+                continue
+
+            read_started = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(CAPTURE_RETRY_DELAY)
+                continue
+
+            started = time.perf_counter()
+            if self.recorded:
+                # 녹화 세션은 이미 좌우 반전된 화면 기준 결과이므로 추론 없이 그대로 사용
+                self._run_recorded(frame, read_started, started)
+                continue
+
+            if self._flip_buf is None or self._flip_buf.shape != frame.shape:
+                self._flip_buf = np.empty_like(frame)
+                self._rgb_buf = np.empty_like(frame)
+            cv2.flip(frame, 1, dst=self._flip_buf)
+
+            inferred = self.scheduler is None or self._last_results is None \
+                or self.scheduler.should_infer(self._flip_buf)
+            inference_started = time.perf_counter()
+            if inferred:
+                rgb_frame = cv2.cvtColor(self._flip_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+                results = self.hands.process(rgb_frame)
+                self._last_results = results
+                if self.scheduler is not None:
+                    self.scheduler.update(self._flip_buf, results)
+            else:
+                results = self._last_results
+            preview_started = time.perf_counter()
+
+            # 미리보기는 축소 후에 RGB 변환하고 랜드마크를 그림 (정규화 좌표라 크기와 무관)
+            preview = make_preview(self._flip_buf, self._previews[self._preview_idx])
+            cv2.cvtColor(preview, cv2.COLOR_BGR2RGB, dst=preview)
+            self._preview_idx = (self._preview_idx + 1) % len(self._previews)
+            if results.multi_hand_landmarks:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    self.mp_drawing.draw_landmarks(preview, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+
+            finished = time.perf_counter()
+            self.last_process_time = finished - started
+            timings = StageTimings(started, inference_started - read_started,
+                                   preview_started - inference_started, finished - preview_started)
+            self._publish(results, preview, inferred, timings)
+
+    @staticmethod
+    def _record_timings(timings, inferred):
+        """단계별 처리 시간을 계측 모듈에 기록 (추론은 실제로 돌린 프레임만)"""
+        perf.record("vision.capture", timings.capture)
+        if inferred:
+            perf.record("vision.inference", timings.inference)
+        perf.record("vision.preview", timings.preview)
+
+    def _run_recorded(self, frame, read_started, started):
+        """녹화 세션 프레임 처리 (미리보기 + 녹화 랜드마크 그리기)"""
+        results = self.cap.results
+        preview = make_preview(frame, self._previews[self._preview_idx])
+        cv2.cvtColor(preview, cv2.COLOR_BGR2RGB, dst=preview)
+        self._preview_idx = (self._preview_idx + 1) % len(self._previews)
+        draw_recorded_hands(preview, results)
+
+        finished = time.perf_counter()
+        self.last_process_time = finished - started
+        self._publish(results, preview, True,
+                      StageTimings(started, started - read_started, 0.0, finished - started))
+
+    def _publish(self, results, preview, inferred=True, timings=None):
+        """최신 결과 슬롯 덮어쓰기 (Tk 스레드가 안 가져간 이전 결과는 버림)"""
+        if timings is not None and perf.recorder.enabled:
+            self._record_timings(timings, inferred and not self.recorded)
+        with self._lock:
+            if self._latest is not None and self._latest.seq > self._taken_seq:
+                self.dropped += 1
+            self._seq += 1
+            self._latest = VisionFrame(self._seq, time.time(), results, preview, inferred, timings)
+            self.frames += 1
+
+    def latest(self):
+        """아직 가져가지 않은 최신 결과 반환 (없으면 None)"""
+        with self._lock:
+            frame = self._latest
+            if frame is None or frame.seq == self._taken_seq:
+                return None
+            self._taken_seq = frame.seq
+            return frame